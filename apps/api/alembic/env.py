@@ -12,9 +12,12 @@ from src.models import (  # noqa: F401
     Ingredient,
     Instruction,
     MealPlan,
+    MealPlanTemplate,
+    MealPlanTemplateSlot,
     MealSlot,
     Recipe,
     ShoppingItem,
+    ShoppingItemContribution,
     ShoppingList,
     User,
 )
@@ -0,0 +1,109 @@
+"""Add canonical amount/unit columns to ingredients
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-02-20
+
+"""
+
+import re
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "005"
+down_revision: str | None = "004"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+# Snapshot of src.core.units at this revision, so later changes to the app's
+# unit table cannot change what this migration writes
+_UNIT_TABLE: dict[str, tuple[str, float]] = {
+    alias: (canonical, factor)
+    for canonical, factor, aliases in (
+        ("g", 1, "g gram grams 그램"),
+        ("g", 0.001, "mg"),
+        ("g", 1000, "kg kilogram kilograms 킬로그램 킬로"),
+        ("g", 28.3495, "oz ounce ounces"),
+        ("g", 453.592, "lb lbs pound pounds"),
+        ("g", 600, "근"),
+        ("ml", 1, "ml milliliter milliliters millilitre millilitres 밀리리터 cc"),
+        ("ml", 1000, "l liter liters litre litres 리터"),
+        ("ml", 5, "작은술 티스푼 tsp teaspoon teaspoons"),
+        ("ml", 15, "큰술 밥숟가락 숟가락 테이블스푼 tbsp tbs tablespoon tablespoons"),
+        ("ml", 200, "컵"),
+        ("ml", 240, "cup cups"),
+        ("ml", 29.5735, "floz"),
+        ("ml", 473.176, "pint pints"),
+        ("ml", 946.353, "quart quarts"),
+        ("ml", 3785.41, "gallon gallons"),
+        ("개", 1, "개 ea each piece pieces pc pcs"),
+    )
+    for alias in aliases.split()
+}
+_CASE_SENSITIVE: dict[str, tuple[str, float]] = {"T": ("ml", 15), "t": ("ml", 5)}
+_STRIP_PATTERN = re.compile(r"[\s.]+")
+
+
+def _canonicalize(amount: float, unit: str) -> tuple[float, str]:
+    stripped = unit.strip()
+    entry = _CASE_SENSITIVE.get(stripped)
+    if entry is None:
+        key = _STRIP_PATTERN.sub("", stripped).lower()
+        entry = _UNIT_TABLE.get(key)
+        if entry is None:
+            return float(amount), key or stripped
+    canonical_unit, factor = entry
+    return round(float(amount) * factor, 3), canonical_unit
+
+
+def upgrade() -> None:
+    op.add_column("ingredients", sa.Column("canonical_amount", sa.Numeric(12, 3), nullable=True))
+    op.add_column("ingredients", sa.Column("canonical_unit", sa.String(50), nullable=True))
+
+    # Backfill existing rows with the conversion used at write time, one
+    # primary-key range at a time so the table is never loaded whole
+    bind = op.get_bind()
+    ingredients = sa.table(
+        "ingredients",
+        sa.column("id", sa.String),
+        sa.column("canonical_amount", sa.Numeric),
+        sa.column("canonical_unit", sa.String),
+    )
+    update_stmt = (
+        sa.update(ingredients)
+        .where(ingredients.c.id == sa.bindparam("row_id"))
+        .values(
+            canonical_amount=sa.bindparam("amount_value"),
+            canonical_unit=sa.bindparam("unit_value"),
+        )
+    )
+    select_batch = sa.text(
+        "SELECT id, amount, unit FROM ingredients WHERE id > :last_id ORDER BY id LIMIT :limit"
+    )
+
+    last_id = ""
+    while rows := bind.execute(
+        select_batch, {"last_id": last_id, "limit": BACKFILL_BATCH_SIZE}
+    ).fetchall():
+        params = []
+        for row_id, amount, unit in rows:
+            canonical_amount, canonical_unit = _canonicalize(amount, unit)
+            params.append(
+                {
+                    "row_id": row_id,
+                    "amount_value": canonical_amount,
+                    "unit_value": canonical_unit,
+                }
+            )
+        bind.execute(update_stmt, params)
+        last_id = rows[-1][0]
+
+
+def downgrade() -> None:
+    op.drop_column("ingredients", "canonical_unit")
+    op.drop_column("ingredients", "canonical_amount")
@@ -0,0 +1,114 @@
+"""Add shopping category column to ingredients
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-02-21
+
+"""
+
+import re
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "006"
+down_revision: str | None = "005"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+BACKFILL_BATCH_SIZE = 5000
+DEFAULT_CATEGORY = "pantry"
+
+# Snapshot of src.core.ingredient_category at this revision, so later keyword
+# changes cannot change what this migration writes. Checked in order.
+_CATEGORY_KEYWORDS: dict[str, str] = {
+    "pantry": (
+        "고추장,고춧가루,된장,간장,액젓,참기름,들기름,식용유,식초,고추기름,"
+        "soy sauce,fish sauce,vinegar,olive oil,vegetable oil,peanut butter,stock cube,bouillon"
+    ),
+    "produce": (
+        "채소,야채,과일,상추,당근,양파,마늘,토마토,감자,고구마,대파,쪽파,배추,양배추,"
+        "시금치,콩나물,숙주,오이,호박,버섯,고추,피망,파프리카,생강,깻잎,부추,미나리,사과,레몬,"
+        "onion,garlic,carrot,potato,tomato,lettuce,cabbage,spinach,scallion,spring onion,"
+        "green onion,shallot,leek,ginger,mushroom,cucumber,zucchini,courgette,aubergine,"
+        "eggplant,broccoli,cauliflower,celery,bell pepper,chilli,chili,lemon,lime,apple,banana,"
+        "avocado,parsley,coriander,cilantro,basil,bean sprout"
+    ),
+    "meat": (
+        "고기,소고기,돼지,닭,베이컨,햄,소시지,생선,새우,오징어,조개,멸치,고등어,연어,참치,"
+        "beef,pork,chicken,lamb,mutton,turkey,duck,bacon,ham,sausage,mince,fish,salmon,tuna,"
+        "cod,shrimp,prawn,squid,clam,mussel"
+    ),
+    "dairy": (
+        "우유,치즈,버터,요구르트,요거트,생크림,계란,달걀,"
+        "milk,cheese,butter,yogurt,yoghurt,cream,egg"
+    ),
+    "bakery": "빵,베이커리,bread,baguette,tortilla,bun",
+    "frozen": "냉동,frozen",
+    "beverages": "주스,콜라,사이다,맥주,juice,beer",
+}
+
+
+def _is_korean(keyword: str) -> bool:
+    return any("\uac00" <= ch <= "\ud7a3" for ch in keyword)
+
+
+def _compile(keywords: list[str]) -> re.Pattern[str]:
+    """Korean keywords match anywhere, English ones at a word start; longest first."""
+    ordered = sorted({kw.lower() for kw in keywords}, key=len, reverse=True)
+    korean = [re.escape(kw) for kw in ordered if _is_korean(kw)]
+    english = [re.escape(kw) for kw in ordered if not _is_korean(kw)]
+    return re.compile("|".join(korean) + r"|\b(?:" + "|".join(english) + ")")
+
+
+_MATCHERS = [
+    (category, _compile(keywords.split(","))) for category, keywords in _CATEGORY_KEYWORDS.items()
+]
+
+
+def _categorize(name: str) -> str:
+    name_lower = name.lower()
+    for category, matcher in _MATCHERS:
+        if matcher.search(name_lower):
+            return category
+    return DEFAULT_CATEGORY
+
+
+def upgrade() -> None:
+    op.add_column("ingredients", sa.Column("category", sa.String(20), nullable=True))
+
+    # Backfill one primary-key range at a time so the table is never loaded
+    # whole; recipes share most names, so each is categorized once
+    bind = op.get_bind()
+    ingredients = sa.table(
+        "ingredients",
+        sa.column("id", sa.String),
+        sa.column("category", sa.String),
+    )
+    update_stmt = (
+        sa.update(ingredients)
+        .where(ingredients.c.id == sa.bindparam("row_id"))
+        .values(category=sa.bindparam("category_value"))
+    )
+    select_batch = sa.text(
+        "SELECT id, name FROM ingredients WHERE id > :last_id ORDER BY id LIMIT :limit"
+    )
+
+    categories: dict[str, str] = {}
+    last_id = ""
+    while rows := bind.execute(
+        select_batch, {"last_id": last_id, "limit": BACKFILL_BATCH_SIZE}
+    ).fetchall():
+        params = []
+        for row_id, name in rows:
+            if name not in categories:
+                categories[name] = _categorize(name)
+            params.append({"row_id": row_id, "category_value": categories[name]})
+        bind.execute(update_stmt, params)
+        last_id = rows[-1][0]
+
+
+def downgrade() -> None:
+    op.drop_column("ingredients", "category")
@@ -0,0 +1,74 @@
+"""Track per-slot contributions to generated shopping list items
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-02-23
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from alembic import op
+
+revision: str = "007"
+down_revision: str | None = "006"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "shopping_lists",
+        sa.Column("auto_sync", sa.Boolean, nullable=False, server_default=sa.false()),
+    )
+    op.add_column("shopping_lists", sa.Column("filter_dates", ARRAY(sa.Date), nullable=True))
+    op.add_column(
+        "shopping_lists",
+        sa.Column("filter_meal_types", ARRAY(sa.String(20)), nullable=True),
+    )
+    op.add_column("shopping_items", sa.Column("ingredient_key", sa.String(200), nullable=True))
+    op.add_column("shopping_items", sa.Column("canonical_unit", sa.String(50), nullable=True))
+
+    op.create_table(
+        "shopping_item_contributions",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column(
+            "shopping_item_id",
+            sa.String(36),
+            sa.ForeignKey("shopping_items.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "meal_slot_id",
+            sa.String(36),
+            sa.ForeignKey("meal_slots.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("amount", sa.Numeric(12, 3), nullable=False),
+        sa.UniqueConstraint(
+            "shopping_item_id",
+            "meal_slot_id",
+            name="uq_shopping_item_contributions_item_slot",
+        ),
+    )
+    op.create_index(
+        "ix_shopping_item_contributions_meal_slot_id",
+        "shopping_item_contributions",
+        ["meal_slot_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_shopping_item_contributions_meal_slot_id",
+        table_name="shopping_item_contributions",
+    )
+    op.drop_table("shopping_item_contributions")
+    op.drop_column("shopping_items", "canonical_unit")
+    op.drop_column("shopping_items", "ingredient_key")
+    op.drop_column("shopping_lists", "filter_meal_types")
+    op.drop_column("shopping_lists", "filter_dates")
+    op.drop_column("shopping_lists", "auto_sync")
@@ -0,0 +1,34 @@
+"""Add version counters to meal plans and shopping lists
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-02-24
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "008"
+down_revision: str | None = "007"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "meal_plans",
+        sa.Column("version", sa.Integer, nullable=False, server_default="1"),
+    )
+    op.add_column(
+        "shopping_lists",
+        sa.Column("version", sa.Integer, nullable=False, server_default="1"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("shopping_lists", "version")
+    op.drop_column("meal_plans", "version")
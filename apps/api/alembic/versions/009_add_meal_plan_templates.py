@@ -0,0 +1,87 @@
+"""Add meal plan templates
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-02-25
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "009"
+down_revision: str | None = "008"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "meal_plan_templates",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column(
+            "user_id",
+            sa.String(36),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("notes", sa.Text, nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index(
+        "ix_meal_plan_templates_user_name",
+        "meal_plan_templates",
+        ["user_id", "name"],
+        unique=True,
+    )
+
+    op.create_table(
+        "meal_plan_template_slots",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column(
+            "template_id",
+            sa.String(36),
+            sa.ForeignKey("meal_plan_templates.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "recipe_id",
+            sa.String(36),
+            sa.ForeignKey("recipes.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("day_offset", sa.Integer, nullable=False),
+        sa.Column("meal_type", sa.String(20), nullable=False),
+        sa.Column("servings", sa.Integer, nullable=False),
+        sa.Column("notes", sa.Text, nullable=True),
+    )
+    op.create_index(
+        "ix_meal_plan_template_slots_unique",
+        "meal_plan_template_slots",
+        ["template_id", "day_offset", "meal_type"],
+        unique=True,
+    )
+    op.create_index(
+        "ix_meal_plan_template_slots_recipe_id",
+        "meal_plan_template_slots",
+        ["recipe_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_meal_plan_template_slots_recipe_id",
+        table_name="meal_plan_template_slots",
+    )
+    op.drop_index(
+        "ix_meal_plan_template_slots_unique",
+        table_name="meal_plan_template_slots",
+    )
+    op.drop_table("meal_plan_template_slots")
+    op.drop_index("ix_meal_plan_templates_user_name", table_name="meal_plan_templates")
+    op.drop_table("meal_plan_templates")
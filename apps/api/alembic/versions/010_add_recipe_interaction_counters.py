@@ -0,0 +1,166 @@
+"""Add denormalized rating and favorite counters to recipes
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-02-26
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "010"
+down_revision: str | None = "009"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "recipes", sa.Column("rating_sum", sa.Integer(), nullable=False, server_default="0")
+    )
+    op.add_column(
+        "recipes", sa.Column("rating_count", sa.Integer(), nullable=False, server_default="0")
+    )
+    op.add_column(
+        "recipes", sa.Column("favorites_count", sa.Integer(), nullable=False, server_default="0")
+    )
+
+    # Keep the counters in the same transaction as the rating/favorite write.
+    # Row triggers also cover ON DELETE CASCADE from users and recipes.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION update_recipe_rating_counters()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE' AND NEW.recipe_id = OLD.recipe_id THEN
+                UPDATE recipes SET rating_sum = rating_sum + NEW.rating - OLD.rating
+                WHERE id = NEW.recipe_id;
+                RETURN NULL;
+            END IF;
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE recipes
+                SET rating_sum = rating_sum - OLD.rating, rating_count = rating_count - 1
+                WHERE id = OLD.recipe_id;
+            END IF;
+            IF TG_OP IN ('UPDATE', 'INSERT') THEN
+                UPDATE recipes
+                SET rating_sum = rating_sum + NEW.rating, rating_count = rating_count + 1
+                WHERE id = NEW.recipe_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    op.execute("""
+        CREATE TRIGGER trigger_update_recipe_rating_counters
+        AFTER INSERT OR DELETE OR UPDATE OF rating, recipe_id ON recipe_ratings
+        FOR EACH ROW
+        EXECUTE FUNCTION update_recipe_rating_counters();
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION update_recipe_favorites_count()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                UPDATE recipes SET favorites_count = favorites_count + 1
+                WHERE id = NEW.recipe_id;
+            ELSE
+                UPDATE recipes SET favorites_count = favorites_count - 1
+                WHERE id = OLD.recipe_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    op.execute("""
+        CREATE TRIGGER trigger_update_recipe_favorites_count
+        AFTER INSERT OR DELETE ON recipe_favorites
+        FOR EACH ROW
+        EXECUTE FUNCTION update_recipe_favorites_count();
+    """)
+
+    # Counter updates come from the triggers above (trigger depth > 1) and must
+    # not bump updated_at, which tracks edits to the recipe itself.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION update_recipes_updated_at_column()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF pg_trigger_depth() = 1 THEN
+                NEW.updated_at = NOW();
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("DROP TRIGGER IF EXISTS trigger_update_recipes_updated_at ON recipes")
+    op.execute("""
+        CREATE TRIGGER trigger_update_recipes_updated_at
+        BEFORE UPDATE ON recipes
+        FOR EACH ROW
+        EXECUTE FUNCTION update_recipes_updated_at_column();
+    """)
+
+    # Backfill without touching updated_at
+    op.execute("ALTER TABLE recipes DISABLE TRIGGER trigger_update_recipes_updated_at")
+    op.execute("""
+        UPDATE recipes r
+        SET rating_sum = s.rating_sum, rating_count = s.rating_count
+        FROM (
+            SELECT recipe_id, SUM(rating) AS rating_sum, COUNT(*) AS rating_count
+            FROM recipe_ratings
+            GROUP BY recipe_id
+        ) s
+        WHERE r.id = s.recipe_id
+    """)
+    op.execute("""
+        UPDATE recipes r
+        SET favorites_count = s.favorites_count
+        FROM (
+            SELECT recipe_id, COUNT(*) AS favorites_count
+            FROM recipe_favorites
+            GROUP BY recipe_id
+        ) s
+        WHERE r.id = s.recipe_id
+    """)
+    op.execute("ALTER TABLE recipes ENABLE TRIGGER trigger_update_recipes_updated_at")
+
+    # Top rated: average rating, then number of ratings, over rated recipes only
+    op.create_index(
+        "ix_recipes_top_rated",
+        "recipes",
+        [
+            sa.text(
+                "(CAST(rating_sum AS DOUBLE PRECISION) / CAST(rating_count AS DOUBLE PRECISION)) DESC"
+            ),
+            sa.text("rating_count DESC"),
+        ],
+        postgresql_where=sa.text("rating_count > 0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_recipes_top_rated", table_name="recipes")
+
+    op.execute("DROP TRIGGER IF EXISTS trigger_update_recipes_updated_at ON recipes")
+    op.execute("""
+        CREATE TRIGGER trigger_update_recipes_updated_at
+        BEFORE UPDATE ON recipes
+        FOR EACH ROW
+        EXECUTE FUNCTION update_updated_at_column();
+    """)
+    op.execute("DROP FUNCTION IF EXISTS update_recipes_updated_at_column()")
+
+    op.execute("DROP TRIGGER IF EXISTS trigger_update_recipe_favorites_count ON recipe_favorites")
+    op.execute("DROP TRIGGER IF EXISTS trigger_update_recipe_rating_counters ON recipe_ratings")
+    op.execute("DROP FUNCTION IF EXISTS update_recipe_favorites_count()")
+    op.execute("DROP FUNCTION IF EXISTS update_recipe_rating_counters()")
+
+    op.drop_column("recipes", "favorites_count")
+    op.drop_column("recipes", "rating_count")
+    op.drop_column("recipes", "rating_sum")
@@ -0,0 +1,258 @@
+"""Add weighted Hangul bigram search vectors
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-02-27
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "011"
+down_revision: str | None = "010"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Must stay in step with src.core.text_search.hangul_bigrams
+    op.execute("""
+        CREATE OR REPLACE FUNCTION hangul_bigrams(input text)
+        RETURNS text AS $$
+        DECLARE
+            result text := '';
+            run text := '';
+            ch text;
+        BEGIN
+            input := COALESCE(input, '');
+            -- The empty character past the end flushes the last run
+            FOR i IN 1..char_length(input) + 1 LOOP
+                ch := substr(input, i, 1);
+                IF ch <> '' AND ascii(ch) BETWEEN 44032 AND 55203 THEN
+                    run := run || ch;
+                    CONTINUE;
+                END IF;
+                IF char_length(run) > 1 THEN
+                    result := result || ' ';
+                    FOR j IN 1..char_length(run) - 1 LOOP
+                        result := result || substr(run, j, 2) || ' ';
+                    END LOOP;
+                ELSE
+                    result := result || run;
+                END IF;
+                run := '';
+                result := result || ch;
+            END LOOP;
+            RETURN result;
+        END;
+        $$ LANGUAGE plpgsql IMMUTABLE;
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION hangul_syllables(input text)
+        RETURNS text AS $$
+            SELECT array_to_string(
+                regexp_split_to_array(regexp_replace(COALESCE(input, ''), '[^가-힣]+', '', 'g'), ''),
+                ' '
+            )
+        $$ LANGUAGE sql IMMUTABLE;
+    """)
+
+    # Bigrams first so their positions stay adjacent for phrase queries
+    op.execute("""
+        CREATE OR REPLACE FUNCTION weighted_search_vector(input text, weight "char")
+        RETURNS tsvector AS $$
+            SELECT setweight(
+                to_tsvector('simple', hangul_bigrams(input))
+                    || to_tsvector('simple', hangul_syllables(input)),
+                weight
+            )
+        $$ LANGUAGE sql IMMUTABLE;
+    """)
+
+    # Recipes: title A, ingredient names B, description C
+    op.execute("""
+        CREATE OR REPLACE FUNCTION recipe_search_vector(
+            recipe_title text, recipe_description text, target_recipe_id varchar
+        )
+        RETURNS tsvector AS $$
+            SELECT weighted_search_vector(recipe_title, 'A')
+                || weighted_search_vector(
+                    (
+                        SELECT string_agg(name, ' ' ORDER BY order_index)
+                        FROM ingredients
+                        WHERE recipe_id = target_recipe_id
+                    ),
+                    'B'
+                )
+                || weighted_search_vector(recipe_description, 'C')
+        $$ LANGUAGE sql STABLE;
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION update_recipe_search_vector()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            NEW.search_vector := recipe_search_vector(NEW.title, NEW.description, NEW.id);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("DROP TRIGGER IF EXISTS trigger_update_recipe_search_vector ON recipes")
+    op.execute("""
+        CREATE TRIGGER trigger_update_recipe_search_vector
+        BEFORE INSERT OR UPDATE OF title, description ON recipes
+        FOR EACH ROW
+        EXECUTE FUNCTION update_recipe_search_vector();
+    """)
+
+    # Ingredients are written after their recipe, so refresh the vector once per
+    # statement for every recipe touched (bulk inserts and deletes included)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION refresh_recipe_search_vectors()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE' THEN
+                UPDATE recipes r
+                SET search_vector = recipe_search_vector(r.title, r.description, r.id)
+                WHERE r.id IN (
+                    SELECT n.recipe_id
+                    FROM new_ingredients n
+                    JOIN old_ingredients o ON o.id = n.id
+                    WHERE n.name IS DISTINCT FROM o.name
+                        OR n.order_index IS DISTINCT FROM o.order_index
+                );
+            ELSIF TG_OP = 'INSERT' THEN
+                UPDATE recipes r
+                SET search_vector = recipe_search_vector(r.title, r.description, r.id)
+                WHERE r.id IN (SELECT recipe_id FROM new_ingredients);
+            ELSE
+                UPDATE recipes r
+                SET search_vector = recipe_search_vector(r.title, r.description, r.id)
+                WHERE r.id IN (SELECT recipe_id FROM old_ingredients);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER trigger_ingredients_insert_search_vector
+        AFTER INSERT ON ingredients
+        REFERENCING NEW TABLE AS new_ingredients
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION refresh_recipe_search_vectors();
+    """)
+    op.execute("""
+        CREATE TRIGGER trigger_ingredients_update_search_vector
+        AFTER UPDATE ON ingredients
+        REFERENCING OLD TABLE AS old_ingredients NEW TABLE AS new_ingredients
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION refresh_recipe_search_vectors();
+    """)
+    op.execute("""
+        CREATE TRIGGER trigger_ingredients_delete_search_vector
+        AFTER DELETE ON ingredients
+        REFERENCING OLD TABLE AS old_ingredients
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION refresh_recipe_search_vectors();
+    """)
+
+    # Cached recipes: both titles A, ingredient names B, description C
+    op.execute("""
+        CREATE OR REPLACE FUNCTION update_cached_recipe_search_vector()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            NEW.search_vector :=
+                weighted_search_vector(concat_ws(' ', NEW.title, NEW.title_original), 'A') ||
+                weighted_search_vector(
+                    (
+                        SELECT string_agg(item->>'name', ' ')
+                        FROM jsonb_array_elements(
+                            CASE WHEN jsonb_typeof(NEW.ingredients_json) = 'array'
+                                THEN NEW.ingredients_json ELSE '[]'::jsonb END
+                        ) AS item
+                    ),
+                    'B'
+                ) ||
+                weighted_search_vector(NEW.description, 'C');
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute(
+        "DROP TRIGGER IF EXISTS trigger_update_cached_recipe_search_vector ON cached_recipes"
+    )
+    op.execute("""
+        CREATE TRIGGER trigger_update_cached_recipe_search_vector
+        BEFORE INSERT OR UPDATE OF title, title_original, description, ingredients_json
+        ON cached_recipes
+        FOR EACH ROW
+        EXECUTE FUNCTION update_cached_recipe_search_vector();
+    """)
+
+    # Rebuild existing vectors without touching recipes.updated_at
+    op.execute("ALTER TABLE recipes DISABLE TRIGGER trigger_update_recipes_updated_at")
+    op.execute("UPDATE recipes SET search_vector = recipe_search_vector(title, description, id)")
+    op.execute("ALTER TABLE recipes ENABLE TRIGGER trigger_update_recipes_updated_at")
+    op.execute("UPDATE cached_recipes SET title = title")
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trigger_ingredients_insert_search_vector ON ingredients")
+    op.execute("DROP TRIGGER IF EXISTS trigger_ingredients_update_search_vector ON ingredients")
+    op.execute("DROP TRIGGER IF EXISTS trigger_ingredients_delete_search_vector ON ingredients")
+    op.execute("DROP FUNCTION IF EXISTS refresh_recipe_search_vectors()")
+
+    # Restore the title-only recipe vector (001)
+    op.execute("DROP TRIGGER IF EXISTS trigger_update_recipe_search_vector ON recipes")
+    op.execute("""
+        CREATE OR REPLACE FUNCTION update_recipe_search_vector()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            NEW.search_vector := to_tsvector('simple', COALESCE(NEW.title, ''));
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER trigger_update_recipe_search_vector
+        BEFORE INSERT OR UPDATE OF title ON recipes
+        FOR EACH ROW
+        EXECUTE FUNCTION update_recipe_search_vector();
+    """)
+
+    # Restore the cached recipe vector (003)
+    op.execute(
+        "DROP TRIGGER IF EXISTS trigger_update_cached_recipe_search_vector ON cached_recipes"
+    )
+    op.execute("""
+        CREATE OR REPLACE FUNCTION update_cached_recipe_search_vector()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            NEW.search_vector :=
+                setweight(to_tsvector('simple', COALESCE(NEW.title, '')), 'A') ||
+                setweight(to_tsvector('simple', COALESCE(NEW.title_original, '')), 'A') ||
+                setweight(to_tsvector('simple', COALESCE(NEW.description, '')), 'B');
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER trigger_update_cached_recipe_search_vector
+        BEFORE INSERT OR UPDATE OF title, title_original, description
+        ON cached_recipes
+        FOR EACH ROW
+        EXECUTE FUNCTION update_cached_recipe_search_vector();
+    """)
+
+    op.execute("DROP FUNCTION IF EXISTS recipe_search_vector(text, text, varchar)")
+    op.execute('DROP FUNCTION IF EXISTS weighted_search_vector(text, "char")')
+    op.execute("DROP FUNCTION IF EXISTS hangul_syllables(text)")
+    op.execute("DROP FUNCTION IF EXISTS hangul_bigrams(text)")
+
+    op.execute("ALTER TABLE recipes DISABLE TRIGGER trigger_update_recipes_updated_at")
+    op.execute("UPDATE recipes SET title = title")
+    op.execute("ALTER TABLE recipes ENABLE TRIGGER trigger_update_recipes_updated_at")
+    op.execute("UPDATE cached_recipes SET title = title")
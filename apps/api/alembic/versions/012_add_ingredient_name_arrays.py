@@ -0,0 +1,209 @@
+"""Add normalized ingredient name arrays for ingredient matching
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-02-28
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision: str = "012"
+down_revision: str | None = "011"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+REFRESH_TRIGGERS = {
+    "insert": "AFTER INSERT ON ingredients REFERENCING NEW TABLE AS new_ingredients",
+    "update": (
+        "AFTER UPDATE ON ingredients "
+        "REFERENCING OLD TABLE AS old_ingredients NEW TABLE AS new_ingredients"
+    ),
+    "delete": "AFTER DELETE ON ingredients REFERENCING OLD TABLE AS old_ingredients",
+}
+
+
+def upgrade() -> None:
+    for table in ("recipes", "cached_recipes"):
+        op.add_column(
+            table,
+            sa.Column(
+                "ingredient_names",
+                postgresql.ARRAY(sa.Text()),
+                nullable=False,
+                server_default="{}",
+            ),
+        )
+
+    # Also applied to the names a user searches with, so both sides agree
+    op.execute("""
+        CREATE OR REPLACE FUNCTION normalize_ingredient_name(input text)
+        RETURNS text AS $$
+            SELECT NULLIF(
+                btrim(regexp_replace(
+                    regexp_replace(lower(input), '\\([^)]*\\)', ' ', 'g'),
+                    '\\s+', ' ', 'g'
+                )),
+                ''
+            )
+        $$ LANGUAGE sql IMMUTABLE;
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION normalize_ingredient_names(names text[])
+        RETURNS text[] AS $$
+            SELECT COALESCE(array_agg(DISTINCT n ORDER BY n), '{}')
+            FROM unnest(names) AS raw(name)
+            CROSS JOIN LATERAL normalize_ingredient_name(raw.name) AS n
+            WHERE n IS NOT NULL
+        $$ LANGUAGE sql IMMUTABLE;
+    """)
+
+    # Recipes: one refresh per ingredients statement now sets both the search
+    # vector (011) and the name array
+    op.execute("""
+        CREATE OR REPLACE FUNCTION refresh_recipe_ingredient_columns()
+        RETURNS TRIGGER AS $$
+        DECLARE
+            touched varchar[];
+        BEGIN
+            IF TG_OP = 'UPDATE' THEN
+                SELECT array_agg(DISTINCT n.recipe_id) INTO touched
+                FROM new_ingredients n
+                JOIN old_ingredients o ON o.id = n.id
+                WHERE n.name IS DISTINCT FROM o.name
+                    OR n.order_index IS DISTINCT FROM o.order_index;
+            ELSIF TG_OP = 'INSERT' THEN
+                SELECT array_agg(DISTINCT recipe_id) INTO touched FROM new_ingredients;
+            ELSE
+                SELECT array_agg(DISTINCT recipe_id) INTO touched FROM old_ingredients;
+            END IF;
+
+            UPDATE recipes r
+            SET search_vector = recipe_search_vector(r.title, r.description, r.id),
+                ingredient_names = normalize_ingredient_names(ARRAY(
+                    SELECT name FROM ingredients WHERE recipe_id = r.id
+                ))
+            WHERE r.id = ANY(touched);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    for event, clause in REFRESH_TRIGGERS.items():
+        op.execute(
+            f"DROP TRIGGER IF EXISTS trigger_ingredients_{event}_search_vector ON ingredients"
+        )
+        op.execute(f"""
+            CREATE TRIGGER trigger_ingredients_{event}_refresh_recipe
+            {clause}
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION refresh_recipe_ingredient_columns();
+        """)
+    op.execute("DROP FUNCTION IF EXISTS refresh_recipe_search_vectors()")
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION update_cached_recipe_ingredient_names()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            NEW.ingredient_names := normalize_ingredient_names(ARRAY(
+                SELECT item->>'name'
+                FROM jsonb_array_elements(
+                    CASE WHEN jsonb_typeof(NEW.ingredients_json) = 'array'
+                        THEN NEW.ingredients_json ELSE '[]'::jsonb END
+                ) AS item
+            ));
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER trigger_update_cached_recipe_ingredient_names
+        BEFORE INSERT OR UPDATE OF ingredients_json ON cached_recipes
+        FOR EACH ROW
+        EXECUTE FUNCTION update_cached_recipe_ingredient_names();
+    """)
+
+    # Backfill without touching recipes.updated_at
+    op.execute("ALTER TABLE recipes DISABLE TRIGGER trigger_update_recipes_updated_at")
+    op.execute("""
+        UPDATE recipes r
+        SET ingredient_names = normalize_ingredient_names(ARRAY(
+            SELECT name FROM ingredients WHERE recipe_id = r.id
+        ))
+    """)
+    op.execute("ALTER TABLE recipes ENABLE TRIGGER trigger_update_recipes_updated_at")
+    op.execute("UPDATE cached_recipes SET ingredients_json = ingredients_json")
+
+    op.create_index(
+        "ix_recipes_ingredient_names",
+        "recipes",
+        ["ingredient_names"],
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "ix_cached_recipes_ingredient_names_gin",
+        "cached_recipes",
+        ["ingredient_names"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_cached_recipes_ingredient_names_gin", table_name="cached_recipes")
+    op.drop_index("ix_recipes_ingredient_names", table_name="recipes")
+
+    op.execute(
+        "DROP TRIGGER IF EXISTS trigger_update_cached_recipe_ingredient_names ON cached_recipes"
+    )
+    op.execute("DROP FUNCTION IF EXISTS update_cached_recipe_ingredient_names()")
+
+    # Restore the search-vector-only refresh (011)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION refresh_recipe_search_vectors()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE' THEN
+                UPDATE recipes r
+                SET search_vector = recipe_search_vector(r.title, r.description, r.id)
+                WHERE r.id IN (
+                    SELECT n.recipe_id
+                    FROM new_ingredients n
+                    JOIN old_ingredients o ON o.id = n.id
+                    WHERE n.name IS DISTINCT FROM o.name
+                        OR n.order_index IS DISTINCT FROM o.order_index
+                );
+            ELSIF TG_OP = 'INSERT' THEN
+                UPDATE recipes r
+                SET search_vector = recipe_search_vector(r.title, r.description, r.id)
+                WHERE r.id IN (SELECT recipe_id FROM new_ingredients);
+            ELSE
+                UPDATE recipes r
+                SET search_vector = recipe_search_vector(r.title, r.description, r.id)
+                WHERE r.id IN (SELECT recipe_id FROM old_ingredients);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    for event, clause in REFRESH_TRIGGERS.items():
+        op.execute(
+            f"DROP TRIGGER IF EXISTS trigger_ingredients_{event}_refresh_recipe ON ingredients"
+        )
+        op.execute(f"""
+            CREATE TRIGGER trigger_ingredients_{event}_search_vector
+            {clause}
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION refresh_recipe_search_vectors();
+        """)
+    op.execute("DROP FUNCTION IF EXISTS refresh_recipe_ingredient_columns()")
+
+    op.execute("DROP FUNCTION IF EXISTS normalize_ingredient_names(text[])")
+    op.execute("DROP FUNCTION IF EXISTS normalize_ingredient_name(text)")
+
+    op.drop_column("cached_recipes", "ingredient_names")
+    op.drop_column("recipes", "ingredient_names")
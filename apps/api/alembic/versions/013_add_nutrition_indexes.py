@@ -0,0 +1,50 @@
+"""Add partial B-tree indexes for nutrition range filters
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-03-01
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "013"
+down_revision: str | None = "012"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TABLES = ("recipes", "cached_recipes")
+# Macros bounded without a calorie bound; calories lead the composite index
+SINGLE_COLUMNS = ("protein_grams", "carbs_grams", "fat_grams")
+
+
+def upgrade() -> None:
+    # Many recipes (most TheMealDB ones) carry no nutrition at all, and a
+    # bounded range never matches NULL, so the indexes skip those rows. A
+    # calorie range scans the composite index with the macro bounds checked on
+    # its entries; macro-only ranges combine the single-column indexes.
+    for table in TABLES:
+        op.create_index(
+            f"ix_{table}_nutrition",
+            table,
+            ["calories", "protein_grams", "carbs_grams", "fat_grams"],
+            postgresql_where=sa.text("calories IS NOT NULL"),
+        )
+        for column in SINGLE_COLUMNS:
+            op.create_index(
+                f"ix_{table}_{column}",
+                table,
+                [column],
+                postgresql_where=sa.text(f"{column} IS NOT NULL"),
+            )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        for column in SINGLE_COLUMNS:
+            op.drop_index(f"ix_{table}_{column}", table_name=table)
+        op.drop_index(f"ix_{table}_nutrition", table_name=table)
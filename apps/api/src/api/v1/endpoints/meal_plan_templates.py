@@ -0,0 +1,96 @@
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.database import get_db
+from src.core.security import get_current_user_id
+from src.schemas.common import ApiResponse
+from src.schemas.meal_plan import (
+    MealPlanTemplateApply,
+    MealPlanTemplateCreate,
+    MealPlanTemplateResponse,
+    MealPlanWithSlotsResponse,
+)
+from src.services.meal_plan import MealPlanService
+
+router = APIRouter()
+
+
+@router.post(
+    "", response_model=ApiResponse[MealPlanTemplateResponse], status_code=status.HTTP_201_CREATED
+)
+async def create_meal_plan_template(
+    data: MealPlanTemplateCreate,
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """식사계획의 슬롯을 이름 붙인 템플릿으로 저장합니다."""
+    service = MealPlanService(db)
+    template = await service.save_template(user_id, data)
+
+    return ApiResponse(
+        success=True,
+        data=MealPlanTemplateResponse.model_validate(template),
+    )
+
+
+@router.get("", response_model=ApiResponse[list[MealPlanTemplateResponse]])
+async def list_meal_plan_templates(
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    service = MealPlanService(db)
+    templates = await service.get_templates(user_id)
+
+    return ApiResponse(
+        success=True,
+        data=[MealPlanTemplateResponse.model_validate(t) for t in templates],
+    )
+
+
+@router.get("/{template_id}", response_model=ApiResponse[MealPlanTemplateResponse])
+async def get_meal_plan_template(
+    template_id: str,
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    service = MealPlanService(db)
+    template = await service.get_template(template_id, user_id)
+
+    return ApiResponse(
+        success=True,
+        data=MealPlanTemplateResponse.model_validate(template),
+    )
+
+
+@router.delete("/{template_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_meal_plan_template(
+    template_id: str,
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    service = MealPlanService(db)
+    await service.delete_template(template_id, user_id)
+
+
+@router.post(
+    "/{template_id}/apply",
+    response_model=ApiResponse[MealPlanWithSlotsResponse],
+    status_code=status.HTTP_201_CREATED,
+)
+async def apply_meal_plan_template(
+    template_id: str,
+    data: MealPlanTemplateApply,
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    템플릿을 특정 주의 식사계획에 적용합니다.
+    이미 찬 슬롯은 on_conflict에 따라 건너뛰거나(skip) 교체합니다(replace).
+    """
+    service = MealPlanService(db)
+    meal_plan = await service.apply_template(template_id, user_id, data)
+
+    return ApiResponse(
+        success=True,
+        data=MealPlanWithSlotsResponse.model_validate(meal_plan),
+    )
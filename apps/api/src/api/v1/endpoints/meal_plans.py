@@ -1,15 +1,18 @@
 from datetime import date
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Header, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.database import get_db
+from src.core.etag import etag_matches, make_etag, not_modified, set_etag
 from src.core.redis import RedisClient, get_redis
 from src.core.security import get_current_user_id
 from src.schemas.common import ApiResponse, PaginatedResponse
 from src.schemas.meal_plan import (
     ExternalMealSlotCreate,
+    GenerateMealPlanRequest,
+    MealPlanCopyRequest,
     MealPlanCreate,
     MealPlanResponse,
     MealPlanWithSlotsResponse,
@@ -19,6 +22,7 @@ from src.schemas.meal_plan import (
     QuickPlanCreate,
 )
 from src.services.meal_plan import MealPlanService
+from src.services.meal_plan_generator import MealPlanGeneratorService
 
 router = APIRouter()
 
@@ -60,15 +64,23 @@ async def list_meal_plans(
 @router.get("/week/{week_start_date}", response_model=ApiResponse[MealPlanWithSlotsResponse | None])
 async def get_meal_plan_by_week(
     week_start_date: date,
+    response: Response,
+    if_none_match: Annotated[str | None, Header()] = None,
     user_id: str = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
     service = MealPlanService(db)
+    if if_none_match:
+        current = await service.get_meal_plan_version_by_week(user_id, week_start_date)
+        if current and etag_matches(if_none_match, make_etag(*current)):
+            return not_modified(make_etag(*current))
+
     meal_plan = await service.get_meal_plan_by_week(user_id, week_start_date)
 
     if not meal_plan:
         return ApiResponse(success=True, data=None)
 
+    set_etag(response, make_etag(meal_plan.id, meal_plan.version))
     return ApiResponse(
         success=True,
         data=MealPlanWithSlotsResponse.model_validate(meal_plan),
@@ -78,12 +90,21 @@ async def get_meal_plan_by_week(
 @router.get("/{meal_plan_id}", response_model=ApiResponse[MealPlanWithSlotsResponse])
 async def get_meal_plan(
     meal_plan_id: str,
+    response: Response,
+    if_none_match: Annotated[str | None, Header()] = None,
     user_id: str = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
     service = MealPlanService(db)
+    if if_none_match:
+        version = await service.get_meal_plan_version(meal_plan_id, user_id)
+        etag = make_etag(meal_plan_id, version)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
     meal_plan = await service.get_meal_plan(meal_plan_id, user_id)
 
+    set_etag(response, make_etag(meal_plan.id, meal_plan.version))
     return ApiResponse(
         success=True,
         data=MealPlanWithSlotsResponse.model_validate(meal_plan),
@@ -100,6 +121,30 @@ async def delete_meal_plan(
     await service.delete_meal_plan(meal_plan_id, user_id)
 
 
+@router.post(
+    "/{meal_plan_id}/copy",
+    response_model=ApiResponse[MealPlanWithSlotsResponse],
+    status_code=status.HTTP_201_CREATED,
+)
+async def copy_meal_plan(
+    meal_plan_id: str,
+    data: MealPlanCopyRequest,
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    식사계획을 다른 주로 복사합니다.
+    이미 찬 슬롯은 on_conflict에 따라 건너뛰거나(skip) 교체합니다(replace).
+    """
+    service = MealPlanService(db)
+    meal_plan = await service.copy_meal_plan(meal_plan_id, user_id, data)
+
+    return ApiResponse(
+        success=True,
+        data=MealPlanWithSlotsResponse.model_validate(meal_plan),
+    )
+
+
 @router.post(
     "/{meal_plan_id}/slots",
     response_model=ApiResponse[MealSlotWithRecipeResponse],
@@ -198,3 +243,27 @@ async def create_quick_plan(
         success=True,
         data=MealPlanWithSlotsResponse.model_validate(meal_plan),
     )
+
+
+@router.post(
+    "/generate",
+    response_model=ApiResponse[MealPlanWithSlotsResponse],
+    status_code=status.HTTP_201_CREATED,
+)
+async def generate_meal_plan(
+    data: GenerateMealPlanRequest,
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+    redis: RedisClient = Depends(get_redis),
+):
+    """
+    주간 식사 계획을 자동으로 채웁니다.
+    식사 유형, 조리 시간, 칼로리/영양 목표와 반복 금지 기간을 반영합니다.
+    """
+    service = MealPlanGeneratorService(db)
+    meal_plan = await service.generate_week(user_id, data, redis)
+
+    return ApiResponse(
+        success=True,
+        data=MealPlanWithSlotsResponse.model_validate(meal_plan),
+    )
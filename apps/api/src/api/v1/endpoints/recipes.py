@@ -1,20 +1,29 @@
-from typing import Annotated, Any
+from typing import Annotated, Any, get_args
 
 from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.database import get_db
+from src.core.exceptions import BadRequestError
 from src.core.redis import RedisClient, get_redis
+from src.core.responses import raw_api_response
 from src.core.security import get_current_user_id
 from src.schemas.common import ApiResponse, PaginatedResponse
 from src.schemas.recipe import (
     BrowseRecipeResponse,
     BrowseRecipeWithDetailsResponse,
     DiscoverRecipesResponse,
+    ExternalRecipeBulkImportRequest,
+    ExternalRecipeBulkImportResponse,
     ExternalRecipeDetail,
+    ExternalRecipeRef,
     ExternalRecipeSource,
     ExternalSearchResponse,
     ExternalSourceInfo,
+    IngredientMatchResponse,
+    LeaderboardImportResponse,
+    LeaderboardRecipeResponse,
+    NutritionFilter,
     RecipeCategory,
     RecipeCreate,
     RecipeDifficulty,
@@ -22,10 +31,12 @@ from src.schemas.recipe import (
     RecipeSearchParams,
     RecipeUpdate,
     RecipeWithDetailsResponse,
+    TopRatedRecipeResponse,
     URLExtractionRequest,
     URLExtractionResponse,
 )
 from src.schemas.recipe_interaction import (
+    RecipeListInclude,
     RecipeRatingCreate,
     RecipeRatingResponse,
     RecipeRatingUpdate,
@@ -33,6 +44,7 @@ from src.schemas.recipe_interaction import (
     RecipeStatsResponse,
 )
 from src.services.external_recipe import ExternalRecipeService
+from src.services.leaderboard import RecipeLeaderboardName
 from src.services.recipe import RecipeService
 from src.services.recipe_interaction import RecipeInteractionService
 from src.services.url_extractor import URLExtractorService
@@ -40,6 +52,49 @@ from src.services.url_extractor import URLExtractorService
 router = APIRouter()
 
 
+def _parse_include(
+    include: Annotated[
+        str | None,
+        Query(description="Comma-separated extras per recipe: interactions, stats"),
+    ] = None,
+) -> set[RecipeListInclude]:
+    if not include:
+        return set()
+    requested = {part.strip() for part in include.split(",") if part.strip()}
+    allowed: set[RecipeListInclude] = set(get_args(RecipeListInclude))
+    unknown = requested - allowed
+    if unknown:
+        raise BadRequestError(f"Unknown include value(s): {', '.join(sorted(unknown))}")
+    return {value for value in allowed if value in requested}
+
+
+def _parse_nutrition(
+    min_calories: Annotated[int | None, Query(ge=0)] = None,
+    max_calories: Annotated[int | None, Query(ge=0)] = None,
+    min_protein: Annotated[float | None, Query(ge=0, description="Protein (g)")] = None,
+    max_protein: Annotated[float | None, Query(ge=0, description="Protein (g)")] = None,
+    min_carbs: Annotated[float | None, Query(ge=0, description="Carbohydrates (g)")] = None,
+    max_carbs: Annotated[float | None, Query(ge=0, description="Carbohydrates (g)")] = None,
+    min_fat: Annotated[float | None, Query(ge=0, description="Fat (g)")] = None,
+    max_fat: Annotated[float | None, Query(ge=0, description="Fat (g)")] = None,
+) -> NutritionFilter | None:
+    nutrition = NutritionFilter(
+        min_calories=min_calories,
+        max_calories=max_calories,
+        min_protein=min_protein,
+        max_protein=max_protein,
+        min_carbs=min_carbs,
+        max_carbs=max_carbs,
+        min_fat=min_fat,
+        max_fat=max_fat,
+    )
+    ranges = nutrition.ranges()
+    for column, (low, high) in ranges.items():
+        if low is not None and high is not None and low > high:
+            raise BadRequestError(f"Minimum {column} is greater than the maximum")
+    return nutrition if ranges else None
+
+
 # ==================== Static Routes (must come before dynamic routes) ====================
 
 
@@ -64,15 +119,23 @@ async def create_recipe(
 async def list_recipes(
     page: Annotated[int, Query(ge=1)] = 1,
     limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    include: set[RecipeListInclude] = Depends(_parse_include),
     user_id: str = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
+    redis: RedisClient = Depends(get_redis),
 ):
     service = RecipeService(db)
     recipes, meta = await service.get_user_recipes(user_id, page, limit)
+    extras = await RecipeInteractionService(db, redis).get_list_extras(
+        user_id, [r.id for r in recipes], include
+    )
 
     return PaginatedResponse(
         success=True,
-        data=[RecipeResponse.model_validate(r) for r in recipes],
+        data=[
+            RecipeResponse.model_validate(r).model_copy(update=extras.get(r.id, {}))
+            for r in recipes
+        ],
         meta=meta,
     )
 
@@ -85,10 +148,13 @@ async def search_recipes(
     difficulty: RecipeDifficulty | None = None,
     max_prep_time: Annotated[int | None, Query(ge=0)] = None,
     max_cook_time: Annotated[int | None, Query(ge=0)] = None,
+    nutrition: NutritionFilter | None = Depends(_parse_nutrition),
     page: Annotated[int, Query(ge=1)] = 1,
     limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    include: set[RecipeListInclude] = Depends(_parse_include),
     user_id: str = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
+    redis: RedisClient = Depends(get_redis),
 ):
     service = RecipeService(db)
     params = RecipeSearchParams(
@@ -98,14 +164,21 @@ async def search_recipes(
         difficulty=difficulty,
         max_prep_time=max_prep_time,
         max_cook_time=max_cook_time,
+        nutrition=nutrition,
         page=page,
         limit=limit,
     )
     recipes, meta = await service.search_recipes(user_id, params)
+    extras = await RecipeInteractionService(db, redis).get_list_extras(
+        user_id, [r.id for r in recipes], include
+    )
 
     return PaginatedResponse(
         success=True,
-        data=[RecipeResponse.model_validate(r) for r in recipes],
+        data=[
+            RecipeResponse.model_validate(r).model_copy(update=extras.get(r.id, {}))
+            for r in recipes
+        ],
         meta=meta,
     )
 
@@ -115,10 +188,13 @@ async def browse_all_recipes(
     query: str | None = None,
     categories: Annotated[list[RecipeCategory] | None, Query()] = None,
     difficulty: RecipeDifficulty | None = None,
+    nutrition: NutritionFilter | None = Depends(_parse_nutrition),
     page: Annotated[int, Query(ge=1)] = 1,
     limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    include: set[RecipeListInclude] = Depends(_parse_include),
     user_id: str = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
+    redis: RedisClient = Depends(get_redis),
 ):
     """
     Browse recipes from both recipes and cached_recipes tables.
@@ -131,13 +207,48 @@ async def browse_all_recipes(
         query=query,
         categories=categories,
         difficulty=difficulty,
+        nutrition=nutrition,
         page=page,
         limit=limit,
     )
+    # Cached recipes have no interactions and get the defaults
+    extras = await RecipeInteractionService(db, redis).get_list_extras(
+        user_id, [r["id"] for r in rows], include
+    )
 
     return PaginatedResponse(
         success=True,
-        data=[BrowseRecipeResponse(**r) for r in rows],
+        data=[BrowseRecipeResponse(**r, **extras.get(r["id"], {})) for r in rows],
+        meta=meta,
+    )
+
+
+@router.get("/by-ingredients", response_model=PaginatedResponse[IngredientMatchResponse])
+async def find_recipes_by_ingredients(
+    ingredients: Annotated[list[str], Query(min_length=1, max_length=50)],
+    min_coverage: Annotated[float, Query(ge=0, le=1)] = 0.0,
+    page: Annotated[int, Query(ge=1)] = 1,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Find recipes that can be cooked with the given ingredients.
+
+    Searches user recipes and cached recipes, ranked by the fraction of each
+    recipe's ingredients covered by the given names.
+    """
+    service = RecipeService(db)
+    rows, meta = await service.find_by_ingredients(
+        ingredients=ingredients,
+        min_coverage=min_coverage,
+        page=page,
+        limit=limit,
+    )
+
+    return PaginatedResponse(
+        success=True,
+        data=[IngredientMatchResponse(**r) for r in rows],
         meta=meta,
     )
 
@@ -147,19 +258,18 @@ async def get_browse_recipe(
     recipe_id: str,
     user_id: str = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
+    redis: RedisClient = Depends(get_redis),
 ):
     """
     Get recipe detail without ownership check (for browsing).
 
-    Works for both user-created and cached external recipes.
+    Works for both user-created and cached external recipes. The serialized
+    document is cached in Redis and sent as is.
     """
-    service = RecipeService(db)
-    data, _is_cached = await service.get_recipe_or_cached_public(recipe_id)
+    service = RecipeService(db, redis)
+    document = await service.get_browse_recipe_json(recipe_id)
 
-    return ApiResponse(
-        success=True,
-        data=BrowseRecipeWithDetailsResponse(**data),
-    )
+    return raw_api_response(document)
 
 
 @router.post("/extract-from-url", response_model=URLExtractionResponse)
@@ -186,9 +296,10 @@ async def get_favorite_recipes(
     limit: Annotated[int, Query(ge=1, le=100)] = 20,
     user_id: str = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
+    redis: RedisClient = Depends(get_redis),
 ):
     """사용자의 즐겨찾기 레시피 목록을 반환합니다."""
-    service = RecipeInteractionService(db)
+    service = RecipeInteractionService(db, redis)
     recipes, meta = await service.get_favorite_recipes(user_id, page, limit)
 
     return PaginatedResponse(
@@ -198,6 +309,70 @@ async def get_favorite_recipes(
     )
 
 
+@router.get("/top-rated", response_model=PaginatedResponse[TopRatedRecipeResponse])
+async def get_top_rated_recipes(
+    min_ratings: Annotated[int, Query(ge=1)] = 1,
+    page: Annotated[int, Query(ge=1)] = 1,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """평균 평점이 높은 순으로 레시피 목록을 반환합니다."""
+    service = RecipeInteractionService(db)
+    recipes, meta = await service.get_top_rated_recipes(min_ratings, page, limit)
+
+    return PaginatedResponse(
+        success=True,
+        data=[TopRatedRecipeResponse.model_validate(r) for r in recipes],
+        meta=meta,
+    )
+
+
+@router.get("/leaderboards/imports", response_model=ApiResponse[list[LeaderboardImportResponse]])
+async def get_import_leaderboard(
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+    redis: RedisClient = Depends(get_redis),
+):
+    """최근 많이 가져온 외부 레시피 순위를 반환합니다 (Redis 리더보드)."""
+    service = RecipeInteractionService(db, redis)
+    leaders = await service.get_import_leaderboard(limit)
+
+    return ApiResponse(
+        success=True,
+        data=[LeaderboardImportResponse.model_validate(leader) for leader in leaders],
+    )
+
+
+@router.get("/leaderboards/{board}", response_model=ApiResponse[list[LeaderboardRecipeResponse]])
+async def get_recipe_leaderboard(
+    board: RecipeLeaderboardName,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+    redis: RedisClient = Depends(get_redis),
+):
+    """
+    레시피 리더보드 상위 N개를 반환합니다 (Redis sorted set).
+
+    - trending: 최근 즐겨찾기/평점 활동 (시간 감쇠)
+    - top_rated: 평점 수로 보정한 평균 평점
+    """
+    service = RecipeInteractionService(db, redis)
+    leaders = await service.get_leaderboard(board, limit)
+
+    return ApiResponse(
+        success=True,
+        data=[
+            LeaderboardRecipeResponse(
+                **TopRatedRecipeResponse.model_validate(recipe).model_dump(), score=score
+            )
+            for recipe, score in leaders
+        ],
+    )
+
+
 # ==================== External Recipe Endpoints ====================
 
 
@@ -209,6 +384,8 @@ async def discover_recipes(
         None, description="Filter by meal type: breakfast, lunch, dinner, snack"
     ),
     number: Annotated[int, Query(ge=1, le=50)] = 20,
+    nutrition: NutritionFilter | None = Depends(_parse_nutrition),
+    include: set[RecipeListInclude] = Depends(_parse_include),
     user_id: str = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
     redis: RedisClient = Depends(get_redis),
@@ -217,7 +394,7 @@ async def discover_recipes(
     외부 소스에서 다양한 레시피를 발견합니다.
 
     - Spoonacular와 TheMealDB에서 레시피 추천
-    - 카테고리, 요리 종류로 필터링 가능
+    - 카테고리, 요리 종류, 영양 성분 범위(min_/max_)로 필터링 가능
     - 결과 캐싱 (1시간)
     """
     service = ExternalRecipeService(db, redis)
@@ -226,9 +403,27 @@ async def discover_recipes(
         category=category,
         cuisine=cuisine,
         meal_type=meal_type,
+        nutrition=nutrition.ranges() if nutrition else None,
         number=number,
     )
-    return ApiResponse(success=True, data=results)
+    if not include:
+        return ApiResponse(success=True, data=results)
+
+    discovered = DiscoverRecipesResponse.model_validate(results)
+    sources = ("korean_seed", "spoonacular", "themealdb")
+    extras = await RecipeInteractionService(db, redis).get_external_list_extras(
+        user_id,
+        [(p.source, p.external_id) for source in sources for p in getattr(discovered, source)],
+        include,
+    )
+    for source in sources:
+        previews = getattr(discovered, source)
+        setattr(
+            discovered,
+            source,
+            [p.model_copy(update=extras.get((p.source, p.external_id), {})) for p in previews],
+        )
+    return ApiResponse(success=True, data=discovered)
 
 
 @router.get("/search/external", response_model=ApiResponse[ExternalSearchResponse])
@@ -336,6 +531,36 @@ async def get_external_recipe(
     return ApiResponse(success=True, data=recipe)
 
 
+@router.post("/import", response_model=ApiResponse[ExternalRecipeBulkImportResponse])
+async def import_external_recipes(
+    data: ExternalRecipeBulkImportRequest,
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+    redis: RedisClient = Depends(get_redis),
+):
+    """
+    여러 외부 레시피를 한 번에 내 컬렉션으로 가져옵니다.
+
+    - 이미 가져온 레시피는 기존 데이터 반환
+    - 캐시에 없는 레시피만 동시에 조회한 뒤 한 번에 저장
+    - 찾을 수 없는 레시피는 not_found로 반환
+    """
+    service = ExternalRecipeService(db, redis)
+    refs = list(dict.fromkeys((r.source, r.external_id) for r in data.recipes))
+    recipes = await service.import_recipes(user_id, refs, skip_missing=True)
+    return ApiResponse(
+        success=True,
+        data=ExternalRecipeBulkImportResponse(
+            recipes=[RecipeResponse.model_validate(recipes[ref]) for ref in refs if ref in recipes],
+            not_found=[
+                ExternalRecipeRef(source=source, external_id=external_id)
+                for source, external_id in refs
+                if (source, external_id) not in recipes
+            ],
+        ),
+    )
+
+
 @router.post(
     "/import/{source}/{external_id}", response_model=ApiResponse[RecipeWithDetailsResponse]
 )
@@ -384,8 +609,9 @@ async def update_recipe(
     data: RecipeUpdate,
     user_id: str = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
+    redis: RedisClient = Depends(get_redis),
 ):
-    service = RecipeService(db)
+    service = RecipeService(db, redis)
     recipe = await service.update_recipe(recipe_id, user_id, data)
 
     return ApiResponse(
@@ -399,8 +625,9 @@ async def delete_recipe(
     recipe_id: str,
     user_id: str = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
+    redis: RedisClient = Depends(get_redis),
 ):
-    service = RecipeService(db)
+    service = RecipeService(db, redis)
     await service.delete_recipe(recipe_id, user_id)
 
 
@@ -410,8 +637,9 @@ async def adjust_servings(
     servings: Annotated[int, Query(ge=1, le=100)],
     user_id: str = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
+    redis: RedisClient = Depends(get_redis),
 ):
-    service = RecipeService(db)
+    service = RecipeService(db, redis)
     recipe = await service.adjust_servings(recipe_id, user_id, servings)
 
     return ApiResponse(
@@ -492,9 +720,10 @@ async def create_rating(
     data: RecipeRatingCreate,
     user_id: str = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
+    redis: RedisClient = Depends(get_redis),
 ):
     """레시피에 평점을 추가합니다."""
-    service = RecipeInteractionService(db)
+    service = RecipeInteractionService(db, redis)
     rating = await service.rate_recipe(user_id, recipe_id, data)
 
     return ApiResponse(
@@ -509,9 +738,10 @@ async def update_rating(
     data: RecipeRatingUpdate,
     user_id: str = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
+    redis: RedisClient = Depends(get_redis),
 ):
     """내 평점을 수정합니다."""
-    service = RecipeInteractionService(db)
+    service = RecipeInteractionService(db, redis)
     rating = await service.update_rating(user_id, recipe_id, data)
 
     return ApiResponse(
@@ -525,9 +755,10 @@ async def delete_rating(
     recipe_id: str,
     user_id: str = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
+    redis: RedisClient = Depends(get_redis),
 ):
     """내 평점을 삭제합니다."""
-    service = RecipeInteractionService(db)
+    service = RecipeInteractionService(db, redis)
     await service.delete_rating(user_id, recipe_id)
 
 
@@ -536,9 +767,10 @@ async def check_favorite(
     recipe_id: str,
     user_id: str = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
+    redis: RedisClient = Depends(get_redis),
 ):
     """레시피가 즐겨찾기에 있는지 확인합니다."""
-    service = RecipeInteractionService(db)
+    service = RecipeInteractionService(db, redis)
     is_favorite = await service.is_favorite(user_id, recipe_id)
 
     return ApiResponse(success=True, data=is_favorite)
@@ -549,9 +781,10 @@ async def add_favorite(
     recipe_id: str,
     user_id: str = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
+    redis: RedisClient = Depends(get_redis),
 ):
     """레시피를 즐겨찾기에 추가합니다."""
-    service = RecipeInteractionService(db)
+    service = RecipeInteractionService(db, redis)
     added = await service.add_favorite(user_id, recipe_id)
 
     return ApiResponse(success=True, data=added)
@@ -562,9 +795,10 @@ async def remove_favorite(
     recipe_id: str,
     user_id: str = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
+    redis: RedisClient = Depends(get_redis),
 ):
     """레시피를 즐겨찾기에서 제거합니다."""
-    service = RecipeInteractionService(db)
+    service = RecipeInteractionService(db, redis)
     removed = await service.remove_favorite(user_id, recipe_id)
 
     return ApiResponse(success=True, data=removed)
@@ -1,13 +1,15 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Header, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.database import get_db
+from src.core.etag import etag_matches, make_etag, not_modified, set_etag
 from src.core.security import get_current_user_id
 from src.schemas.common import ApiResponse, PaginatedResponse
 from src.schemas.shopping_list import (
     GenerateShoppingListRequest,
+    ShoppingItemBatchRequest,
     ShoppingItemCreate,
     ShoppingItemResponse,
     ShoppingItemUpdate,
@@ -84,12 +86,21 @@ async def generate_from_meal_plan(
 @router.get("/{shopping_list_id}", response_model=ApiResponse[ShoppingListWithItemsResponse])
 async def get_shopping_list(
     shopping_list_id: str,
+    response: Response,
+    if_none_match: Annotated[str | None, Header()] = None,
     user_id: str = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
     service = ShoppingListService(db)
+    if if_none_match:
+        version = await service.get_shopping_list_version(shopping_list_id, user_id)
+        etag = make_etag(shopping_list_id, version)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
     shopping_list = await service.get_shopping_list(shopping_list_id, user_id)
 
+    set_etag(response, make_etag(shopping_list.id, shopping_list.version))
     return ApiResponse(
         success=True,
         data=ShoppingListWithItemsResponse.model_validate(shopping_list),
@@ -126,6 +137,25 @@ async def add_item(
     )
 
 
+@router.post(
+    "/{shopping_list_id}/items/batch",
+    response_model=ApiResponse[ShoppingListWithItemsResponse],
+)
+async def batch_update_items(
+    shopping_list_id: str,
+    data: ShoppingItemBatchRequest,
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    service = ShoppingListService(db)
+    shopping_list = await service.batch_update_items(shopping_list_id, user_id, data)
+
+    return ApiResponse(
+        success=True,
+        data=ShoppingListWithItemsResponse.model_validate(shopping_list),
+    )
+
+
 @router.patch(
     "/{shopping_list_id}/items/{item_id}",
     response_model=ApiResponse[ShoppingItemResponse],
@@ -1,6 +1,15 @@
 from fastapi import APIRouter
 
-from src.api.v1.endpoints import auth, health, meal_plans, proxy, recipes, shopping_lists, users
+from src.api.v1.endpoints import (
+    auth,
+    health,
+    meal_plan_templates,
+    meal_plans,
+    proxy,
+    recipes,
+    shopping_lists,
+    users,
+)
 
 api_router = APIRouter()
 
@@ -9,6 +18,11 @@ api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(recipes.router, prefix="/recipes", tags=["recipes"])
 api_router.include_router(meal_plans.router, prefix="/meal-plans", tags=["meal-plans"])
+api_router.include_router(
+    meal_plan_templates.router,
+    prefix="/meal-plan-templates",
+    tags=["meal-plans"],
+)
 api_router.include_router(
     shopping_lists.router,
     prefix="/shopping-lists",
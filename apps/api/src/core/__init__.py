@@ -1,4 +1,24 @@
-from src.core.config import settings
-from src.core.database import get_db
+"""
+Core package. Exports resolve on first access, so modules that need no settings
+(e.g. src.core.nutrition at image build time) import without configuration.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from src.core.config import settings
+    from src.core.database import get_db
+
+_EXPORTS = {
+    "settings": "src.core.config",
+    "get_db": "src.core.database",
+}
 
 __all__ = ["settings", "get_db"]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
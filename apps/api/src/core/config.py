@@ -25,6 +25,14 @@ class Settings(BaseSettings):
     # Redis
     redis_url: RedisDsn
 
+    # Favorites write-behind: changes go to Redis and are flushed to PostgreSQL in
+    # batches (see src/services/favorite_buffer.py for the crash semantics)
+    favorites_write_behind: bool = False
+    favorites_flush_interval_seconds: float = Field(default=2.0, gt=0)
+
+    # Recipe leaderboards in Redis sorted sets (see src/services/leaderboard.py)
+    leaderboard_compaction_interval_seconds: float = Field(default=3600.0, gt=0)
+
     # JWT
     jwt_secret_key: str
     jwt_refresh_secret_key: str = ""  # Falls back to jwt_secret_key if empty
@@ -0,0 +1,37 @@
+"""Conditional GET support for aggregates with a version counter.
+
+An aggregate (meal plan, shopping list) carries a version that is bumped on
+every mutation of it or its children, so ``(id, version)`` identifies one
+representation and clients can revalidate with a single version lookup.
+"""
+
+from fastapi import Response, status
+
+# Clients may keep a copy but must revalidate before using it
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(resource_id: str, version: int) -> str:
+    """Weak ETag: the JSON body is equivalent, not byte-identical, across versions."""
+    return f'W/"{resource_id}.{version}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against the current ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+def not_modified(etag: str) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_etag(response, etag)
+    return response
@@ -105,3 +105,12 @@ class MealSlotConflictError(AppException):
             code="MEALPLAN_002",
             status_code=409,
         )
+
+
+class MealPlanTemplateConflictError(AppException):
+    def __init__(self, name: str):
+        super().__init__(
+            message=f"Meal plan template '{name}' already exists",
+            code="MEALPLAN_003",
+            status_code=409,
+        )
@@ -0,0 +1,214 @@
+"""Keyword-based shopping category classification for ingredient names.
+
+Each category's keywords are compiled into one regex; categories are tried in
+CATEGORY_KEYWORDS order and the first hit wins. Results are memoized per name.
+"""
+
+import re
+from functools import lru_cache
+
+DEFAULT_CATEGORY = "pantry"
+
+# Checked in order: condiments come first so "고추장" is not produce via "고추"
+# and "멸치액젓" is not meat via "멸치".
+CATEGORY_KEYWORDS: dict[str, list[str]] = {
+    "pantry": [
+        "고추장",
+        "고춧가루",
+        "된장",
+        "간장",
+        "액젓",
+        "참기름",
+        "들기름",
+        "식용유",
+        "식초",
+        "고추기름",
+        "soy sauce",
+        "fish sauce",
+        "vinegar",
+        "olive oil",
+        "vegetable oil",
+        "peanut butter",
+        "stock cube",
+        "bouillon",
+    ],
+    "produce": [
+        "채소",
+        "야채",
+        "과일",
+        "상추",
+        "당근",
+        "양파",
+        "마늘",
+        "토마토",
+        "감자",
+        "고구마",
+        "대파",
+        "쪽파",
+        "배추",
+        "양배추",
+        "시금치",
+        "콩나물",
+        "숙주",
+        "오이",
+        "호박",
+        "버섯",
+        "고추",
+        "피망",
+        "파프리카",
+        "생강",
+        "깻잎",
+        "부추",
+        "미나리",
+        "사과",
+        "레몬",
+        "onion",
+        "garlic",
+        "carrot",
+        "potato",
+        "tomato",
+        "lettuce",
+        "cabbage",
+        "spinach",
+        "scallion",
+        "spring onion",
+        "green onion",
+        "shallot",
+        "leek",
+        "ginger",
+        "mushroom",
+        "cucumber",
+        "zucchini",
+        "courgette",
+        "aubergine",
+        "eggplant",
+        "broccoli",
+        "cauliflower",
+        "celery",
+        "bell pepper",
+        "chilli",
+        "chili",
+        "lemon",
+        "lime",
+        "apple",
+        "banana",
+        "avocado",
+        "parsley",
+        "coriander",
+        "cilantro",
+        "basil",
+        "bean sprout",
+    ],
+    "meat": [
+        "고기",
+        "소고기",
+        "돼지",
+        "닭",
+        "베이컨",
+        "햄",
+        "소시지",
+        "생선",
+        "새우",
+        "오징어",
+        "조개",
+        "멸치",
+        "고등어",
+        "연어",
+        "참치",
+        "beef",
+        "pork",
+        "chicken",
+        "lamb",
+        "mutton",
+        "turkey",
+        "duck",
+        "bacon",
+        "ham",
+        "sausage",
+        "mince",
+        "fish",
+        "salmon",
+        "tuna",
+        "cod",
+        "shrimp",
+        "prawn",
+        "squid",
+        "clam",
+        "mussel",
+    ],
+    "dairy": [
+        "우유",
+        "치즈",
+        "버터",
+        "요구르트",
+        "요거트",
+        "생크림",
+        "계란",
+        "달걀",
+        "milk",
+        "cheese",
+        "butter",
+        "yogurt",
+        "yoghurt",
+        "cream",
+        "egg",
+    ],
+    "bakery": ["빵", "베이커리", "bread", "baguette", "tortilla", "bun"],
+    "frozen": ["냉동", "frozen"],
+    "beverages": ["주스", "콜라", "사이다", "맥주", "juice", "beer"],
+}
+
+_CACHE_SIZE = 4096
+
+
+def _is_korean(keyword: str) -> bool:
+    return any("\uac00" <= ch <= "\ud7a3" for ch in keyword)
+
+
+def _compile(keywords: list[str]) -> re.Pattern[str]:
+    """
+    Korean keywords match as substrings (names are often compounds such as
+    "돼지고기"); English keywords must start a word so "ham" skips "graham".
+    """
+    # Longest first so the alternation never stops on a shorter prefix
+    ordered = sorted({kw.lower() for kw in keywords}, key=len, reverse=True)
+    korean = [re.escape(kw) for kw in ordered if _is_korean(kw)]
+    english = [re.escape(kw) for kw in ordered if not _is_korean(kw)]
+    branches = []
+    if korean:
+        branches.append("|".join(korean))
+    if english:
+        branches.append(r"\b(?:" + "|".join(english) + ")")
+    return re.compile("|".join(branches) if branches else r"(?!)")
+
+
+_matchers: list[tuple[str, re.Pattern[str]]] = []
+
+
+def _build_matchers() -> None:
+    global _matchers
+    _matchers = [(category, _compile(kws)) for category, kws in CATEGORY_KEYWORDS.items()]
+    categorize_ingredient.cache_clear()
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def categorize_ingredient(name: str) -> str:
+    """Return the shopping category for an ingredient name."""
+    name_lower = name.lower()
+    for category, matcher in _matchers:
+        if matcher.search(name_lower):
+            return category
+    return DEFAULT_CATEGORY
+
+
+def register_category_keywords(category: str, keywords: list[str]) -> None:
+    """
+    Add keywords to a category (new categories are checked last) and recompile.
+
+    Clears the memoized results, so call it at startup rather than per request.
+    """
+    CATEGORY_KEYWORDS.setdefault(category, []).extend(keywords)
+    _build_matchers()
+
+
+_build_matchers()
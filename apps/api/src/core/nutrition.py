@@ -0,0 +1,40 @@
+"""Nutrition range filters shared by the recipe and cached recipe queries.
+
+Ranges are keyed by column name; recipes and cached_recipes use the same
+names. Each bound becomes a plain comparison on the bare column (no casts or
+COALESCE) so the partial B-tree indexes from migration 013 apply, and a
+recipe without the value never matches a bounded range, in SQL and here alike.
+"""
+
+from typing import Any
+
+from sqlalchemy import ColumnElement
+
+NUTRITION_COLUMNS = ("calories", "protein_grams", "carbs_grams", "fat_grams")
+
+NutritionRanges = dict[str, tuple[float | None, float | None]]
+
+
+def nutrition_conditions(entity: Any, ranges: NutritionRanges | None) -> list[ColumnElement[bool]]:
+    """WHERE clauses for the given (min, max) ranges on a mapped recipe class."""
+    conditions: list[ColumnElement[bool]] = []
+    for column_name, (low, high) in (ranges or {}).items():
+        column = getattr(entity, column_name)
+        if low is not None:
+            conditions.append(column >= low)
+        if high is not None:
+            conditions.append(column <= high)
+    return conditions
+
+
+def matches_nutrition(recipe: dict[str, Any], ranges: NutritionRanges | None) -> bool:
+    """The same ranges checked against a recipe dict (seed data, live API results)."""
+    for column_name, (low, high) in (ranges or {}).items():
+        value = recipe.get(column_name)
+        if value is None:
+            return False
+        if low is not None and value < low:
+            return False
+        if high is not None and value > high:
+            return False
+    return True
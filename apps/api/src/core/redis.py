@@ -41,8 +41,9 @@ class RedisClient:
         key: str,
         value: str,
         ex: int | None = None,
-    ) -> bool:
-        return await self.client.set(key, value, ex=ex)
+        nx: bool = False,
+    ) -> bool | None:
+        return await self.client.set(key, value, ex=ex, nx=nx)
 
     async def delete(self, key: str) -> int:
         return await self.client.delete(key)
@@ -74,6 +75,21 @@ class RedisClient:
     async def hdel(self, name: str, *keys: str) -> int:
         return await self.client.hdel(name, *keys)
 
+    async def sismember(self, name: str, value: str) -> bool:
+        return bool(await self.client.sismember(name, value))
+
+    async def srandmember(self, name: str, count: int) -> list[str]:
+        return await self.client.srandmember(name, count)
+
+    async def zadd(self, name: str, mapping: dict[str, float]) -> int:
+        return await self.client.zadd(name, mapping)
+
+    async def zrem(self, name: str, *members: str) -> int:
+        return await self.client.zrem(name, *members)
+
+    async def eval(self, script: str, keys: list[str], args: list[Any]) -> Any:
+        return await self.client.eval(script, len(keys), *keys, *args)
+
     def pipeline(self):
         return self.client.pipeline()
 
@@ -0,0 +1,18 @@
+"""Responses for JSON documents that are already serialized, e.g. by PostgreSQL."""
+
+from fastapi import Response
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def raw_api_response(data_json: str) -> Response:
+    """
+    Wrap a serialized JSON document as the data of an ApiResponse envelope.
+
+    The document is spliced in as is, skipping model validation and re-encoding,
+    so it must already match the endpoint's response model.
+    """
+    return Response(
+        content=f'{{"success":true,"data":{data_json},"error":null,"meta":null}}',
+        media_type=JSON_MEDIA_TYPE,
+    )
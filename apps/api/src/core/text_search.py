@@ -0,0 +1,81 @@
+"""Full-text search over the weighted search_vector columns.
+
+Korean is written without spaces between a noun and its particles or between
+the parts of a compound ("김치찌개를"), so whole-word lexemes rarely match what
+people type. Both sides are tokenized with Hangul syllable bigrams instead:
+every run of two or more syllables becomes its overlapping bigrams
+("김치찌개" -> "김치 치찌 찌개"), and each query term becomes a phrase of its
+bigrams, which matches the term anywhere inside a word.
+
+The document side runs in PostgreSQL (hangul_bigrams() and
+weighted_search_vector(), migration 011); hangul_bigrams here must stay in
+step with it. Vectors also hold every Hangul syllable on its own so
+single-syllable terms such as "국" still match "된장국".
+"""
+
+import re
+from typing import Any
+
+from sqlalchemy import ColumnElement, SQLColumnExpression, func
+
+SEARCH_CONFIG = "simple"
+
+# ts_rank normalization 1: divide by 1 + log(document length) so a long
+# description does not outrank a title hit
+RANK_NORMALIZATION = 1
+
+_HANGUL_RUN = re.compile("[가-힣]{2,}")
+# A quoted phrase (closing quote optional, like websearch_to_tsquery) or a bare term
+_QUERY_TOKEN = re.compile(r'"([^"]*)"?|(\S+)')
+
+
+def hangul_bigrams(text: str) -> str:
+    """Replace each run of 2+ Hangul syllables with its space-separated bigrams."""
+
+    def _split(match: re.Match[str]) -> str:
+        run = match.group()
+        return " " + " ".join(run[i : i + 2] for i in range(len(run) - 1)) + " "
+
+    return _HANGUL_RUN.sub(_split, text)
+
+
+def _phrase(text: str) -> str:
+    return " ".join(hangul_bigrams(text.replace('"', " ")).split())
+
+
+def to_websearch_query(query: str) -> str:
+    """
+    Rewrite a user query into websearch_to_tsquery syntax over bigrams.
+
+    Terms, "quoted phrases", `or` and `-negation` keep their websearch meaning;
+    every term is sent as a quoted phrase so its bigrams must be adjacent.
+    """
+    parts = []
+    for match in _QUERY_TOKEN.finditer(query):
+        quoted, term = match.groups()
+        if term is not None and term.lower() == "or":
+            parts.append("or")
+            continue
+        prefix = ""
+        if term is not None and term.startswith("-"):
+            prefix, term = "-", term.lstrip("-")
+        phrase = _phrase(quoted if quoted is not None else term)
+        if phrase:
+            parts.append(f'{prefix}"{phrase}"')
+    return " ".join(parts)
+
+
+def search_tsquery(query: str) -> ColumnElement[Any]:
+    return func.websearch_to_tsquery(SEARCH_CONFIG, to_websearch_query(query))
+
+
+def search_match(
+    vector: SQLColumnExpression[Any], tsquery: SQLColumnExpression[Any]
+) -> ColumnElement[bool]:
+    return vector.bool_op("@@")(tsquery)
+
+
+def search_rank(
+    vector: SQLColumnExpression[Any], tsquery: SQLColumnExpression[Any]
+) -> ColumnElement[float]:
+    return func.ts_rank(vector, tsquery, RANK_NORMALIZATION)
@@ -0,0 +1,131 @@
+"""Ingredient unit canonicalization.
+
+Every known unit maps to one canonical unit per dimension (g for mass, ml for
+volume, 개 for counts) and a conversion factor, precomputed into a single
+lookup table at import time. Unknown units (대, 공기, 모, 꼬집, ...) are kept
+as-is, normalized to lowercase, so they still aggregate with themselves.
+"""
+
+import re
+
+MASS_UNIT = "g"
+VOLUME_UNIT = "ml"
+COUNT_UNIT = "개"
+
+# canonical unit -> {alias: factor}
+_CONVERSIONS: dict[str, dict[str, float]] = {
+    MASS_UNIT: {
+        "g": 1,
+        "gram": 1,
+        "grams": 1,
+        "그램": 1,
+        "mg": 0.001,
+        "kg": 1000,
+        "kilogram": 1000,
+        "kilograms": 1000,
+        "킬로그램": 1000,
+        "킬로": 1000,
+        "oz": 28.3495,
+        "ounce": 28.3495,
+        "ounces": 28.3495,
+        "lb": 453.592,
+        "lbs": 453.592,
+        "pound": 453.592,
+        "pounds": 453.592,
+        "근": 600,
+    },
+    VOLUME_UNIT: {
+        "ml": 1,
+        "milliliter": 1,
+        "milliliters": 1,
+        "millilitre": 1,
+        "millilitres": 1,
+        "밀리리터": 1,
+        "cc": 1,
+        "l": 1000,
+        "liter": 1000,
+        "liters": 1000,
+        "litre": 1000,
+        "litres": 1000,
+        "리터": 1000,
+        "작은술": 5,
+        "티스푼": 5,
+        "tsp": 5,
+        "teaspoon": 5,
+        "teaspoons": 5,
+        "큰술": 15,
+        "밥숟가락": 15,
+        "숟가락": 15,
+        "테이블스푼": 15,
+        "tbsp": 15,
+        "tbs": 15,
+        "tablespoon": 15,
+        "tablespoons": 15,
+        # Korean measuring cup (200 ml) vs US customary cup (240 ml)
+        "컵": 200,
+        "cup": 240,
+        "cups": 240,
+        "floz": 29.5735,
+        "pint": 473.176,
+        "pints": 473.176,
+        "quart": 946.353,
+        "quarts": 946.353,
+        "gallon": 3785.41,
+        "gallons": 3785.41,
+    },
+    COUNT_UNIT: {
+        "개": 1,
+        "ea": 1,
+        "each": 1,
+        "piece": 1,
+        "pieces": 1,
+        "pc": 1,
+        "pcs": 1,
+    },
+}
+
+# Recipe shorthand where case matters: "T" is a tablespoon, "t" a teaspoon
+_CASE_SENSITIVE: dict[str, tuple[str, float]] = {
+    "T": (VOLUME_UNIT, 15),
+    "t": (VOLUME_UNIT, 5),
+}
+
+_UNIT_TABLE: dict[str, tuple[str, float]] = {
+    alias: (canonical, factor)
+    for canonical, aliases in _CONVERSIONS.items()
+    for alias, factor in aliases.items()
+}
+
+_STRIP_PATTERN = re.compile(r"[\s.]+")
+
+
+def normalize_unit(unit: str) -> str:
+    """Lowercase a unit and drop whitespace and dots ("Tbsp." -> "tbsp")."""
+    return _STRIP_PATTERN.sub("", unit).lower()
+
+
+def canonicalize(amount: float, unit: str) -> tuple[float, str]:
+    """
+    Convert an amount to its canonical unit.
+
+    Returns (canonical_amount, canonical_unit). Unknown units keep their amount
+    and use the normalized unit string.
+    """
+    stripped = unit.strip()
+    entry = _CASE_SENSITIVE.get(stripped)
+    if entry is None:
+        key = normalize_unit(stripped)
+        entry = _UNIT_TABLE.get(key)
+        if entry is None:
+            return float(amount), key or stripped
+    canonical_unit, factor = entry
+    return round(float(amount) * factor, 3), canonical_unit
+
+
+def to_display_unit(amount: float, canonical_unit: str) -> tuple[float, str]:
+    """Scale large canonical amounts for display (1500 g -> 1.5 kg)."""
+    if canonical_unit == MASS_UNIT and amount >= 1000:
+        return amount / 1000, "kg"
+    if canonical_unit == VOLUME_UNIT and amount >= 1000:
+        return amount / 1000, "L"
+    return amount, canonical_unit
@@ -1,5 +1,6 @@
+import asyncio
 from collections.abc import AsyncIterator
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
@@ -10,6 +11,8 @@ from src.core.config import settings
 from src.core.exceptions import AppException
 from src.core.redis import redis_client
 from src.middleware.error_handler import app_exception_handler, generic_exception_handler
+from src.services.favorite_buffer import FavoriteWriteBuffer, run_favorite_flusher
+from src.services.leaderboard import RecipeLeaderboards, run_leaderboard_compactor
 
 
 class SecurityHeadersMiddleware(BaseHTTPMiddleware):
@@ -35,7 +38,27 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     await redis_client.connect()
+    flusher = None
+    if settings.favorites_write_behind:
+        flusher = asyncio.create_task(
+            run_favorite_flusher(
+                FavoriteWriteBuffer(redis_client), settings.favorites_flush_interval_seconds
+            )
+        )
+    compactor = asyncio.create_task(
+        run_leaderboard_compactor(
+            RecipeLeaderboards(redis_client), settings.leaderboard_compaction_interval_seconds
+        )
+    )
     yield
+    compactor.cancel()
+    with suppress(asyncio.CancelledError):
+        await compactor
+    if flusher:
+        # Cancelling drains the buffer before Redis goes away
+        flusher.cancel()
+        with suppress(asyncio.CancelledError):
+            await flusher
     await redis_client.disconnect()
 
 
@@ -59,7 +82,15 @@ app.add_middleware(
     allow_origins=settings.cors_origins_list,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PATCH", "PUT", "DELETE", "OPTIONS"],
-    allow_headers=["Authorization", "Content-Type", "Accept", "Origin", "X-Requested-With"],
+    allow_headers=[
+        "Authorization",
+        "Content-Type",
+        "Accept",
+        "Origin",
+        "X-Requested-With",
+        "If-None-Match",
+    ],
+    expose_headers=["ETag"],
 )
 
 app.add_exception_handler(AppException, app_exception_handler)
@@ -2,11 +2,14 @@ from src.models.cached_recipe import CachedRecipe
 from src.models.ingredient import Ingredient
 from src.models.instruction import Instruction
 from src.models.meal_plan import MealPlan
+from src.models.meal_plan_template import MealPlanTemplate
+from src.models.meal_plan_template_slot import MealPlanTemplateSlot
 from src.models.meal_slot import MealSlot
 from src.models.recipe import Recipe
 from src.models.recipe_favorite import RecipeFavorite
 from src.models.recipe_rating import RecipeRating
 from src.models.shopping_item import ShoppingItem
+from src.models.shopping_item_contribution import ShoppingItemContribution
 from src.models.shopping_list import ShoppingList
 from src.models.user import User
 
@@ -19,7 +22,10 @@ __all__ = [
     "Ingredient",
     "Instruction",
     "MealPlan",
+    "MealPlanTemplate",
+    "MealPlanTemplateSlot",
     "MealSlot",
     "ShoppingList",
     "ShoppingItem",
+    "ShoppingItemContribution",
 ]
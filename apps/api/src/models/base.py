@@ -1,8 +1,9 @@
 import uuid
 from datetime import UTC, datetime
 
-from sqlalchemy import DateTime, String
+from sqlalchemy import DateTime, String, func
 from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql.elements import ColumnElement
 
 from src.core.database import Base
 
@@ -11,6 +12,14 @@ def generate_uuid() -> str:
     return str(uuid.uuid4())
 
 
+def server_uuid() -> ColumnElement[str]:
+    """
+    A UUID generated by PostgreSQL, for INSERT ... SELECT statements, where a
+    Python-side default is evaluated once for the whole statement.
+    """
+    return func.gen_random_uuid().cast(String(36))
+
+
 def utc_now() -> datetime:
     return datetime.now(UTC)
 
@@ -53,3 +53,10 @@ class CachedRecipe(BaseModel):
 
     # Full-text search
     search_vector: Mapped[str | None] = mapped_column(TSVECTOR, nullable=True)
+
+    # Normalized ingredient names from ingredients_json, maintained by a trigger
+    ingredient_names: Mapped[list[str]] = mapped_column(
+        ARRAY(Text),
+        server_default="{}",
+        nullable=False,
+    )
@@ -16,6 +16,11 @@ class Ingredient(BaseModel):
     name: Mapped[str] = mapped_column(String(200), nullable=False)
     amount: Mapped[float] = mapped_column(Numeric(10, 2), nullable=False)
     unit: Mapped[str] = mapped_column(String(50), nullable=False)
+    # amount/unit converted by src.core.units, used for aggregation
+    canonical_amount: Mapped[float | None] = mapped_column(Numeric(12, 3), nullable=True)
+    canonical_unit: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    # Shopping category from src.core.ingredient_category, set at write time
+    category: Mapped[str | None] = mapped_column(String(20), nullable=True)
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
     order_index: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
 
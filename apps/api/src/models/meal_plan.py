@@ -1,6 +1,6 @@
 from datetime import date
 
-from sqlalchemy import Date, ForeignKey, Index, String, Text
+from sqlalchemy import Date, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.models.base import BaseModel
@@ -17,6 +17,8 @@ class MealPlan(BaseModel):
     )
     week_start_date: Mapped[date] = mapped_column(Date, nullable=False)
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Bumped on every change to the plan or its slots; served as the ETag
+    version: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
 
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="meal_plans")  # noqa: F821
@@ -0,0 +1,28 @@
+from sqlalchemy import ForeignKey, Index, String, Text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from src.models.base import BaseModel
+
+
+class MealPlanTemplate(BaseModel):
+    """A named week of meals a user can apply to any week."""
+
+    __tablename__ = "meal_plan_templates"
+
+    user_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    notes: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    # Relationships
+    slots: Mapped[list["MealPlanTemplateSlot"]] = relationship(  # noqa: F821
+        "MealPlanTemplateSlot",
+        back_populates="template",
+        cascade="all, delete-orphan",
+        order_by="MealPlanTemplateSlot.day_offset, MealPlanTemplateSlot.meal_type",
+    )
+
+    __table_args__ = (Index("ix_meal_plan_templates_user_name", "user_id", "name", unique=True),)
@@ -0,0 +1,44 @@
+from sqlalchemy import ForeignKey, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from src.core.database import Base
+from src.models.base import UUIDMixin
+
+
+class MealPlanTemplateSlot(Base, UUIDMixin):
+    """A template meal, placed by days from the start of the week."""
+
+    __tablename__ = "meal_plan_template_slots"
+
+    template_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("meal_plan_templates.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    recipe_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("recipes.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    day_offset: Mapped[int] = mapped_column(Integer, nullable=False)
+    meal_type: Mapped[str] = mapped_column(String(20), nullable=False)
+    servings: Mapped[int] = mapped_column(Integer, default=4, nullable=False)
+    notes: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    # Relationships
+    template: Mapped["MealPlanTemplate"] = relationship(  # noqa: F821
+        "MealPlanTemplate",
+        back_populates="slots",
+    )
+    recipe: Mapped["Recipe"] = relationship("Recipe")  # noqa: F821
+
+    __table_args__ = (
+        Index(
+            "ix_meal_plan_template_slots_unique",
+            "template_id",
+            "day_offset",
+            "meal_type",
+            unique=True,
+        ),
+    )
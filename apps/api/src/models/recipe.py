@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Index, Integer, Numeric, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, Numeric, String, Text, text
 from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -59,6 +59,18 @@ class Recipe(BaseModel):
     # Full-text search vector
     search_vector: Mapped[str | None] = mapped_column(TSVECTOR, nullable=True)
 
+    # Normalized ingredient names, maintained by triggers on ingredients
+    ingredient_names: Mapped[list[str]] = mapped_column(
+        ARRAY(Text),
+        server_default="{}",
+        nullable=False,
+    )
+
+    # Interaction counters, maintained by triggers on recipe_ratings/recipe_favorites
+    rating_sum: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    rating_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    favorites_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="recipes")  # noqa: F821
     ingredients: Mapped[list["Ingredient"]] = relationship(  # noqa: F821
@@ -92,5 +104,41 @@ class Recipe(BaseModel):
         Index("ix_recipes_categories", "categories", postgresql_using="gin"),
         Index("ix_recipes_tags", "tags", postgresql_using="gin"),
         Index("ix_recipes_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_recipes_ingredient_names", "ingredient_names", postgresql_using="gin"),
         Index("ix_recipes_external_source", "external_source", "external_id"),
+        Index(
+            "ix_recipes_nutrition",
+            "calories",
+            "protein_grams",
+            "carbs_grams",
+            "fat_grams",
+            postgresql_where=text("calories IS NOT NULL"),
+        ),
+        Index(
+            "ix_recipes_protein_grams",
+            "protein_grams",
+            postgresql_where=text("protein_grams IS NOT NULL"),
+        ),
+        Index(
+            "ix_recipes_carbs_grams",
+            "carbs_grams",
+            postgresql_where=text("carbs_grams IS NOT NULL"),
+        ),
+        Index(
+            "ix_recipes_fat_grams",
+            "fat_grams",
+            postgresql_where=text("fat_grams IS NOT NULL"),
+        ),
+        Index(
+            "ix_recipes_top_rated",
+            text(
+                "(CAST(rating_sum AS DOUBLE PRECISION) / CAST(rating_count AS DOUBLE PRECISION)) DESC"
+            ),
+            text("rating_count DESC"),
+            postgresql_where=text("rating_count > 0"),
+        ),
     )
+
+    @property
+    def average_rating(self) -> float | None:
+        return self.rating_sum / self.rating_count if self.rating_count else None
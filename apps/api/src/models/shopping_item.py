@@ -27,6 +27,10 @@ class ShoppingItem(Base, UUIDMixin):
     is_checked: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     category: Mapped[str] = mapped_column(String(50), default="other", nullable=False)
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Set on items generated from a meal plan: lowercased ingredient name and
+    # canonical unit, the key that slot contributions are summed under
+    ingredient_key: Mapped[str | None] = mapped_column(String(200), nullable=True)
+    canonical_unit: Mapped[str | None] = mapped_column(String(50), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         default=utc_now,
@@ -0,0 +1,32 @@
+from sqlalchemy import ForeignKey, Index, Numeric, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.core.database import Base
+from src.models.base import UUIDMixin
+
+
+class ShoppingItemContribution(Base, UUIDMixin):
+    """Amount (in the item's canonical unit) one meal slot adds to a generated item."""
+
+    __tablename__ = "shopping_item_contributions"
+
+    shopping_item_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("shopping_items.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    meal_slot_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("meal_slots.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    amount: Mapped[float] = mapped_column(Numeric(12, 3), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "shopping_item_id",
+            "meal_slot_id",
+            name="uq_shopping_item_contributions_item_slot",
+        ),
+        Index("ix_shopping_item_contributions_meal_slot_id", "meal_slot_id"),
+    )
@@ -1,4 +1,7 @@
-from sqlalchemy import ForeignKey, String
+from datetime import date
+
+from sqlalchemy import Boolean, Date, ForeignKey, Integer, String
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.models.base import BaseModel
@@ -20,6 +23,13 @@ class ShoppingList(BaseModel):
         index=True,
     )
     name: Mapped[str] = mapped_column(String(200), nullable=False)
+    # Bumped on every change to the list or its items; served as the ETag
+    version: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
+
+    # Generated lists follow meal slot changes within the filters they were built with
+    auto_sync: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    filter_dates: Mapped[list[date] | None] = mapped_column(ARRAY(Date), nullable=True)
+    filter_meal_types: Mapped[list[str] | None] = mapped_column(ARRAY(String(20)), nullable=True)
 
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="shopping_lists")  # noqa: F821
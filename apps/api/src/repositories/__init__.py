@@ -1,5 +1,6 @@
 from src.repositories.base import BaseRepository
 from src.repositories.meal_plan import MealPlanRepository
+from src.repositories.meal_plan_template import MealPlanTemplateRepository
 from src.repositories.recipe import RecipeRepository
 from src.repositories.recipe_interaction import RecipeInteractionRepository
 from src.repositories.shopping_list import ShoppingListRepository
@@ -11,5 +12,6 @@ __all__ = [
     "RecipeRepository",
     "RecipeInteractionRepository",
     "MealPlanRepository",
+    "MealPlanTemplateRepository",
     "ShoppingListRepository",
 ]
@@ -1,11 +1,12 @@
 from typing import Any, Generic, TypeVar
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.database import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
+RowType = TypeVar("RowType", bound=Base)
 
 
 class BaseRepository(Generic[ModelType]):
@@ -32,6 +33,20 @@ class BaseRepository(Generic[ModelType]):
         await self.session.refresh(db_obj)
         return db_obj
 
+    async def insert_many(
+        self,
+        model: type[RowType],
+        rows: list[dict[str, Any]],
+    ) -> list[RowType]:
+        """Insert rows with one multi-row INSERT ... RETURNING, in input order."""
+        if not rows:
+            return []
+        result = await self.session.scalars(
+            insert(model).returning(model, sort_by_parameter_order=True),
+            rows,
+        )
+        return list(result.all())
+
     async def update(
         self,
         db_obj: ModelType,
@@ -2,10 +2,12 @@
 
 from typing import Any
 
-from sqlalchemy import func, select
+from sqlalchemy import Row, SQLColumnExpression, func, select, tuple_
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.nutrition import NutritionRanges, nutrition_conditions
+from src.core.text_search import search_match, search_rank, search_tsquery
 from src.models.cached_recipe import CachedRecipe
 from src.repositories.base import BaseRepository
 
@@ -24,6 +26,38 @@ class CachedRecipeRepository(BaseRepository[CachedRecipe]):
         )
         return result.scalar_one_or_none()
 
+    async def get_by_sources(self, refs: list[tuple[str, str]]) -> list[CachedRecipe]:
+        """Get cached recipes for many (source, external_id) pairs in one query."""
+        if not refs:
+            return []
+        result = await self.session.execute(
+            select(CachedRecipe).where(
+                tuple_(CachedRecipe.external_source, CachedRecipe.external_id).in_(refs)
+            )
+        )
+        return list(result.scalars().all())
+
+    async def get_plan_candidates(self) -> list[Row]:
+        """Columns the meal plan generator needs, for every cached recipe."""
+        result = await self.session.execute(
+            select(
+                CachedRecipe.external_source,
+                CachedRecipe.external_id,
+                CachedRecipe.title,
+                CachedRecipe.categories,
+                CachedRecipe.tags,
+                CachedRecipe.meal_types,
+                CachedRecipe.prep_time_minutes,
+                CachedRecipe.cook_time_minutes,
+                CachedRecipe.servings,
+                CachedRecipe.calories,
+                CachedRecipe.protein_grams,
+                CachedRecipe.carbs_grams,
+                CachedRecipe.fat_grams,
+            )
+        )
+        return list(result.all())
+
     async def get_by_source_batch(self, source: str, external_ids: list[str]) -> set[str]:
         """Get set of existing external_ids for a source (for skip-check)."""
         if not external_ids:
@@ -69,12 +103,15 @@ class CachedRecipeRepository(BaseRepository[CachedRecipe]):
         if source:
             stmt = stmt.where(CachedRecipe.external_source == source)
 
+        order_by: list[SQLColumnExpression[Any]] = [CachedRecipe.title]
         if query:
-            search_pattern = f"%{query}%"
-            stmt = stmt.where(
-                CachedRecipe.title.ilike(search_pattern)
-                | CachedRecipe.title_original.ilike(search_pattern)
-            )
+            tsquery = search_tsquery(query)
+            stmt = stmt.where(search_match(CachedRecipe.search_vector, tsquery))
+            order_by = [
+                search_rank(CachedRecipe.search_vector, tsquery).desc(),
+                CachedRecipe.title,
+                CachedRecipe.id,
+            ]
 
         if categories:
             stmt = stmt.where(CachedRecipe.categories.overlap(categories))
@@ -85,7 +122,7 @@ class CachedRecipeRepository(BaseRepository[CachedRecipe]):
         total = count_result.scalar_one()
 
         # Paginate
-        stmt = stmt.order_by(CachedRecipe.title).offset(skip).limit(limit)
+        stmt = stmt.order_by(*order_by).offset(skip).limit(limit)
         result = await self.session.execute(stmt)
         recipes = list(result.scalars().all())
 
@@ -97,10 +134,11 @@ class CachedRecipeRepository(BaseRepository[CachedRecipe]):
         cuisine: str | None = None,
         source: str | None = None,
         meal_type: str | None = None,
+        nutrition: NutritionRanges | None = None,
         limit: int = 20,
     ) -> list[CachedRecipe]:
         """Get recipes for discovery (random order)."""
-        stmt = select(CachedRecipe)
+        stmt = select(CachedRecipe).where(*nutrition_conditions(CachedRecipe, nutrition))
 
         if source:
             stmt = stmt.where(CachedRecipe.external_source == source)
@@ -1,14 +1,35 @@
 from datetime import date
 
-from sqlalchemy import func, select
+from sqlalchemy import Date, Row, Select, String, func, literal, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from src.models.base import server_uuid
+from src.models.ingredient import Ingredient
 from src.models.meal_plan import MealPlan
+from src.models.meal_plan_template_slot import MealPlanTemplateSlot
 from src.models.meal_slot import MealSlot
 from src.models.recipe import Recipe
 from src.repositories.base import BaseRepository
 
+# Columns of ix_meal_slots_unique, the ON CONFLICT target for slot inserts
+SLOT_UNIQUE_COLUMNS = ("meal_plan_id", "date", "meal_type")
+SLOT_UNIQUE_INDEX = "ix_meal_slots_unique"
+
+# Column order of the SELECTs fed to _insert_slots_from_select
+SLOT_COPY_COLUMNS = (
+    "id",
+    "meal_plan_id",
+    "recipe_id",
+    "date",
+    "meal_type",
+    "servings",
+    "notes",
+    "created_at",
+)
+
 
 class MealPlanRepository(BaseRepository[MealPlan]):
     def __init__(self, session: AsyncSession):
@@ -19,6 +40,8 @@ class MealPlanRepository(BaseRepository[MealPlan]):
             select(MealPlan)
             .options(selectinload(MealPlan.slots).selectinload(MealSlot.recipe))
             .where(MealPlan.id == meal_plan_id)
+            # Slots written with bulk INSERTs are not in an already loaded collection
+            .execution_options(populate_existing=True)
         )
         return result.scalar_one_or_none()
 
@@ -37,6 +60,32 @@ class MealPlanRepository(BaseRepository[MealPlan]):
         )
         return result.scalar_one_or_none()
 
+    async def get_version(self, meal_plan_id: str) -> Row | None:
+        """(user_id, version) of a plan, without loading its slots."""
+        result = await self.session.execute(
+            select(MealPlan.user_id, MealPlan.version).where(MealPlan.id == meal_plan_id)
+        )
+        return result.one_or_none()
+
+    async def get_version_by_user_and_week(
+        self,
+        user_id: str,
+        week_start_date: date,
+    ) -> Row | None:
+        """(id, version) of the user's plan for a week, via ix_meal_plans_user_week."""
+        result = await self.session.execute(
+            select(MealPlan.id, MealPlan.version).where(
+                MealPlan.user_id == user_id,
+                MealPlan.week_start_date == week_start_date,
+            )
+        )
+        return result.one_or_none()
+
+    async def bump_version(self, meal_plan_id: str) -> None:
+        await self.session.execute(
+            update(MealPlan).where(MealPlan.id == meal_plan_id).values(version=MealPlan.version + 1)
+        )
+
     async def get_user_meal_plans(
         self,
         user_id: str,
@@ -62,12 +111,104 @@ class MealPlanRepository(BaseRepository[MealPlan]):
         self,
         meal_plan_id: str,
         slot_data: dict,
-    ) -> MealSlot:
-        slot = MealSlot(meal_plan_id=meal_plan_id, **slot_data)
-        self.session.add(slot)
-        await self.session.flush()
-        await self.session.refresh(slot)
-        return slot
+    ) -> MealSlot | None:
+        """Insert a slot; returns None if its date and meal type are already taken."""
+        result = await self.session.scalars(
+            pg_insert(MealSlot)
+            .values(meal_plan_id=meal_plan_id, **slot_data)
+            .on_conflict_do_nothing(index_elements=SLOT_UNIQUE_COLUMNS)
+            .returning(MealSlot)
+        )
+        return result.one_or_none()
+
+    async def add_slots(
+        self,
+        meal_plan_id: str,
+        slots_data: list[dict],
+    ) -> list[MealSlot]:
+        """
+        Insert slots in one statement; slots whose position is taken are skipped.
+
+        The inserted slots come back in no particular order: deterministic
+        RETURNING order cannot be combined with ON CONFLICT, and asking for it
+        makes SQLAlchemy fall back to one INSERT per row.
+        """
+        if not slots_data:
+            return []
+        result = await self.session.scalars(
+            pg_insert(MealSlot)
+            .on_conflict_do_nothing(index_elements=SLOT_UNIQUE_COLUMNS)
+            .returning(MealSlot),
+            [{"meal_plan_id": meal_plan_id, **slot_data} for slot_data in slots_data],
+        )
+        return list(result.all())
+
+    async def copy_slots(
+        self,
+        source_plan_id: str,
+        target_plan_id: str,
+        day_shift: int,
+        replace: bool = False,
+    ) -> list[str]:
+        """
+        Copy every slot of one plan into another, moving dates by day_shift days.
+
+        Returns the ids of the slots written; see _insert_slots_from_select.
+        """
+        source = select(
+            server_uuid(),
+            literal(target_plan_id, String(36)),
+            MealSlot.recipe_id,
+            MealSlot.date + day_shift,
+            MealSlot.meal_type,
+            MealSlot.servings,
+            MealSlot.notes,
+            func.now(),
+        ).where(MealSlot.meal_plan_id == source_plan_id)
+        return await self._insert_slots_from_select(source, replace)
+
+    async def apply_template_slots(
+        self,
+        template_id: str,
+        target_plan_id: str,
+        week_start_date: date,
+        replace: bool = False,
+    ) -> list[str]:
+        """Write a template's slots into the plan for the week starting week_start_date."""
+        source = select(
+            server_uuid(),
+            literal(target_plan_id, String(36)),
+            MealPlanTemplateSlot.recipe_id,
+            literal(week_start_date, Date) + MealPlanTemplateSlot.day_offset,
+            MealPlanTemplateSlot.meal_type,
+            MealPlanTemplateSlot.servings,
+            MealPlanTemplateSlot.notes,
+            func.now(),
+        ).where(MealPlanTemplateSlot.template_id == template_id)
+        return await self._insert_slots_from_select(source, replace)
+
+    async def _insert_slots_from_select(self, source: Select, replace: bool) -> list[str]:
+        """
+        INSERT ... SELECT slots (columns in SLOT_COPY_COLUMNS order) in one statement.
+
+        Positions that are already taken are skipped, or with replace=True take the
+        source's recipe, servings and notes while keeping their slot id. Returns the
+        ids of the inserted and replaced slots.
+        """
+        stmt = pg_insert(MealSlot).from_select(SLOT_COPY_COLUMNS, source)
+        if replace:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=SLOT_UNIQUE_COLUMNS,
+                set_={
+                    "recipe_id": stmt.excluded.recipe_id,
+                    "servings": stmt.excluded.servings,
+                    "notes": stmt.excluded.notes,
+                },
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=SLOT_UNIQUE_COLUMNS)
+        result = await self.session.scalars(stmt.returning(MealSlot.id))
+        return list(result.all())
 
     async def get_slot_by_id(self, slot_id: str) -> MealSlot | None:
         result = await self.session.execute(
@@ -75,33 +216,40 @@ class MealPlanRepository(BaseRepository[MealPlan]):
         )
         return result.scalar_one_or_none()
 
-    async def get_slot_conflict(
+    async def get_occupied_slots(
         self,
         meal_plan_id: str,
-        slot_date: date,
-        meal_type: str,
-        exclude_slot_id: str | None = None,
-    ) -> MealSlot | None:
-        stmt = select(MealSlot).where(
-            MealSlot.meal_plan_id == meal_plan_id,
-            MealSlot.date == slot_date,
-            MealSlot.meal_type == meal_type,
+        keys: list[tuple[date, str]],
+    ) -> set[tuple[date, str]]:
+        """Return which (date, meal_type) pairs already have a slot in the plan."""
+        if not keys:
+            return set()
+        result = await self.session.execute(
+            select(MealSlot.date, MealSlot.meal_type).where(
+                MealSlot.meal_plan_id == meal_plan_id,
+                tuple_(MealSlot.date, MealSlot.meal_type).in_(keys),
+            )
         )
-        if exclude_slot_id:
-            stmt = stmt.where(MealSlot.id != exclude_slot_id)
-
-        result = await self.session.execute(stmt)
-        return result.scalar_one_or_none()
+        return {(slot_date, meal_type) for slot_date, meal_type in result.all()}
 
     async def update_slot(
         self,
         slot: MealSlot,
         slot_data: dict,
-    ) -> MealSlot:
-        for field, value in slot_data.items():
-            if value is not None:
-                setattr(slot, field, value)
-        await self.session.flush()
+    ) -> MealSlot | None:
+        """Update a slot; returns None if it would move onto a taken date and meal type."""
+        try:
+            # Entering the savepoint flushes pending changes, so set the fields
+            # inside it and only roll back this update on a unique violation
+            async with self.session.begin_nested():
+                for field, value in slot_data.items():
+                    if value is not None:
+                        setattr(slot, field, value)
+                await self.session.flush()
+        except IntegrityError as e:
+            if SLOT_UNIQUE_INDEX not in str(e.orig):
+                raise
+            return None
         await self.session.refresh(slot)
         return slot
 
@@ -139,3 +287,49 @@ class MealPlanRepository(BaseRepository[MealPlan]):
             .order_by(MealSlot.date, MealSlot.meal_type)
         )
         return list(result.scalars().all())
+
+    async def aggregate_slot_ingredients(
+        self,
+        meal_plan_id: str,
+        dates: list[date] | None = None,
+        meal_types: list[str] | None = None,
+        slot_ids: list[str] | None = None,
+    ) -> list[Row]:
+        """
+        Sum ingredient amounts per slot across a meal plan in one query.
+
+        Amounts are converted to their canonical unit (see src.core.units), scaled
+        by slot servings / recipe servings and grouped by slot, lowercased name
+        and canonical unit. Rows: (slot_id, name, unit, amount, category), where
+        name is lowercased. Rows written before canonical columns existed fall
+        back to amount/unit.
+        """
+        name_key = func.lower(Ingredient.name)
+        unit_key = func.coalesce(Ingredient.canonical_unit, func.lower(Ingredient.unit))
+        base_amount = func.coalesce(Ingredient.canonical_amount, Ingredient.amount)
+        scaled_amount = base_amount * MealSlot.servings / func.nullif(Recipe.servings, 0)
+
+        stmt = (
+            select(
+                MealSlot.id.label("slot_id"),
+                name_key.label("name"),
+                unit_key.label("unit"),
+                func.sum(scaled_amount).label("amount"),
+                func.max(Ingredient.category).label("category"),
+            )
+            .select_from(MealSlot)
+            .join(Recipe, Recipe.id == MealSlot.recipe_id)
+            .join(Ingredient, Ingredient.recipe_id == Recipe.id)
+            .where(MealSlot.meal_plan_id == meal_plan_id)
+            .group_by(MealSlot.id, name_key, unit_key)
+            .order_by(name_key, unit_key)
+        )
+        if dates:
+            stmt = stmt.where(MealSlot.date.in_(dates))
+        if meal_types:
+            stmt = stmt.where(MealSlot.meal_type.in_(meal_types))
+        if slot_ids is not None:
+            stmt = stmt.where(MealSlot.id.in_(slot_ids))
+
+        result = await self.session.execute(stmt)
+        return list(result.all())
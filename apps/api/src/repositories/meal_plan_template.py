@@ -0,0 +1,69 @@
+from datetime import date
+
+from sqlalchemy import Date, String, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from src.models.base import server_uuid
+from src.models.meal_plan_template import MealPlanTemplate
+from src.models.meal_plan_template_slot import MealPlanTemplateSlot
+from src.models.meal_slot import MealSlot
+from src.repositories.base import BaseRepository
+
+
+class MealPlanTemplateRepository(BaseRepository[MealPlanTemplate]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(MealPlanTemplate, session)
+
+    async def get_by_id_with_slots(self, template_id: str) -> MealPlanTemplate | None:
+        result = await self.session.execute(
+            select(MealPlanTemplate)
+            .options(selectinload(MealPlanTemplate.slots))
+            .where(MealPlanTemplate.id == template_id)
+            # Slots written with INSERT ... SELECT are not in an already loaded collection
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_user_templates(self, user_id: str) -> list[MealPlanTemplate]:
+        result = await self.session.execute(
+            select(MealPlanTemplate)
+            .options(selectinload(MealPlanTemplate.slots))
+            .where(MealPlanTemplate.user_id == user_id)
+            .order_by(MealPlanTemplate.name)
+        )
+        return list(result.scalars().all())
+
+    async def create_template(self, template_data: dict) -> MealPlanTemplate | None:
+        """Insert a template; returns None if the user already has one with that name."""
+        result = await self.session.scalars(
+            pg_insert(MealPlanTemplate)
+            .values(**template_data)
+            .on_conflict_do_nothing(index_elements=("user_id", "name"))
+            .returning(MealPlanTemplate)
+        )
+        return result.one_or_none()
+
+    async def add_slots_from_meal_plan(
+        self,
+        template_id: str,
+        meal_plan_id: str,
+        week_start_date: date,
+    ) -> None:
+        """Copy a plan's slots into a template with one INSERT ... SELECT."""
+        source = select(
+            server_uuid(),
+            literal(template_id, String(36)),
+            MealSlot.recipe_id,
+            MealSlot.date - literal(week_start_date, Date),
+            MealSlot.meal_type,
+            MealSlot.servings,
+            MealSlot.notes,
+        ).where(MealSlot.meal_plan_id == meal_plan_id)
+        await self.session.execute(
+            pg_insert(MealPlanTemplateSlot).from_select(
+                ("id", "template_id", "recipe_id", "day_offset", "meal_type", "servings", "notes"),
+                source,
+            )
+        )
@@ -1,10 +1,33 @@
 from typing import Any
 
-from sqlalchemy import cast, case, exists, func, literal, null, select, union_all
+from sqlalchemy import (
+    ColumnElement,
+    Row,
+    Select,
+    SQLColumnExpression,
+    Text,
+    any_,
+    case,
+    cast,
+    exists,
+    func,
+    literal,
+    literal_column,
+    null,
+    select,
+    tuple_,
+    union_all,
+)
 from sqlalchemy import Float as SAFloat
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
+from src.core.ingredient_category import categorize_ingredient
+from src.core.nutrition import NutritionRanges, nutrition_conditions
+from src.core.text_search import search_match, search_rank, search_tsquery
+from src.core.units import canonicalize
 from src.models.cached_recipe import CachedRecipe
 from src.models.ingredient import Ingredient
 from src.models.instruction import Instruction
@@ -12,6 +35,96 @@ from src.models.recipe import Recipe
 from src.repositories.base import BaseRepository
 
 
+def _json_object(**fields: Any) -> ColumnElement[Any]:
+    """json_build_object with the keys inlined as SQL literals instead of bound."""
+    args: list[Any] = []
+    for key, value in fields.items():
+        args.extend((literal_column(f"'{key}'"), value))
+    return func.json_build_object(*args)
+
+
+def _json_array(
+    element: SQLColumnExpression[Any], order_by: SQLColumnExpression[Any]
+) -> ColumnElement[Any]:
+    return func.coalesce(
+        func.json_agg(aggregate_order_by(element, order_by)),
+        literal_column("'[]'::json"),
+    )
+
+
+def _browse_recipes_select() -> Select:
+    """Browse columns of user recipes, shaped to union with _browse_cached_select."""
+    return select(
+        Recipe.id,
+        Recipe.user_id,
+        Recipe.title,
+        Recipe.description,
+        Recipe.image_url,
+        Recipe.prep_time_minutes,
+        Recipe.cook_time_minutes,
+        Recipe.servings,
+        Recipe.difficulty,
+        Recipe.categories,
+        Recipe.tags,
+        Recipe.source_url,
+        Recipe.external_source,
+        Recipe.external_id,
+        Recipe.calories,
+        cast(Recipe.protein_grams, SAFloat).label("protein_grams"),
+        cast(Recipe.carbs_grams, SAFloat).label("carbs_grams"),
+        cast(Recipe.fat_grams, SAFloat).label("fat_grams"),
+        Recipe.created_at,
+        Recipe.updated_at,
+        literal("user").label("source_type"),
+    )
+
+
+def _browse_cached_select() -> Select:
+    """Browse columns of cached recipes not yet imported into recipes."""
+    return select(
+        CachedRecipe.id,
+        null().label("user_id"),
+        CachedRecipe.title,
+        CachedRecipe.description,
+        CachedRecipe.image_url,
+        CachedRecipe.prep_time_minutes,
+        CachedRecipe.cook_time_minutes,
+        CachedRecipe.servings,
+        CachedRecipe.difficulty,
+        CachedRecipe.categories,
+        CachedRecipe.tags,
+        CachedRecipe.source_url,
+        CachedRecipe.external_source,
+        CachedRecipe.external_id,
+        CachedRecipe.calories,
+        CachedRecipe.protein_grams,
+        CachedRecipe.carbs_grams,
+        CachedRecipe.fat_grams,
+        CachedRecipe.fetched_at.label("created_at"),
+        CachedRecipe.fetched_at.label("updated_at"),
+        literal("cached").label("source_type"),
+    ).where(
+        ~exists(
+            select(literal(1)).where(
+                Recipe.external_source == CachedRecipe.external_source,
+                Recipe.external_id == CachedRecipe.external_id,
+            )
+        )
+    )
+
+
+def _ordering(
+    rank: SQLColumnExpression[Any] | None,
+    image_priority: SQLColumnExpression[Any],
+    created_at: SQLColumnExpression[Any],
+    row_id: SQLColumnExpression[Any],
+) -> list[SQLColumnExpression[Any]]:
+    """Browse order, led by relevance when searching; the id breaks rank ties."""
+    if rank is None:
+        return [image_priority, created_at.desc()]
+    return [rank.desc(), image_priority, created_at.desc(), row_id]
+
+
 class RecipeRepository(BaseRepository[Recipe]):
     def __init__(self, session: AsyncSession):
         super().__init__(Recipe, session)
@@ -27,6 +140,84 @@ class RecipeRepository(BaseRepository[Recipe]):
         )
         return result.scalar_one_or_none()
 
+    async def get_detail_json(self, recipe_id: str) -> str | None:
+        """
+        The recipe with its ingredients and instructions as one JSON document.
+
+        Built by PostgreSQL in a single round trip and returned as text, shaped like
+        BrowseRecipeWithDetailsResponse so it can be sent without re-serializing.
+        Numeric columns are cast to float8 to match the float fields of the schema.
+        """
+        ingredients = (
+            select(
+                _json_array(
+                    _json_object(
+                        id=Ingredient.id,
+                        recipe_id=Ingredient.recipe_id,
+                        name=Ingredient.name,
+                        amount=cast(Ingredient.amount, SAFloat),
+                        unit=Ingredient.unit,
+                        notes=Ingredient.notes,
+                        order_index=Ingredient.order_index,
+                        created_at=Ingredient.created_at,
+                        updated_at=Ingredient.updated_at,
+                    ),
+                    Ingredient.order_index,
+                )
+            )
+            .where(Ingredient.recipe_id == Recipe.id)
+            .scalar_subquery()
+        )
+        instructions = (
+            select(
+                _json_array(
+                    _json_object(
+                        id=Instruction.id,
+                        recipe_id=Instruction.recipe_id,
+                        step_number=Instruction.step_number,
+                        description=Instruction.description,
+                        image_url=Instruction.image_url,
+                        created_at=Instruction.created_at,
+                        updated_at=Instruction.updated_at,
+                    ),
+                    Instruction.step_number,
+                )
+            )
+            .where(Instruction.recipe_id == Recipe.id)
+            .scalar_subquery()
+        )
+        document = _json_object(
+            id=Recipe.id,
+            user_id=Recipe.user_id,
+            title=Recipe.title,
+            description=Recipe.description,
+            image_url=Recipe.image_url,
+            prep_time_minutes=Recipe.prep_time_minutes,
+            cook_time_minutes=Recipe.cook_time_minutes,
+            servings=Recipe.servings,
+            difficulty=Recipe.difficulty,
+            categories=Recipe.categories,
+            tags=Recipe.tags,
+            source_url=Recipe.source_url,
+            external_source=Recipe.external_source,
+            external_id=Recipe.external_id,
+            calories=Recipe.calories,
+            protein_grams=cast(Recipe.protein_grams, SAFloat),
+            carbs_grams=cast(Recipe.carbs_grams, SAFloat),
+            fat_grams=cast(Recipe.fat_grams, SAFloat),
+            created_at=Recipe.created_at,
+            updated_at=Recipe.updated_at,
+            source_type=literal_column("'user'"),
+            interactions=null(),
+            stats=null(),
+            ingredients=ingredients,
+            instructions=instructions,
+        )
+        result = await self.session.execute(
+            select(cast(document, Text)).where(Recipe.id == recipe_id)
+        )
+        return result.scalar_one_or_none()
+
     async def get_user_recipes(
         self,
         user_id: str,
@@ -55,15 +246,17 @@ class RecipeRepository(BaseRepository[Recipe]):
         difficulty: str | None = None,
         max_prep_time: int | None = None,
         max_cook_time: int | None = None,
+        nutrition: NutritionRanges | None = None,
         skip: int = 0,
         limit: int = 20,
     ) -> tuple[list[Recipe], int]:
         stmt = select(Recipe).where(Recipe.user_id == user_id)
 
+        rank = None
         if query:
-            # Use ILIKE for better Korean text search support
-            search_pattern = f"%{query}%"
-            stmt = stmt.where(Recipe.title.ilike(search_pattern))
+            tsquery = search_tsquery(query)
+            stmt = stmt.where(search_match(Recipe.search_vector, tsquery))
+            rank = search_rank(Recipe.search_vector, tsquery)
 
         if categories:
             stmt = stmt.where(Recipe.categories.overlap(categories))
@@ -80,18 +273,20 @@ class RecipeRepository(BaseRepository[Recipe]):
         if max_cook_time is not None:
             stmt = stmt.where(Recipe.cook_time_minutes <= max_cook_time)
 
+        stmt = stmt.where(*nutrition_conditions(Recipe, nutrition))
+
         # Count total
         count_stmt = select(func.count()).select_from(stmt.subquery())
         count_result = await self.session.execute(count_stmt)
         total = count_result.scalar_one()
 
-        # Get paginated results (images first)
+        # Get paginated results (most relevant first, then images first)
         image_priority = case(
             (Recipe.image_url.isnot(None) & (Recipe.image_url != ""), 0),
             else_=1,
         )
-        stmt = stmt.order_by(image_priority, Recipe.created_at.desc()).offset(skip).limit(limit)
-        result = await self.session.execute(stmt)
+        stmt = stmt.order_by(*_ordering(rank, image_priority, Recipe.created_at, Recipe.id))
+        result = await self.session.execute(stmt.offset(skip).limit(limit))
         recipes = list(result.scalars().all())
 
         return recipes, total
@@ -108,24 +303,72 @@ class RecipeRepository(BaseRepository[Recipe]):
         ingredients: list[dict[str, Any]],
         instructions: list[dict[str, Any]],
     ) -> Recipe:
-        recipe = Recipe(**recipe_data)
-        self.session.add(recipe)
-        await self.session.flush()
-
-        for ing_data in ingredients:
-            ingredient = Ingredient(recipe_id=recipe.id, **ing_data)
-            self.session.add(ingredient)
-
-        for inst_data in instructions:
-            instruction = Instruction(recipe_id=recipe.id, **inst_data)
-            self.session.add(instruction)
+        recipes = await self.create_many_with_details([(recipe_data, ingredients, instructions)])
+        return recipes[0]
 
-        await self.session.flush()
-        await self.session.refresh(recipe)
+    async def create_many_with_details(
+        self,
+        entries: list[tuple[dict[str, Any], list[dict[str, Any]], list[dict[str, Any]]]],
+    ) -> list[Recipe]:
+        """
+        Create recipes with their ingredients and instructions, in input order.
+
+        Each entry is (recipe_data, ingredients, instructions). Runs one INSERT
+        per table however many recipes are created.
+        """
+        if not entries:
+            return []
+        recipes = await self.insert_many(Recipe, [recipe_data for recipe_data, _, _ in entries])
+
+        ingredient_rows = []
+        instruction_rows = []
+        for recipe, (_, ingredients, instructions) in zip(recipes, entries):
+            for ing_data in ingredients:
+                canonical_amount, canonical_unit = canonicalize(
+                    ing_data["amount"], ing_data["unit"]
+                )
+                ingredient_rows.append(
+                    {
+                        "recipe_id": recipe.id,
+                        "canonical_amount": canonical_amount,
+                        "canonical_unit": canonical_unit,
+                        "category": categorize_ingredient(ing_data["name"]),
+                        **ing_data,
+                    }
+                )
+            instruction_rows.extend(
+                {"recipe_id": recipe.id, **inst_data} for inst_data in instructions
+            )
+        created_ingredients = await self.insert_many(Ingredient, ingredient_rows)
+        created_instructions = await self.insert_many(Instruction, instruction_rows)
+
+        # RETURNING already hydrated the children; attach them in relationship
+        # order instead of re-selecting the recipes with their details.
+        ingredients_by_recipe: dict[str, list[Ingredient]] = {r.id: [] for r in recipes}
+        for ingredient in created_ingredients:
+            ingredients_by_recipe[ingredient.recipe_id].append(ingredient)
+        instructions_by_recipe: dict[str, list[Instruction]] = {r.id: [] for r in recipes}
+        for instruction in created_instructions:
+            instructions_by_recipe[instruction.recipe_id].append(instruction)
+        for recipe in recipes:
+            set_committed_value(
+                recipe,
+                "ingredients",
+                sorted(ingredients_by_recipe[recipe.id], key=lambda ing: ing.order_index),
+            )
+            set_committed_value(
+                recipe,
+                "instructions",
+                sorted(instructions_by_recipe[recipe.id], key=lambda inst: inst.step_number),
+            )
+        return recipes
 
-        # Load relationships
-        result = await self.get_by_id_with_details(recipe.id)
-        return result  # type: ignore
+    async def get_by_ids(self, recipe_ids: list[str]) -> list[Recipe]:
+        """Recipes with the given IDs, in no particular order; missing IDs are skipped."""
+        if not recipe_ids:
+            return []
+        result = await self.session.execute(select(Recipe).where(Recipe.id.in_(recipe_ids)))
+        return list(result.scalars().all())
 
     async def get_by_external_source(
         self,
@@ -142,6 +385,41 @@ class RecipeRepository(BaseRepository[Recipe]):
         )
         return result.scalar_one_or_none()
 
+    async def get_by_external_sources(
+        self,
+        refs: list[tuple[str, str]],
+        user_id: str,
+    ) -> list[Recipe]:
+        """Get the user's imports of many (external_source, external_id) pairs."""
+        if not refs:
+            return []
+        result = await self.session.execute(
+            select(Recipe).where(
+                tuple_(Recipe.external_source, Recipe.external_id).in_(refs),
+                Recipe.user_id == user_id,
+            )
+        )
+        return list(result.scalars().all())
+
+    async def get_plan_candidates(self, user_id: str) -> list[Row]:
+        """Columns the meal plan generator needs, for the user's recipes."""
+        result = await self.session.execute(
+            select(
+                Recipe.id,
+                Recipe.title,
+                Recipe.categories,
+                Recipe.tags,
+                Recipe.prep_time_minutes,
+                Recipe.cook_time_minutes,
+                Recipe.servings,
+                Recipe.calories,
+                Recipe.protein_grams,
+                Recipe.carbs_grams,
+                Recipe.fat_grams,
+            ).where(Recipe.user_id == user_id)
+        )
+        return list(result.all())
+
     async def get_all_recipes(
         self,
         skip: int = 0,
@@ -176,9 +454,11 @@ class RecipeRepository(BaseRepository[Recipe]):
         """Search all recipes (no user_id filter) for browsing"""
         stmt = select(Recipe)
 
+        rank = None
         if query:
-            search_pattern = f"%{query}%"
-            stmt = stmt.where(Recipe.title.ilike(search_pattern))
+            tsquery = search_tsquery(query)
+            stmt = stmt.where(search_match(Recipe.search_vector, tsquery))
+            rank = search_rank(Recipe.search_vector, tsquery)
 
         if categories:
             stmt = stmt.where(Recipe.categories.overlap(categories))
@@ -191,13 +471,13 @@ class RecipeRepository(BaseRepository[Recipe]):
         count_result = await self.session.execute(count_stmt)
         total = count_result.scalar_one()
 
-        # Get paginated results (images first)
+        # Get paginated results (most relevant first, then images first)
         image_priority = case(
             (Recipe.image_url.isnot(None) & (Recipe.image_url != ""), 0),
             else_=1,
         )
-        stmt = stmt.order_by(image_priority, Recipe.created_at.desc()).offset(skip).limit(limit)
-        result = await self.session.execute(stmt)
+        stmt = stmt.order_by(*_ordering(rank, image_priority, Recipe.created_at, Recipe.id))
+        result = await self.session.execute(stmt.offset(skip).limit(limit))
         recipes = list(result.scalars().all())
 
         return recipes, total
@@ -207,83 +487,37 @@ class RecipeRepository(BaseRepository[Recipe]):
         query: str | None = None,
         categories: list[str] | None = None,
         difficulty: str | None = None,
+        nutrition: NutritionRanges | None = None,
         skip: int = 0,
         limit: int = 20,
     ) -> tuple[list[dict], int]:
         """Get recipes from both recipes and cached_recipes tables, deduplicating by external_source+external_id."""
-        search_pattern = f"%{query}%" if query else None
+        tsquery = search_tsquery(query) if query else None
 
         # --- recipes branch ---
-        recipes_q = select(
-            Recipe.id,
-            Recipe.user_id,
-            Recipe.title,
-            Recipe.description,
-            Recipe.image_url,
-            Recipe.prep_time_minutes,
-            Recipe.cook_time_minutes,
-            Recipe.servings,
-            Recipe.difficulty,
-            Recipe.categories,
-            Recipe.tags,
-            Recipe.source_url,
-            Recipe.external_source,
-            Recipe.external_id,
-            Recipe.calories,
-            cast(Recipe.protein_grams, SAFloat).label("protein_grams"),
-            cast(Recipe.carbs_grams, SAFloat).label("carbs_grams"),
-            cast(Recipe.fat_grams, SAFloat).label("fat_grams"),
-            Recipe.created_at,
-            Recipe.updated_at,
-            literal("user").label("source_type"),
-        )
-        if search_pattern:
-            recipes_q = recipes_q.where(Recipe.title.ilike(search_pattern))
+        recipes_q = _browse_recipes_select()
+        if tsquery is not None:
+            recipes_q = recipes_q.where(search_match(Recipe.search_vector, tsquery)).add_columns(
+                search_rank(Recipe.search_vector, tsquery).label("rank")
+            )
         if categories:
             recipes_q = recipes_q.where(Recipe.categories.overlap(categories))
         if difficulty:
             recipes_q = recipes_q.where(Recipe.difficulty == difficulty)
+        # On the base columns of each branch, not the union, so the indexes apply
+        recipes_q = recipes_q.where(*nutrition_conditions(Recipe, nutrition))
 
         # --- cached_recipes branch (exclude those already imported into recipes) ---
-        cached_q = select(
-            CachedRecipe.id,
-            null().label("user_id"),
-            CachedRecipe.title,
-            CachedRecipe.description,
-            CachedRecipe.image_url,
-            CachedRecipe.prep_time_minutes,
-            CachedRecipe.cook_time_minutes,
-            CachedRecipe.servings,
-            CachedRecipe.difficulty,
-            CachedRecipe.categories,
-            CachedRecipe.tags,
-            CachedRecipe.source_url,
-            CachedRecipe.external_source,
-            CachedRecipe.external_id,
-            CachedRecipe.calories,
-            CachedRecipe.protein_grams,
-            CachedRecipe.carbs_grams,
-            CachedRecipe.fat_grams,
-            CachedRecipe.fetched_at.label("created_at"),
-            CachedRecipe.fetched_at.label("updated_at"),
-            literal("cached").label("source_type"),
-        ).where(
-            ~exists(
-                select(literal(1)).where(
-                    Recipe.external_source == CachedRecipe.external_source,
-                    Recipe.external_id == CachedRecipe.external_id,
-                )
-            )
-        )
-        if search_pattern:
+        cached_q = _browse_cached_select()
+        if tsquery is not None:
             cached_q = cached_q.where(
-                CachedRecipe.title.ilike(search_pattern)
-                | CachedRecipe.title_original.ilike(search_pattern)
-            )
+                search_match(CachedRecipe.search_vector, tsquery)
+            ).add_columns(search_rank(CachedRecipe.search_vector, tsquery).label("rank"))
         if categories:
             cached_q = cached_q.where(CachedRecipe.categories.overlap(categories))
         if difficulty:
             cached_q = cached_q.where(CachedRecipe.difficulty == difficulty)
+        cached_q = cached_q.where(*nutrition_conditions(CachedRecipe, nutrition))
 
         # --- UNION ALL ---
         combined = union_all(recipes_q, cached_q).subquery()
@@ -292,17 +526,96 @@ class RecipeRepository(BaseRepository[Recipe]):
         count_result = await self.session.execute(select(func.count()).select_from(combined))
         total = count_result.scalar_one()
 
-        # Order: images first, then newest first
+        # Order: most relevant first (when searching), images first, then newest first
         image_priority = case(
             (combined.c.image_url.isnot(None) & (combined.c.image_url != ""), 0),
             else_=1,
         )
+        rank = combined.c.rank if tsquery is not None else None
         paginated = (
             select(combined)
-            .order_by(image_priority, combined.c.created_at.desc())
+            .order_by(*_ordering(rank, image_priority, combined.c.created_at, combined.c.id))
             .offset(skip)
             .limit(limit)
         )
         result = await self.session.execute(paginated)
         rows = [dict(row._mapping) for row in result]
+        for row in rows:
+            row.pop("rank", None)
+        return rows, total
+
+    async def match_ingredients(
+        self,
+        ingredients: list[str],
+        min_coverage: float = 0.0,
+        skip: int = 0,
+        limit: int = 20,
+    ) -> tuple[list[dict], int]:
+        """
+        Rank user and cached recipes by the share of their ingredients in a given set.
+
+        Candidates come from the GIN indexes on ingredient_names (any overlap);
+        coverage is matched / total distinct normalized names. Rows carry
+        coverage, matched_count, total_ingredients and missing_ingredients.
+        """
+        # Normalized by the same SQL function as the stored names, evaluated once
+        have = select(
+            func.normalize_ingredient_names(cast(ingredients, ARRAY(Text)), type_=ARRAY(Text))
+        ).scalar_subquery()
+
+        combined = union_all(
+            _browse_recipes_select()
+            .add_columns(Recipe.ingredient_names)
+            .where(Recipe.ingredient_names.overlap(have)),
+            _browse_cached_select()
+            .add_columns(CachedRecipe.ingredient_names)
+            .where(CachedRecipe.ingredient_names.overlap(have)),
+        ).subquery()
+
+        name = func.unnest(combined.c.ingredient_names).table_valued("name")
+        # The cast keeps "= ANY" on the array rather than on the subquery's rows
+        matched_count = (
+            select(func.count())
+            .select_from(name)
+            .where(name.c.name == any_(cast(have, ARRAY(Text))))
+        ).scalar_subquery()
+        total_ingredients = func.cardinality(combined.c.ingredient_names)
+        scored = select(
+            combined,
+            matched_count.label("matched_count"),
+            total_ingredients.label("total_ingredients"),
+            (cast(matched_count, SAFloat) / cast(total_ingredients, SAFloat)).label("coverage"),
+        ).subquery()
+
+        stmt = select(scored, have.label("have"))
+        if min_coverage > 0:
+            stmt = stmt.where(scored.c.coverage >= min_coverage)
+
+        count_result = await self.session.execute(select(func.count()).select_from(stmt.subquery()))
+        total = count_result.scalar_one()
+
+        # Most covered first; among equals, more matches, then fewer to buy
+        image_priority = case(
+            (scored.c.image_url.isnot(None) & (scored.c.image_url != ""), 0),
+            else_=1,
+        )
+        result = await self.session.execute(
+            stmt.order_by(
+                scored.c.coverage.desc(),
+                scored.c.matched_count.desc(),
+                scored.c.total_ingredients,
+                image_priority,
+                scored.c.created_at.desc(),
+                scored.c.id,
+            )
+            .offset(skip)
+            .limit(limit)
+        )
+        rows = []
+        for row in result:
+            data = dict(row._mapping)
+            have_names = set(data.pop("have"))
+            names = data.pop("ingredient_names")
+            data["missing_ingredients"] = [n for n in names if n not in have_names]
+            rows.append(data)
         return rows, total
@@ -1,10 +1,57 @@
-from sqlalchemy import delete, func, select
+from datetime import datetime
+
+from sqlalchemy import (
+    ColumnElement,
+    Double,
+    Select,
+    SQLColumnExpression,
+    String,
+    Text,
+    cast,
+    column,
+    delete,
+    exists,
+    extract,
+    func,
+    literal,
+    literal_column,
+    select,
+    tuple_,
+    union_all,
+    values,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from src.models.base import server_uuid
 from src.models.recipe import Recipe
 from src.models.recipe_favorite import RecipeFavorite
 from src.models.recipe_rating import RecipeRating
+from src.models.user import User
+
+# Class key (first of two) of the advisory locks taken by lock_favorite_flush
+FAVORITE_FLUSH_LOCK_CLASS = 4901
+
+
+def _decayed(
+    timestamp: SQLColumnExpression[datetime | None],
+    weight: ColumnElement[float],
+    now: float,
+    half_life: float,
+) -> ColumnElement[float]:
+    """weight halved for every half_life seconds between timestamp and now (epoch seconds)."""
+    age = cast(extract("epoch", timestamp), Double) - now
+    return weight * func.power(2.0, age / half_life)
+
+
+def _stats_from_counters(rating_sum: int, rating_count: int, favorites_count: int) -> dict:
+    return {
+        "average_rating": rating_sum / rating_count if rating_count else None,
+        "total_ratings": rating_count,
+        "favorites_count": favorites_count,
+    }
 
 
 class RecipeInteractionRepository:
@@ -85,31 +132,17 @@ class RecipeInteractionRepository:
 
         return ratings, total
 
-    async def get_recipe_stats(self, recipe_id: str) -> dict:
-        # Get average rating and count
-        rating_result = await self.session.execute(
-            select(
-                func.avg(RecipeRating.rating).label("average_rating"),
-                func.count(RecipeRating.id).label("total_ratings"),
-            ).where(RecipeRating.recipe_id == recipe_id)
-        )
-        rating_row = rating_result.one()
-
-        # Get favorites count
-        favorites_result = await self.session.execute(
-            select(func.count())
-            .select_from(RecipeFavorite)
-            .where(RecipeFavorite.recipe_id == recipe_id)
+    async def get_recipe_stats(self, recipe_id: str) -> dict | None:
+        """Read the trigger-maintained counters; None if the recipe does not exist."""
+        result = await self.session.execute(
+            select(Recipe.rating_sum, Recipe.rating_count, Recipe.favorites_count).where(
+                Recipe.id == recipe_id
+            )
         )
-        favorites_count = favorites_result.scalar_one()
-
-        return {
-            "average_rating": float(rating_row.average_rating)
-            if rating_row.average_rating
-            else None,
-            "total_ratings": rating_row.total_ratings or 0,
-            "favorites_count": favorites_count,
-        }
+        row = result.one_or_none()
+        if row is None:
+            return None
+        return _stats_from_counters(row.rating_sum, row.rating_count, row.favorites_count)
 
     # ========== Favorite Methods ==========
 
@@ -150,6 +183,67 @@ class RecipeInteractionRepository:
         await self.session.flush()
         return result.rowcount > 0
 
+    async def get_favorite_state(self, user_id: str, recipe_id: str) -> bool | None:
+        """Whether the user favorited the recipe; None if the recipe does not exist."""
+        is_favorite = exists().where(
+            RecipeFavorite.user_id == user_id,
+            RecipeFavorite.recipe_id == Recipe.id,
+        )
+        result = await self.session.execute(select(is_favorite).where(Recipe.id == recipe_id))
+        return result.scalar_one_or_none()
+
+    async def lock_favorite_flush(self, user_ids: list[str]) -> None:
+        """
+        Serialize buffered favorite flushes per user until the transaction ends.
+
+        Locks are taken in key order, so batches with overlapping users cannot
+        deadlock; a hash collision only serializes two users needlessly.
+        """
+        users = func.unnest(literal(user_ids, ARRAY(Text))).table_valued("user_id").render_derived()
+        keys = (
+            select(func.hashtext(users.c.user_id).label("key"))
+            .distinct()
+            .order_by("key")
+            .subquery()
+        )
+        await self.session.execute(
+            select(func.pg_advisory_xact_lock(FAVORITE_FLUSH_LOCK_CLASS, keys.c.key))
+        )
+
+    async def apply_favorite_changes(
+        self,
+        added: list[tuple[str, str]],
+        removed: list[tuple[str, str]],
+    ) -> None:
+        """
+        Write buffered (user_id, recipe_id) favorite changes; safe to apply twice.
+
+        Adds skip pairs that already exist and pairs whose recipe or user has been
+        deleted since, so one stale change cannot fail the whole batch.
+        """
+        if added:
+            pairs = values(
+                column("user_id", String(36)),
+                column("recipe_id", String(36)),
+                name="pairs",
+            ).data(added)
+            source = (
+                select(server_uuid(), pairs.c.user_id, pairs.c.recipe_id, func.now(), func.now())
+                .join(Recipe, Recipe.id == pairs.c.recipe_id)
+                .join(User, User.id == pairs.c.user_id)
+            )
+            await self.session.execute(
+                pg_insert(RecipeFavorite)
+                .from_select(("id", "user_id", "recipe_id", "created_at", "updated_at"), source)
+                .on_conflict_do_nothing(index_elements=("user_id", "recipe_id"))
+            )
+        if removed:
+            await self.session.execute(
+                delete(RecipeFavorite).where(
+                    tuple_(RecipeFavorite.user_id, RecipeFavorite.recipe_id).in_(removed)
+                )
+            )
+
     async def get_user_favorites(
         self,
         user_id: str,
@@ -220,41 +314,214 @@ class RecipeInteractionRepository:
         if not recipe_ids:
             return {}
 
-        # Get rating stats
-        rating_result = await self.session.execute(
+        result = await self.session.execute(
             select(
-                RecipeRating.recipe_id,
-                func.avg(RecipeRating.rating).label("average_rating"),
-                func.count(RecipeRating.id).label("total_ratings"),
+                Recipe.id,
+                Recipe.rating_sum,
+                Recipe.rating_count,
+                Recipe.favorites_count,
+            ).where(Recipe.id.in_(recipe_ids))
+        )
+        stats = {
+            row.id: _stats_from_counters(row.rating_sum, row.rating_count, row.favorites_count)
+            for row in result.all()
+        }
+
+        # Ids without a recipes row (e.g. cached recipes) have no interactions
+        return {
+            recipe_id: stats.get(recipe_id)
+            or {"average_rating": None, "total_ratings": 0, "favorites_count": 0}
+            for recipe_id in recipe_ids
+        }
+
+    def _list_interactions_stmt(self, user_id: str) -> Select:
+        # Correlated lookups hit the (user_id, recipe_id) unique indexes, so a
+        # page costs one round trip however many recipes it holds
+        user_rating = (
+            select(RecipeRating.rating)
+            .where(RecipeRating.user_id == user_id, RecipeRating.recipe_id == Recipe.id)
+            .scalar_subquery()
+        )
+        is_favorite = exists().where(
+            RecipeFavorite.user_id == user_id,
+            RecipeFavorite.recipe_id == Recipe.id,
+        )
+        return select(
+            Recipe.id,
+            Recipe.external_source,
+            Recipe.external_id,
+            user_rating.label("user_rating"),
+            is_favorite.label("is_favorite"),
+            Recipe.rating_sum,
+            Recipe.rating_count,
+            Recipe.favorites_count,
+        )
+
+    async def get_list_interactions(
+        self,
+        user_id: str,
+        recipe_ids: list[str],
+    ) -> dict[str, dict]:
+        """User rating, favorite flag and stats per recipe id, in one query."""
+        if not recipe_ids:
+            return {}
+
+        result = await self.session.execute(
+            self._list_interactions_stmt(user_id).where(Recipe.id.in_(recipe_ids))
+        )
+        return {
+            row.id: {
+                "user_rating": row.user_rating,
+                "is_favorite": row.is_favorite,
+                "stats": _stats_from_counters(
+                    row.rating_sum, row.rating_count, row.favorites_count
+                ),
+            }
+            for row in result.all()
+        }
+
+    async def get_list_interactions_by_external(
+        self,
+        user_id: str,
+        refs: list[tuple[str, str]],
+    ) -> dict[tuple[str, str], dict]:
+        """
+        Same as get_list_interactions, keyed by (external_source, external_id).
+
+        An external recipe can be imported by several users; their copies are
+        merged, so stats cover every copy and the flags cover any of them.
+        """
+        if not refs:
+            return {}
+
+        result = await self.session.execute(
+            self._list_interactions_stmt(user_id).where(
+                tuple_(Recipe.external_source, Recipe.external_id).in_(refs)
             )
-            .where(RecipeRating.recipe_id.in_(recipe_ids))
-            .group_by(RecipeRating.recipe_id)
         )
-        rating_stats = {
-            row.recipe_id: {
-                "average_rating": float(row.average_rating) if row.average_rating else None,
-                "total_ratings": row.total_ratings,
+        merged: dict[tuple[str, str], dict] = {}
+        for row in result.all():
+            acc = merged.setdefault(
+                (row.external_source, row.external_id),
+                {
+                    "user_rating": None,
+                    "is_favorite": False,
+                    "rating_sum": 0,
+                    "rating_count": 0,
+                    "favorites_count": 0,
+                },
+            )
+            if row.user_rating is not None:
+                acc["user_rating"] = row.user_rating
+            acc["is_favorite"] = acc["is_favorite"] or row.is_favorite
+            acc["rating_sum"] += row.rating_sum
+            acc["rating_count"] += row.rating_count
+            acc["favorites_count"] += row.favorites_count
+
+        return {
+            ref: {
+                "user_rating": acc["user_rating"],
+                "is_favorite": acc["is_favorite"],
+                "stats": _stats_from_counters(
+                    acc["rating_sum"], acc["rating_count"], acc["favorites_count"]
+                ),
             }
-            for row in rating_result.all()
+            for ref, acc in merged.items()
         }
 
-        # Get favorites counts
-        favorites_result = await self.session.execute(
+    async def get_top_rated(
+        self,
+        min_ratings: int = 1,
+        skip: int = 0,
+        limit: int = 20,
+    ) -> tuple[list[Recipe], int]:
+        """Recipes by average rating, then rating count (served by ix_recipes_top_rated)."""
+        # Inline copy of the partial index predicate, so it matches whatever
+        # min_ratings is bound to
+        rated = (Recipe.rating_count > literal_column("0")) & (Recipe.rating_count >= min_ratings)
+
+        count_result = await self.session.execute(
+            select(func.count()).select_from(Recipe).where(rated)
+        )
+        total = count_result.scalar_one()
+
+        # Same expression as the index; plain "/" would cast the divisor to NUMERIC
+        average = cast(Recipe.rating_sum, Double) / cast(Recipe.rating_count, Double)
+        result = await self.session.execute(
+            select(Recipe)
+            .where(rated)
+            .order_by(average.desc(), Recipe.rating_count.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(result.scalars().all()), total
+
+    # ========== Leaderboard Rebuild ==========
+
+    async def get_trending_scores(
+        self,
+        since: datetime,
+        now: float,
+        half_life: float,
+        favorite_weight: float,
+        rating_weight: float,
+        limit: int,
+    ) -> dict[str, float]:
+        """Time-decayed favorite and rating activity per recipe since a point in time."""
+        events = union_all(
             select(
                 RecipeFavorite.recipe_id,
-                func.count(RecipeFavorite.id).label("favorites_count"),
-            )
-            .where(RecipeFavorite.recipe_id.in_(recipe_ids))
-            .group_by(RecipeFavorite.recipe_id)
+                RecipeFavorite.created_at,
+                literal(favorite_weight, Double).label("weight"),
+            ).where(RecipeFavorite.created_at >= since),
+            select(
+                RecipeRating.recipe_id,
+                RecipeRating.created_at,
+                literal(rating_weight, Double).label("weight"),
+            ).where(RecipeRating.created_at >= since),
+        ).subquery()
+        score = func.sum(_decayed(events.c.created_at, events.c.weight, now, half_life))
+        result = await self.session.execute(
+            select(events.c.recipe_id, score)
+            .group_by(events.c.recipe_id)
+            .order_by(score.desc())
+            .limit(limit)
         )
-        favorites_counts = {row.recipe_id: row.favorites_count for row in favorites_result.all()}
+        return {recipe_id: float(value) for recipe_id, value in result.all()}
 
-        # Combine
+    async def get_top_rated_scores(
+        self, prior_mean: float, prior_weight: int, limit: int
+    ) -> dict[str, float]:
+        """Damped average rating per rated recipe."""
+        score = (cast(Recipe.rating_sum, Double) + prior_mean * prior_weight) / (
+            Recipe.rating_count + prior_weight
+        )
+        result = await self.session.execute(
+            select(Recipe.id, score)
+            .where(Recipe.rating_count > 0)
+            .order_by(score.desc())
+            .limit(limit)
+        )
+        return {recipe_id: float(value) for recipe_id, value in result.all()}
+
+    async def get_import_scores(
+        self, since: datetime, now: float, half_life: float, weight: float, limit: int
+    ) -> dict[tuple[str, str], float]:
+        """Time-decayed import count per (external_source, external_id) since a point in time."""
+        score = func.sum(_decayed(Recipe.imported_at, literal(weight, Double), now, half_life))
+        result = await self.session.execute(
+            select(Recipe.external_source, Recipe.external_id, score)
+            .where(
+                Recipe.imported_at >= since,
+                Recipe.external_source.is_not(None),
+                Recipe.external_id.is_not(None),
+            )
+            .group_by(Recipe.external_source, Recipe.external_id)
+            .order_by(score.desc())
+            .limit(limit)
+        )
         return {
-            recipe_id: {
-                "average_rating": rating_stats.get(recipe_id, {}).get("average_rating"),
-                "total_ratings": rating_stats.get(recipe_id, {}).get("total_ratings", 0),
-                "favorites_count": favorites_counts.get(recipe_id, 0),
-            }
-            for recipe_id in recipe_ids
+            (source, external_id): float(value)
+            for source, external_id, value in result.all()
+            if source and external_id
         }
@@ -1,12 +1,19 @@
-from sqlalchemy import func, select
+from sqlalchemy import Row, String, any_, delete, func, literal, select, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from src.models.shopping_item import ShoppingItem
+from src.models.shopping_item_contribution import ShoppingItemContribution
 from src.models.shopping_list import ShoppingList
 from src.repositories.base import BaseRepository
 
 
+def _id_in(column, ids: list[str]):
+    """`column = ANY(:ids)`: one array parameter however many ids are passed."""
+    return column == any_(literal(list(ids), ARRAY(String(36))))
+
+
 class ShoppingListRepository(BaseRepository[ShoppingList]):
     def __init__(self, session: AsyncSession):
         super().__init__(ShoppingList, session)
@@ -19,6 +26,29 @@ class ShoppingListRepository(BaseRepository[ShoppingList]):
         )
         return result.scalar_one_or_none()
 
+    async def get_owner_id(self, shopping_list_id: str) -> str | None:
+        """Get the list's user_id without loading the list or its items."""
+        result = await self.session.execute(
+            select(ShoppingList.user_id).where(ShoppingList.id == shopping_list_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_version(self, shopping_list_id: str) -> Row | None:
+        """(user_id, version) of a list, without loading its items."""
+        result = await self.session.execute(
+            select(ShoppingList.user_id, ShoppingList.version).where(
+                ShoppingList.id == shopping_list_id
+            )
+        )
+        return result.one_or_none()
+
+    async def bump_version(self, shopping_list_id: str) -> None:
+        await self.session.execute(
+            update(ShoppingList)
+            .where(ShoppingList.id == shopping_list_id)
+            .values(version=ShoppingList.version + 1)
+        )
+
     async def get_user_shopping_lists(
         self,
         user_id: str,
@@ -56,15 +86,10 @@ class ShoppingListRepository(BaseRepository[ShoppingList]):
         shopping_list_id: str,
         items_data: list[dict],
     ) -> list[ShoppingItem]:
-        items = []
-        for item_data in items_data:
-            item = ShoppingItem(shopping_list_id=shopping_list_id, **item_data)
-            self.session.add(item)
-            items.append(item)
-        await self.session.flush()
-        for item in items:
-            await self.session.refresh(item)
-        return items
+        return await self.insert_many(
+            ShoppingItem,
+            [{"shopping_list_id": shopping_list_id, **item_data} for item_data in items_data],
+        )
 
     async def get_item_by_id(self, item_id: str) -> ShoppingItem | None:
         result = await self.session.execute(select(ShoppingItem).where(ShoppingItem.id == item_id))
@@ -98,13 +123,95 @@ class ShoppingListRepository(BaseRepository[ShoppingList]):
         self,
         shopping_list_id: str,
         is_checked: bool,
+        item_ids: list[str] | None = None,
     ) -> int:
-        from sqlalchemy import update
+        """Set is_checked on the list's items, or only on item_ids if given."""
+        stmt = update(ShoppingItem).where(ShoppingItem.shopping_list_id == shopping_list_id)
+        if item_ids is not None:
+            stmt = stmt.where(_id_in(ShoppingItem.id, item_ids))
+        result = await self.session.execute(stmt.values(is_checked=is_checked))
+        await self.session.flush()
+        return result.rowcount
 
+    async def get_item_ids(self, shopping_list_id: str, item_ids: list[str]) -> set[str]:
+        """Return which of item_ids belong to the list."""
         result = await self.session.execute(
-            update(ShoppingItem)
-            .where(ShoppingItem.shopping_list_id == shopping_list_id)
-            .values(is_checked=is_checked)
+            select(ShoppingItem.id).where(
+                ShoppingItem.shopping_list_id == shopping_list_id,
+                _id_in(ShoppingItem.id, item_ids),
+            )
+        )
+        return set(result.scalars().all())
+
+    async def update_items(self, rows: list[dict]) -> None:
+        """
+        Bulk UPDATE by primary key; each row holds an "id" and the fields to set.
+
+        Rows setting the same fields share one executemany statement.
+        """
+        await self.session.execute(update(ShoppingItem), rows)
+        await self.session.flush()
+
+    async def delete_items(self, shopping_list_id: str, item_ids: list[str]) -> int:
+        result = await self.session.execute(
+            delete(ShoppingItem).where(
+                ShoppingItem.shopping_list_id == shopping_list_id,
+                _id_in(ShoppingItem.id, item_ids),
+            )
         )
         await self.session.flush()
         return result.rowcount
+
+    async def get_auto_sync_by_meal_plan_id(self, meal_plan_id: str) -> ShoppingList | None:
+        result = await self.session.execute(
+            select(ShoppingList).where(
+                ShoppingList.meal_plan_id == meal_plan_id,
+                ShoppingList.auto_sync.is_(True),
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def get_items_by_keys(
+        self,
+        shopping_list_id: str,
+        keys: list[tuple[str, str]],
+    ) -> list[ShoppingItem]:
+        """Get generated items by (ingredient_key, canonical_unit)."""
+        if not keys:
+            return []
+        result = await self.session.execute(
+            select(ShoppingItem).where(
+                ShoppingItem.shopping_list_id == shopping_list_id,
+                tuple_(ShoppingItem.ingredient_key, ShoppingItem.canonical_unit).in_(keys),
+            )
+        )
+        return list(result.scalars().all())
+
+    async def get_items_by_ids(self, item_ids: list[str]) -> list[ShoppingItem]:
+        result = await self.session.execute(
+            select(ShoppingItem).where(ShoppingItem.id.in_(item_ids))
+        )
+        return list(result.scalars().all())
+
+    async def add_contributions(self, rows: list[dict]) -> None:
+        await self.insert_many(ShoppingItemContribution, rows)
+
+    async def delete_slot_contributions(self, slot_ids: list[str]) -> list[str]:
+        """Delete the slots' contributions; returns the affected item ids."""
+        result = await self.session.execute(
+            delete(ShoppingItemContribution)
+            .where(ShoppingItemContribution.meal_slot_id.in_(slot_ids))
+            .returning(ShoppingItemContribution.shopping_item_id)
+        )
+        return list(result.scalars().all())
+
+    async def get_contribution_totals(self, item_ids: list[str]) -> dict[str, float]:
+        result = await self.session.execute(
+            select(
+                ShoppingItemContribution.shopping_item_id,
+                func.sum(ShoppingItemContribution.amount),
+            )
+            .where(ShoppingItemContribution.shopping_item_id.in_(item_ids))
+            .group_by(ShoppingItemContribution.shopping_item_id)
+        )
+        return {item_id: float(total) for item_id, total in result.all()}
@@ -97,3 +97,76 @@ class QuickPlanCreate(BaseModel):
     week_start_date: DateType
     slots: list[QuickPlanSlotInput]
     notes: str | None = Field(default=None, max_length=1000)
+
+
+class GenerateMealPlanRequest(BaseModel):
+    """주간 식사계획 자동 생성 - 비어 있는 슬롯만 채웁니다"""
+
+    week_start_date: DateType
+    meal_types: list[MealType] = Field(
+        default_factory=lambda: ["breakfast", "lunch", "dinner"], min_length=1
+    )
+    max_total_minutes: int | None = Field(
+        default=None, ge=5, le=600, description="Maximum prep + cook time per recipe"
+    )
+    calories_per_day: int | None = Field(default=None, ge=500, le=10000)
+    protein_grams_per_day: float | None = Field(default=None, gt=0, le=1000)
+    carbs_grams_per_day: float | None = Field(default=None, gt=0, le=2000)
+    fat_grams_per_day: float | None = Field(default=None, gt=0, le=1000)
+    no_repeat_days: int = Field(
+        default=3, ge=0, le=7, description="Minimum days between two uses of a recipe"
+    )
+    include_own_recipes: bool = True
+    servings: int | None = Field(default=None, ge=1, le=100)
+    notes: str | None = Field(default=None, max_length=1000)
+
+
+# 기존 슬롯과 겹칠 때: skip = 기존 슬롯 유지, replace = 복사한 레시피로 교체
+SlotConflictPolicy = Literal["skip", "replace"]
+
+
+class MealPlanCopyRequest(BaseModel):
+    """식사계획을 다른 주로 복사"""
+
+    target_week_start_date: DateType
+    on_conflict: SlotConflictPolicy = "skip"
+    notes: str | None = Field(default=None, max_length=1000)
+
+
+class MealPlanTemplateCreate(BaseModel):
+    """식사계획을 이름 붙인 템플릿으로 저장"""
+
+    meal_plan_id: str
+    name: str = Field(min_length=1, max_length=100)
+    notes: str | None = Field(default=None, max_length=1000)
+
+
+class MealPlanTemplateApply(BaseModel):
+    """템플릿을 특정 주에 적용"""
+
+    week_start_date: DateType
+    on_conflict: SlotConflictPolicy = "skip"
+    notes: str | None = Field(default=None, max_length=1000)
+
+
+class MealPlanTemplateSlotResponse(BaseModel):
+    id: str
+    recipe_id: str
+    day_offset: int
+    meal_type: MealType
+    servings: int
+    notes: str | None
+
+    model_config = {"from_attributes": True}
+
+
+class MealPlanTemplateResponse(BaseModel):
+    id: str
+    user_id: str
+    name: str
+    notes: str | None
+    slots: list[MealPlanTemplateSlotResponse]
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = {"from_attributes": True}
@@ -5,6 +5,7 @@ from pydantic import BaseModel, Field, HttpUrl
 
 from src.schemas.ingredient import IngredientCreate, IngredientResponse
 from src.schemas.instruction import InstructionCreate, InstructionResponse
+from src.schemas.recipe_interaction import RecipeStatsResponse, RecipeUserInteractionResponse
 
 RecipeDifficulty = Literal["easy", "medium", "hard"]
 RecipeCategory = Literal[
@@ -64,10 +65,25 @@ class RecipeResponse(BaseModel):
     fat_grams: float | None
     created_at: datetime
     updated_at: datetime
+    # Only filled in list responses requested with include=interactions,stats
+    interactions: RecipeUserInteractionResponse | None = None
+    stats: RecipeStatsResponse | None = None
 
     model_config = {"from_attributes": True}
 
 
+class TopRatedRecipeResponse(RecipeResponse):
+    average_rating: float | None = None
+    rating_count: int = 0
+    favorites_count: int = 0
+
+
+class LeaderboardRecipeResponse(TopRatedRecipeResponse):
+    """Recipe on a leaderboard; score is what the board ranks by."""
+
+    score: float
+
+
 class RecipeWithDetailsResponse(RecipeResponse):
     ingredients: list[IngredientResponse]
     instructions: list[InstructionResponse]
@@ -95,15 +111,49 @@ class BrowseRecipeResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     source_type: Literal["user", "cached"] = "user"
+    interactions: RecipeUserInteractionResponse | None = None
+    stats: RecipeStatsResponse | None = None
 
     model_config = {"from_attributes": True}
 
 
+class IngredientMatchResponse(BrowseRecipeResponse):
+    """Recipe ranked by how much of its ingredient list is covered."""
+
+    coverage: float
+    matched_count: int
+    total_ingredients: int
+    missing_ingredients: list[str] = Field(default_factory=list)
+
+
 class BrowseRecipeWithDetailsResponse(BrowseRecipeResponse):
     ingredients: list[IngredientResponse] = Field(default_factory=list)
     instructions: list[InstructionResponse] = Field(default_factory=list)
 
 
+class NutritionFilter(BaseModel):
+    """Inclusive per-serving nutrition bounds; recipes missing a bounded value are excluded."""
+
+    min_calories: int | None = Field(default=None, ge=0)
+    max_calories: int | None = Field(default=None, ge=0)
+    min_protein: float | None = Field(default=None, ge=0)
+    max_protein: float | None = Field(default=None, ge=0)
+    min_carbs: float | None = Field(default=None, ge=0)
+    max_carbs: float | None = Field(default=None, ge=0)
+    min_fat: float | None = Field(default=None, ge=0)
+    max_fat: float | None = Field(default=None, ge=0)
+
+    def ranges(self) -> dict[str, tuple[float | None, float | None]]:
+        """(min, max) per nutrition column, only for columns with a bound."""
+        bounds = {
+            "calories": (self.min_calories, self.max_calories),
+            "protein_grams": (self.min_protein, self.max_protein),
+            "carbs_grams": (self.min_carbs, self.max_carbs),
+            "fat_grams": (self.min_fat, self.max_fat),
+        }
+        return {column: pair for column, pair in bounds.items() if pair != (None, None)}
+
+
 class RecipeSearchParams(BaseModel):
     query: str | None = None
     categories: list[RecipeCategory] | None = None
@@ -111,6 +161,7 @@ class RecipeSearchParams(BaseModel):
     difficulty: RecipeDifficulty | None = None
     max_prep_time: int | None = Field(default=None, ge=0)
     max_cook_time: int | None = Field(default=None, ge=0)
+    nutrition: NutritionFilter | None = None
     page: int = Field(default=1, ge=1)
     limit: int = Field(default=20, ge=1, le=100)
 
@@ -145,6 +196,8 @@ class ExternalRecipePreview(BaseModel):
     category: str | None = None
     area: str | None = None
     meal_types: list[str] = Field(default_factory=list)
+    interactions: RecipeUserInteractionResponse | None = None
+    stats: RecipeStatsResponse | None = None
 
 
 class ExternalRecipeDetail(BaseModel):
@@ -196,3 +249,29 @@ class ExternalSearchResponse(BaseModel):
     page: int
     limit: int
     total_pages: int
+
+
+class ExternalRecipeRef(BaseModel):
+    """외부 레시피 식별자."""
+
+    source: ExternalRecipeSource
+    external_id: str = Field(min_length=1, max_length=100)
+
+
+class ExternalRecipeBulkImportRequest(BaseModel):
+    """여러 외부 레시피 일괄 가져오기 요청."""
+
+    recipes: list[ExternalRecipeRef] = Field(min_length=1, max_length=50)
+
+
+class ExternalRecipeBulkImportResponse(BaseModel):
+    """일괄 가져오기 응답 (요청 순서, 중복 제거)."""
+
+    recipes: list[RecipeResponse]
+    not_found: list[ExternalRecipeRef] = Field(default_factory=list)
+
+
+class LeaderboardImportResponse(ExternalRecipeRef):
+    """최근 가져오기 순위의 외부 레시피 (score: 시간 감쇠 가져오기 수)."""
+
+    score: float
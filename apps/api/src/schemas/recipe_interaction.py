@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Literal
 
 from pydantic import BaseModel, Field
 
@@ -48,6 +49,15 @@ class RecipeStatsResponse(BaseModel):
     favorites_count: int = 0
 
 
+# Extras for list responses, requested with include=interactions,stats
+RecipeListInclude = Literal["interactions", "stats"]
+
+
+class RecipeUserInteractionResponse(BaseModel):
+    user_rating: int | None = None
+    is_favorite: bool = False
+
+
 # Extended Recipe Response with interaction data
 class RecipeInteractionResponse(BaseModel):
     """User-specific interaction data for a recipe."""
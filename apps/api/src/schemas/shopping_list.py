@@ -45,6 +45,18 @@ class ShoppingItemUpdate(BaseModel):
     notes: str | None = Field(default=None, max_length=500)
 
 
+class ShoppingItemBatchUpdate(ShoppingItemUpdate):
+    id: str
+
+
+class ShoppingItemBatchRequest(BaseModel):
+    check: list[str] = Field(default_factory=list, max_length=500)
+    uncheck: list[str] = Field(default_factory=list, max_length=500)
+    update: list[ShoppingItemBatchUpdate] = Field(default_factory=list, max_length=500)
+    delete: list[str] = Field(default_factory=list, max_length=500)
+    add: list[ShoppingItemCreate] = Field(default_factory=list, max_length=500)
+
+
 class ShoppingItemResponse(BaseModel):
     id: str
     shopping_list_id: str
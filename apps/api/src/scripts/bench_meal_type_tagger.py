@@ -0,0 +1,153 @@
+"""Benchmark the compiled meal type matcher against per-keyword regex scanning.
+
+Usage:
+    cd apps/api && uv run python -m src.scripts.bench_meal_type_tagger
+    cd apps/api && uv run python -m src.scripts.bench_meal_type_tagger --titles 100000
+"""
+
+import argparse
+import logging
+import random
+import re
+import time
+
+from src.services.meal_type_tagger import (
+    _CATEGORY_MEAL_TYPES,
+    _ENGLISH_KEYWORDS,
+    _KOREAN_KEYWORDS,
+    classify_meal_types,
+    classify_meal_types_batch,
+)
+from src.services.seed_recipe import _load_seed_data
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+logger = logging.getLogger(__name__)
+
+FILLER_WORDS = [
+    "spicy",
+    "classic",
+    "homemade",
+    "eggplant",
+    "creamy",
+    "garlic",
+    "매콤한",
+    "간단",
+    "엄마표",
+    "특제",
+    "ribsy",
+    "toasted",
+]
+
+
+def _reference_classify(
+    title: str,
+    title_original: str | None = None,
+    categories: list[str] | None = None,
+    tags: list[str] | None = None,
+) -> list[str]:
+    """Previous implementation: one regex search / substring scan per keyword."""
+    categories = categories or []
+    tags = tags or []
+    all_text = " ".join(
+        [
+            title.lower(),
+            (title_original or "").lower(),
+            " ".join(c.lower() for c in categories),
+            " ".join(t.lower() for t in tags),
+        ]
+    )
+
+    meal_types: set[str] = set()
+    for category in (c.lower() for c in categories):
+        meal_types.update(_CATEGORY_MEAL_TYPES.get(category, ()))
+
+    for meal_type in ("breakfast", "lunch", "dinner", "snack"):
+        for kw in _KOREAN_KEYWORDS[meal_type] + _ENGLISH_KEYWORDS[meal_type]:
+            if any("\uac00" <= ch <= "\ud7a3" for ch in kw):
+                hit = kw in all_text
+            else:
+                hit = re.search(r"\b" + re.escape(kw) + r"\b", all_text) is not None
+            if hit:
+                meal_types.add(meal_type)
+                break
+
+    if not meal_types:
+        meal_types = {"lunch", "dinner"}
+    return sorted(meal_types)
+
+
+def generate_records(count: int, seed: int = 42) -> list[dict]:
+    """Generate synthetic recipe records mixing seed titles and vocabulary."""
+    rng = random.Random(seed)
+    seed_titles = [r.get("title", "") for r in _load_seed_data().get("recipes", [])]
+    vocabulary = [
+        kw
+        for table in (_KOREAN_KEYWORDS, _ENGLISH_KEYWORDS)
+        for keywords in table.values()
+        for kw in keywords
+    ]
+    categories = list(_CATEGORY_MEAL_TYPES) + ["main", "korean", "vegetarian"]
+
+    records = []
+    for _ in range(count):
+        words = rng.sample(FILLER_WORDS, 2) + rng.sample(vocabulary, rng.randint(0, 2))
+        if seed_titles and rng.random() < 0.3:
+            words.append(rng.choice(seed_titles))
+        rng.shuffle(words)
+        records.append(
+            {
+                "title": " ".join(words),
+                "title_original": rng.choice(seed_titles) if rng.random() < 0.2 else None,
+                "categories": rng.sample(categories, rng.randint(0, 2)),
+                "tags": rng.sample(FILLER_WORDS, rng.randint(0, 2)),
+            }
+        )
+    return records
+
+
+def _time(fn, records: list[dict]) -> tuple[float, list[list[str]]]:
+    start = time.perf_counter()
+    results = [fn(**r) for r in records]
+    return time.perf_counter() - start, results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark classify_meal_types")
+    parser.add_argument("--titles", type=int, default=100_000, help="Number of titles")
+    args = parser.parse_args()
+
+    records = generate_records(args.titles)
+
+    ref_seconds, ref_results = _time(_reference_classify, records)
+    new_seconds, new_results = _time(classify_meal_types, records)
+
+    start = time.perf_counter()
+    batch_results = classify_meal_types_batch(
+        [r["title"] for r in records],
+        [r["title_original"] for r in records],
+        [r["categories"] for r in records],
+        [r["tags"] for r in records],
+    )
+    batch_seconds = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(ref_results, new_results) if a != b)
+    mismatches += sum(1 for a, b in zip(new_results, batch_results) if a != b)
+
+    per_title = 1e6 / len(records)
+    logger.info(
+        f"\n=== classify_meal_types ({len(records)} titles) ===\n"
+        f"  per-keyword regex:    {ref_seconds:.3f}s ({ref_seconds * per_title:.1f} us/title)\n"
+        f"  compiled single-pass: {new_seconds:.3f}s ({new_seconds * per_title:.1f} us/title)\n"
+        f"  batch (process pool): {batch_seconds:.3f}s ({batch_seconds * per_title:.1f} us/title)\n"
+        f"  speed-up:             {ref_seconds / new_seconds:.1f}x single-pass, "
+        f"{ref_seconds / batch_seconds:.1f}x batch\n"
+        f"  mismatches:           {mismatches}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Measure meal plan solver latency on a synthetic candidate corpus.
+
+Usage:
+    cd apps/api && uv run python -m src.scripts.bench_plan_generator
+    cd apps/api && uv run python -m src.scripts.bench_plan_generator --recipes 50000
+"""
+
+import argparse
+import logging
+import random
+import statistics
+import time
+
+from src.services.meal_plan_generator import (
+    MEAL_TYPES,
+    NUTRIENTS,
+    Candidate,
+    CandidateIndex,
+    PlanSolver,
+)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+logger = logging.getLogger(__name__)
+
+
+def generate_candidates(count: int, seed: int = 42) -> list[Candidate]:
+    rng = random.Random(seed)
+    return [
+        Candidate(
+            source="korean_seed",
+            ref=f"bench-{i:06d}",
+            title=f"bench {i}",
+            meal_types=frozenset(rng.sample(MEAL_TYPES, rng.randint(1, 2))),
+            total_minutes=rng.choice([None, 10, 20, 30, 45, 60, 90]),
+            servings=rng.randint(1, 6),
+            nutrition=(
+                None if rng.random() < 0.1 else float(rng.randint(100, 1000)),
+                float(rng.randint(5, 60)),
+                float(rng.randint(10, 120)),
+                float(rng.randint(2, 50)),
+            ),
+        )
+        for i in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the meal plan solver")
+    parser.add_argument("--recipes", type=int, default=10_000, help="Candidate count")
+    parser.add_argument("--runs", type=int, default=20, help="Solves per case")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = CandidateIndex.build(generate_candidates(args.recipes))
+    build_ms = (time.perf_counter() - start) * 1000
+
+    slots = [(day, meal_type) for day in range(7) for meal_type in ("breakfast", "lunch", "dinner")]
+    cases = {
+        "no targets": {},
+        "calories": {"calories": 2000},
+        "calories+macros": {
+            "calories": 2000,
+            "protein_grams": 90,
+            "carbs_grams": 250,
+            "fat_grams": 70,
+        },
+    }
+
+    lines = [
+        f"\n=== Meal plan solver ({args.recipes} candidates, {len(slots)} slots) ===",
+        f"  index build: {build_ms:.1f} ms",
+    ]
+    for name, targets in cases.items():
+        timings = []
+        deviations = []
+        for run in range(args.runs):
+            start = time.perf_counter()
+            solver = PlanSolver(
+                index, slots, targets, max_minutes=45, no_repeat_days=3, rng=random.Random(run)
+            )
+            chosen = solver.solve()
+            timings.append((time.perf_counter() - start) * 1000)
+            for nutrient, target in targets.items():
+                i = NUTRIENTS.index(nutrient)
+                for day in range(7):
+                    total = sum(
+                        c.nutrition[i] or 0 for (d, _), c in zip(slots, chosen) if c and d == day
+                    )
+                    deviations.append(abs(total - target) / target)
+        mean_dev = f"{statistics.mean(deviations) * 100:5.1f}%" if deviations else "    -"
+        lines.append(
+            f"  {name:<16} p50 {statistics.median(timings):6.1f} ms  "
+            f"max {max(timings):6.1f} ms  mean daily deviation {mean_dev}"
+        )
+    logger.info("\n".join(lines))
+
+
+if __name__ == "__main__":
+    main()
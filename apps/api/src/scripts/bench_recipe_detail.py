@@ -0,0 +1,156 @@
+"""Compare the ORM, JSON-aggregation and cached read paths for recipe detail.
+
+Inserts a throwaway user and recipe inside a transaction that is rolled back,
+then times each path end to end: the queries plus building the response body.
+The "redis hit" path serves the same document from the detail cache.
+Allocations are the blocks traced by tracemalloc across one request.
+
+Usage:
+    cd apps/api && uv run python -m src.scripts.bench_recipe_detail
+    cd apps/api && uv run python -m src.scripts.bench_recipe_detail --ingredients 40 --runs 500
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.database import async_session_maker
+from src.core.redis import redis_client
+from src.core.responses import raw_api_response
+from src.models.base import generate_uuid
+from src.repositories.recipe import RecipeRepository
+from src.repositories.user import UserRepository
+from src.schemas.common import ApiResponse
+from src.schemas.recipe import BrowseRecipeWithDetailsResponse
+from src.services.recipe import RecipeService
+from src.services.recipe_detail_cache import RecipeDetailCache
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+logger = logging.getLogger(__name__)
+
+
+async def _seed_recipe(session: AsyncSession, ingredients: int, instructions: int) -> str:
+    user = await UserRepository(session).create(
+        {"email": f"bench-{generate_uuid()}@example.com", "name": "bench"}
+    )
+    recipe = await RecipeRepository(session).create_with_details(
+        {
+            "user_id": user.id,
+            "title": "벤치마크 김치찌개",
+            "description": "bench recipe",
+            "categories": ["dinner"],
+            "tags": ["korean", "stew"],
+            "calories": 450,
+            "protein_grams": 25.5,
+            "carbs_grams": 30.25,
+            "fat_grams": 18.0,
+        },
+        [
+            {"name": f"재료 {i}", "amount": 1.5 + i, "unit": "g", "order_index": i}
+            for i in range(ingredients)
+        ],
+        [{"step_number": i + 1, "description": f"step {i + 1} " * 10} for i in range(instructions)],
+    )
+    return recipe.id
+
+
+async def _measure(
+    session: AsyncSession,
+    request: Callable[[], Awaitable[bytes]],
+    runs: int,
+) -> dict[str, float]:
+    await request()  # warm up statement caches
+    timings = []
+    for _ in range(runs):
+        # A fresh identity map per request, as with a request-scoped session
+        session.expunge_all()
+        start = time.perf_counter()
+        await request()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    session.expunge_all()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    body = await request()
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sum(
+        stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0
+    )
+
+    timings.sort()
+    return {
+        "p50": statistics.median(timings),
+        "p95": timings[int(len(timings) * 0.95) - 1],
+        "blocks": blocks,
+        "peak_kb": peak / 1024,
+        "bytes": len(body),
+    }
+
+
+async def run(ingredients: int, instructions: int, runs: int) -> None:
+    async with async_session_maker() as session:
+        try:
+            recipe_id = await _seed_recipe(session, ingredients, instructions)
+            service = RecipeService(session)
+
+            async def orm_path() -> bytes:
+                data, _ = await service.get_recipe_or_cached_public(recipe_id)
+                response = ApiResponse(success=True, data=BrowseRecipeWithDetailsResponse(**data))
+                return response.model_dump_json().encode()
+
+            async def json_path() -> bytes:
+                document = await service.get_browse_recipe_json(recipe_id)
+                return raw_api_response(document).body
+
+            await redis_client.connect()
+            cached_service = RecipeService(session, redis_client)
+
+            async def cached_path() -> bytes:
+                document = await cached_service.get_browse_recipe_json(recipe_id)
+                return raw_api_response(document).body
+
+            results = {
+                "orm + pydantic": await _measure(session, orm_path, runs),
+                "json_agg": await _measure(session, json_path, runs),
+                "redis hit": await _measure(session, cached_path, runs),
+            }
+        finally:
+            await session.rollback()
+            await RecipeDetailCache(redis_client).invalidate(recipe_id)
+            await redis_client.disconnect()
+
+    lines = [
+        f"\n=== Recipe detail ({ingredients} ingredients, {instructions} steps, {runs} runs) ==="
+    ]
+    for name, stats in results.items():
+        lines.append(
+            f"  {name:<15} p50 {stats['p50']:6.2f} ms  p95 {stats['p95']:6.2f} ms  "
+            f"{stats['blocks']:>6.0f} blocks  peak {stats['peak_kb']:7.1f} KB  "
+            f"body {stats['bytes']:>6.0f} B"
+        )
+    logger.info("\n".join(lines))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark recipe detail read paths")
+    parser.add_argument("--ingredients", type=int, default=15, help="Ingredients per recipe")
+    parser.add_argument("--instructions", type=int, default=8, help="Steps per recipe")
+    parser.add_argument("--runs", type=int, default=200, help="Requests per path")
+    args = parser.parse_args()
+    asyncio.run(run(args.ingredients, args.instructions, args.runs))
+
+
+if __name__ == "__main__":
+    main()
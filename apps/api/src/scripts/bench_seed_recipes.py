@@ -0,0 +1,158 @@
+"""Benchmark indexed seed recipe lookups against linear scans.
+
+Usage:
+    cd apps/api && uv run python -m src.scripts.bench_seed_recipes
+    cd apps/api && uv run python -m src.scripts.bench_seed_recipes --recipes 10000
+"""
+
+import argparse
+import logging
+import random
+import time
+from collections.abc import Callable
+from typing import Any
+
+from src.services.seed_recipe import SeedRecipeService, _load_seed_data
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+logger = logging.getLogger(__name__)
+
+QUERIES = ["김치", "볶음", "찌개", "국", "떡", "닭", "매콤", "없는재료"]
+CATEGORIES = ["breakfast", "lunch", "dinner", "snack", "dessert", "side"]
+MEAL_TYPES = ["breakfast", "lunch", "dinner", "snack"]
+
+
+def generate_corpus(count: int, seed: int = 42) -> dict[str, Any]:
+    """Replicate the seed recipes into a corpus of the given size."""
+    rng = random.Random(seed)
+    base = _load_seed_data().get("recipes", [])
+    recipes = []
+    for i in range(count):
+        recipe = dict(base[i % len(base)])
+        recipe["id"] = f"kr-bench-{i:06d}"
+        recipe["title"] = f"{recipe.get('title', '')} {i}"
+        recipe["categories"] = rng.sample(CATEGORIES, rng.randint(1, 2))
+        recipes.append(recipe)
+    return {"recipes": recipes}
+
+
+def _linear_by_id(recipes: list[dict[str, Any]], recipe_id: str) -> dict[str, Any] | None:
+    for recipe in recipes:
+        if recipe.get("external_id") == recipe_id:
+            return recipe
+    return None
+
+
+def _linear_search(
+    recipes: list[dict[str, Any]],
+    query: str | None = None,
+    category: str | None = None,
+    meal_type: str | None = None,
+) -> list[dict[str, Any]]:
+    """Previous implementation: filter the full list once per criterion."""
+    results = recipes
+    if query:
+        query_lower = query.lower()
+        results = [
+            r
+            for r in results
+            if query_lower in r["title"].lower()
+            or query_lower in (r["description"] or "").lower()
+            or any(query_lower in tag.lower() for tag in r["tags"])
+        ]
+    if category:
+        results = [r for r in results if category in [c.lower() for c in r["categories"]]]
+    if meal_type:
+        results = [r for r in results if meal_type in r["meal_types"]]
+    return results
+
+
+def _linear_sample(
+    recipes: list[dict[str, Any]], number: int, category: str, meal_type: str
+) -> list[dict[str, Any]]:
+    """Previous discover path: filter everything, shuffle, take the head."""
+    matched = _linear_search(recipes, category=category, meal_type=meal_type)
+    random.shuffle(matched)
+    return matched[:number]
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark SeedRecipeService lookups")
+    parser.add_argument("--recipes", type=int, default=10_000, help="Corpus size")
+    parser.add_argument("--repeat", type=int, default=200, help="Iterations per case")
+    args = parser.parse_args()
+
+    data = generate_corpus(args.recipes)
+    start = time.perf_counter()
+    service = SeedRecipeService(data)
+    build_seconds = time.perf_counter() - start
+    recipes = service.get_all_recipes()
+
+    rng = random.Random(7)
+    ids = [r["external_id"] for r in rng.sample(recipes, min(args.repeat, len(recipes)))]
+
+    mismatches = 0
+    for recipe_id in ids:
+        mismatches += service.get_recipe_by_id(recipe_id) is not _linear_by_id(recipes, recipe_id)
+    for query in QUERIES:
+        for category in (None, "dinner"):
+            expected = _linear_search(recipes, query=query, category=category)
+            found = service.search_recipes(query=query, category=category, number=len(recipes))
+            mismatches += found["results"] != expected
+    for meal_type in MEAL_TYPES:
+        expected_ids = {r["external_id"] for r in _linear_search(recipes, meal_type=meal_type)}
+        sample = service.sample_recipes(len(recipes), meal_type=meal_type)
+        mismatches += {r["external_id"] for r in sample} != expected_ids
+
+    id_iter = iter(ids * 2)
+    cases = {
+        "get_recipe_by_id": (
+            lambda: _linear_by_id(recipes, next(id_iter)),
+            lambda: service.get_recipe_by_id(next(id_iter)),
+        ),
+        "search(query)": (
+            lambda: _linear_search(recipes, query=rng.choice(QUERIES))[:20],
+            lambda: service.search_recipes(query=rng.choice(QUERIES)),
+        ),
+        "search(category)": (
+            lambda: _linear_search(recipes, category=rng.choice(CATEGORIES))[:20],
+            lambda: service.search_recipes(category=rng.choice(CATEGORIES)),
+        ),
+        "sample(meal_type+category)": (
+            lambda: _linear_sample(
+                recipes, 10, category=rng.choice(CATEGORIES), meal_type=rng.choice(MEAL_TYPES)
+            ),
+            lambda: service.sample_recipes(
+                10, category=rng.choice(CATEGORIES), meal_type=rng.choice(MEAL_TYPES)
+            ),
+        ),
+    }
+
+    lines = [
+        f"\n=== SeedRecipeService ({len(recipes)} recipes) ===",
+        f"  index build: {build_seconds:.3f}s",
+    ]
+    for name, (linear_fn, indexed_fn) in cases.items():
+        linear = _time(linear_fn, len(ids))
+        indexed = _time(indexed_fn, len(ids))
+        lines.append(
+            f"  {name:<28} linear {linear * 1e6:9.1f} us  indexed {indexed * 1e6:9.1f} us"
+            f"  ({linear / indexed:.1f}x)"
+        )
+    lines.append(f"  mismatches: {mismatches}")
+    logger.info("\n".join(lines))
+
+
+if __name__ == "__main__":
+    main()
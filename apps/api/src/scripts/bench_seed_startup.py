@@ -0,0 +1,101 @@
+"""Measure worker startup time and RSS for the seed recipe service.
+
+Each worker is a fresh interpreter that imports the external recipe service,
+then builds the seed recipe service either from the precomputed meal types
+artifact or by classifying at runtime. Run build_seed_artifact first.
+
+Usage:
+    cd apps/api && uv run python -m src.scripts.bench_seed_startup
+    cd apps/api && uv run python -m src.scripts.bench_seed_startup --workers 8
+"""
+
+import argparse
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import time
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+logger = logging.getLogger(__name__)
+
+MODES = ("artifact", "runtime")
+
+
+def _worker(mode: str) -> None:
+    start = time.perf_counter()
+    import src.services.external_recipe  # noqa: F401
+    from src.services.seed_recipe import SeedRecipeService, get_seed_recipe_service
+
+    imported = time.perf_counter()
+    if mode == "artifact":
+        service = get_seed_recipe_service()
+    else:
+        service = SeedRecipeService(meal_types_file=None)
+    ready = time.perf_counter()
+
+    print(
+        json.dumps(
+            {
+                "import_ms": (imported - start) * 1000,
+                "first_use_ms": (ready - imported) * 1000,
+                "recipes": len(service.recipes),
+                "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            }
+        )
+    )
+
+
+def _run_workers(mode: str, count: int) -> dict[str, float]:
+    start = time.perf_counter()
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-m", "src.scripts.bench_seed_startup", "--worker", mode],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=os.environ.copy(),
+        )
+        for _ in range(count)
+    ]
+    reports = [
+        json.loads(proc.communicate()[0].decode().strip().splitlines()[-1]) for proc in procs
+    ]
+    wall = time.perf_counter() - start
+    return {
+        "wall_ms": wall * 1000,
+        "import_ms": sum(r["import_ms"] for r in reports) / count,
+        "first_use_ms": sum(r["first_use_ms"] for r in reports) / count,
+        "rss_mb": sum(r["max_rss_kb"] for r in reports) / 1024,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark seed recipe worker startup")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4, help="Worker count")
+    parser.add_argument("--worker", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        _worker(args.worker)
+        return
+
+    lines = ["\n=== Seed recipe worker startup ==="]
+    for count in sorted({1, max(args.workers, 2)}):
+        for mode in MODES:
+            stats = _run_workers(mode, count)
+            lines.append(
+                f"  {count:>2} worker(s) {mode:<8} wall {stats['wall_ms']:7.1f} ms  "
+                f"import {stats['import_ms']:6.1f} ms  first use {stats['first_use_ms']:6.1f} ms  "
+                f"total peak RSS {stats['rss_mb']:7.1f} MB"
+            )
+    logger.info("\n".join(lines))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Precompute seed recipe meal types into a compact artifact.
+
+Run at build time so API workers skip classifying the seed corpus on startup.
+Needs no settings or services: DATABASE_URL etc. are not set during image builds.
+The artifact is keyed on the seed JSON's sha256; a stale or missing artifact
+makes the service fall back to runtime classification.
+
+Usage:
+    cd apps/api && uv run python -m src.scripts.build_seed_artifact
+"""
+
+import logging
+import time
+
+from src.services.seed_recipe import (
+    MEAL_TYPES_FILE,
+    SEED_FILE,
+    _load_seed_data,
+    _seed_digest,
+    classify_seed_meal_types,
+    write_meal_types_artifact,
+)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    start = time.perf_counter()
+    raw_recipes = _load_seed_data().get("recipes", [])
+    batch_meal_types = classify_seed_meal_types(raw_recipes)
+    write_meal_types_artifact(MEAL_TYPES_FILE, _seed_digest(SEED_FILE), batch_meal_types)
+    logger.info(
+        f"Wrote meal types for {len(raw_recipes)} seed recipes to {MEAL_TYPES_FILE} "
+        f"({MEAL_TYPES_FILE.stat().st_size} bytes) in {time.perf_counter() - start:.3f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
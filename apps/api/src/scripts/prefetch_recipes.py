@@ -21,14 +21,17 @@ import json
 import logging
 import uuid
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from src.adapters.openai import openai_adapter
 from src.adapters.spoonacular import spoonacular_adapter
 from src.adapters.themealdb import themealdb_adapter
 from src.core.database import async_session_maker
-from src.core.redis import RedisClient
+from src.core.redis import RedisClient, redis_client
 from src.models.base import utc_now
 from src.repositories.cached_recipe import CachedRecipeRepository
-from src.services.meal_type_tagger import classify_meal_types
+from src.services.meal_type_tagger import classify_meal_types_batch
+from src.services.recipe_detail_cache import RecipeDetailCache
 from src.services.translation import TranslationService
 
 logging.basicConfig(
@@ -43,6 +46,58 @@ THEMEALDB_DELAY = 0.1  # seconds between requests
 SPOONACULAR_BATCH_SIZE = 10
 
 
+def _tag_meal_types(batch: list[dict]) -> None:
+    """Fill meal_types for a batch of cached recipe rows in one classify call."""
+    batch_meal_types = classify_meal_types_batch(
+        [r["title"] for r in batch],
+        [r["title_original"] for r in batch],
+        [r["categories"] for r in batch],
+        [r["tags"] for r in batch],
+    )
+    for recipe_data, meal_types in zip(batch, batch_meal_types):
+        recipe_data["meal_types"] = meal_types
+
+
+async def _invalidate_details(recipe_ids: list[str]) -> None:
+    """Drop cached browse detail documents of rewritten cached recipes, after commit."""
+    await redis_client.connect()
+    await RecipeDetailCache(redis_client).invalidate(*recipe_ids)
+
+
+async def _store_batch(
+    session: AsyncSession,
+    repo: CachedRecipeRepository,
+    batch: list[dict],
+    stats: dict[str, int],
+) -> None:
+    """
+    Tag and upsert a batch of fetched recipes, then commit.
+
+    Each upsert runs in its own savepoint, so a recipe that fails is rolled
+    back and counted alone while the rest of the batch is still committed.
+    """
+    if not batch:
+        return
+    _tag_meal_types(batch)
+    stored = []
+    for recipe_data in batch:
+        try:
+            async with session.begin_nested():
+                stored.append(await repo.upsert(recipe_data))
+        except Exception as e:
+            logger.error(f"  Storing {recipe_data.get('external_id')} failed: {e}")
+            stats["failed"] += 1
+    try:
+        await session.commit()
+        await _invalidate_details([recipe.id for recipe in stored])
+        stats["new"] += len(stored)
+    except Exception as e:
+        logger.error(f"  Committing batch of {len(stored)} recipes failed: {e}")
+        stats["failed"] += len(stored)
+        await session.rollback()
+    batch.clear()
+
+
 async def fetch_themealdb(
     translate: bool = False,
     dry_run: bool = False,
@@ -110,8 +165,8 @@ async def fetch_themealdb(
         except Exception as e:
             logger.warning(f"Redis/Translation init failed: {e}. Skipping translation.")
 
-    # 5. Fetch details and store
-    batch_count = 0
+    # 5. Fetch details and store (meal types are tagged per commit batch)
+    pending: list[dict] = []
     async with async_session_maker() as session:
         repo = CachedRecipeRepository(session)
 
@@ -154,12 +209,6 @@ async def fetch_themealdb(
                     "difficulty": details.get("difficulty", "medium"),
                     "categories": details.get("categories", []),
                     "tags": details.get("tags", []),
-                    "meal_types": classify_meal_types(
-                        title=details.get("title", ""),
-                        title_original=title_original,
-                        categories=details.get("categories", []),
-                        tags=details.get("tags", []),
-                    ),
                     "source_url": details.get("source_url"),
                     "ingredients_json": details.get("ingredients", []),
                     "instructions_json": details.get("instructions", []),
@@ -174,13 +223,9 @@ async def fetch_themealdb(
                     "updated_at": now,
                 }
 
-                await repo.upsert(recipe_data)
-                stats["new"] += 1
-                batch_count += 1
-
-                if batch_count >= BATCH_COMMIT_SIZE:
-                    await session.commit()
-                    batch_count = 0
+                pending.append(recipe_data)
+                if len(pending) >= BATCH_COMMIT_SIZE:
+                    await _store_batch(session, repo, pending, stats)
 
                 logger.info(
                     f"  [{i + 1}/{len(new_ids)}] {title_original} - OK"
@@ -191,12 +236,9 @@ async def fetch_themealdb(
             except Exception as e:
                 logger.error(f"  [{i + 1}/{len(new_ids)}] ID {rid} failed: {e}")
                 stats["failed"] += 1
-                await session.rollback()
-                batch_count = 0
 
         # Final commit
-        if batch_count > 0:
-            await session.commit()
+        await _store_batch(session, repo, pending, stats)
 
     if redis:
         await redis.disconnect()
@@ -253,7 +295,7 @@ async def fetch_spoonacular(
 
     async with async_session_maker() as session:
         repo = CachedRecipeRepository(session)
-        batch_count = 0
+        pending: list[dict] = []
 
         while fetched < max_recipes and api_calls < max_api_calls:
             try:
@@ -317,12 +359,6 @@ async def fetch_spoonacular(
                             "difficulty": details.get("difficulty", "medium"),
                             "categories": details.get("categories", []),
                             "tags": details.get("tags", []),
-                            "meal_types": classify_meal_types(
-                                title=details.get("title", ""),
-                                title_original=title_original,
-                                categories=details.get("categories", []),
-                                tags=details.get("tags", []),
-                            ),
                             "source_url": details.get("source_url"),
                             "ingredients_json": details.get("ingredients", []),
                             "instructions_json": details.get("instructions", []),
@@ -337,14 +373,11 @@ async def fetch_spoonacular(
                             "updated_at": now,
                         }
 
-                        await repo.upsert(recipe_data)
-                        stats["new"] += 1
-                        batch_count += 1
+                        pending.append(recipe_data)
                         fetched += 1
 
-                        if batch_count >= BATCH_COMMIT_SIZE:
-                            await session.commit()
-                            batch_count = 0
+                        if len(pending) >= BATCH_COMMIT_SIZE:
+                            await _store_batch(session, repo, pending, stats)
 
                         logger.info(
                             f"  [{fetched}/{max_recipes}] {title_original} - OK"
@@ -366,12 +399,9 @@ async def fetch_spoonacular(
 
             except Exception as e:
                 logger.error(f"Search batch failed: {e}")
-                await session.rollback()
-                batch_count = 0
                 break
 
-        if batch_count > 0:
-            await session.commit()
+        await _store_batch(session, repo, pending, stats)
 
     if redis:
         await redis.disconnect()
@@ -572,6 +602,7 @@ async def translate_with_openai(source: str = "all") -> dict[str, int]:
                         stats["titles_translated"] += 1
 
                 await session.commit()
+                await _invalidate_details([r.id for r in batch])
                 logger.info(
                     f"  Batch [{i + 1}-{i + len(batch)}/{len(title_recipes)}] "
                     f"translated {sum(1 for r in batch if r.title != r.title_original)}"
@@ -591,6 +622,7 @@ async def translate_with_openai(source: str = "all") -> dict[str, int]:
         need_full = [r for r in all_recipes if _has_english_ingredients(r.ingredients_json)]
         logger.info(f"Pass 2: {len(need_full)} recipes need ingredient/instruction translation")
 
+        translated_ids: list[str] = []
         for idx, recipe in enumerate(need_full):
             try:
                 recipe_dict = {
@@ -609,9 +641,12 @@ async def translate_with_openai(source: str = "all") -> dict[str, int]:
                 recipe.translated_at = utc_now()
 
                 stats["recipes_full_translated"] += 1
+                translated_ids.append(recipe.id)
 
                 if (idx + 1) % BATCH_COMMIT_SIZE == 0:
                     await session.commit()
+                    await _invalidate_details(translated_ids)
+                    translated_ids.clear()
 
                 logger.info(
                     f"  [{idx + 1}/{len(need_full)}] {recipe.title_original} -> {recipe.title}"
@@ -621,6 +656,7 @@ async def translate_with_openai(source: str = "all") -> dict[str, int]:
                 stats["failed"] += 1
 
         await session.commit()
+        await _invalidate_details(translated_ids)
 
     logger.info(f"=== GPT-4o-mini Translation Complete === {stats}")
     return stats
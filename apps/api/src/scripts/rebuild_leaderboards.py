@@ -0,0 +1,105 @@
+"""Batch script to rebuild the Redis recipe leaderboards from the database.
+
+Clears drift left by rolled-back requests and Redis data loss, and fills the
+boards after they were first deployed. Each board is swapped in atomically, so
+the API keeps serving the old one until the new one is ready.
+
+Usage:
+    cd apps/api && uv run python -m src.scripts.rebuild_leaderboards
+    cd apps/api && uv run python -m src.scripts.rebuild_leaderboards --board trending
+    cd apps/api && uv run python -m src.scripts.rebuild_leaderboards --dry-run
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from datetime import UTC, datetime
+from typing import get_args
+
+from src.core.database import async_session_maker
+from src.core.redis import redis_client
+from src.repositories.recipe_interaction import RecipeInteractionRepository
+from src.services.leaderboard import (
+    FAVORITE_WEIGHT,
+    HALF_LIFE_SECONDS,
+    IMPORT_WEIGHT,
+    MAX_MEMBERS,
+    RATING_PRIOR_MEAN,
+    RATING_PRIOR_WEIGHT,
+    RATING_WEIGHT,
+    REBUILD_WINDOW_SECONDS,
+    LeaderboardName,
+    RecipeLeaderboards,
+    import_member,
+)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+logger = logging.getLogger(__name__)
+
+
+async def compute_scores(
+    repo: RecipeInteractionRepository, board: LeaderboardName, now: float
+) -> dict[str, float]:
+    """A board's members and scores as of now (epoch seconds)."""
+    since = datetime.fromtimestamp(now - REBUILD_WINDOW_SECONDS, UTC)
+    if board == "trending":
+        return await repo.get_trending_scores(
+            since, now, HALF_LIFE_SECONDS, FAVORITE_WEIGHT, RATING_WEIGHT, MAX_MEMBERS
+        )
+    if board == "top_rated":
+        return await repo.get_top_rated_scores(RATING_PRIOR_MEAN, RATING_PRIOR_WEIGHT, MAX_MEMBERS)
+    scores = await repo.get_import_scores(since, now, HALF_LIFE_SECONDS, IMPORT_WEIGHT, MAX_MEMBERS)
+    return {import_member(*ref): score for ref, score in scores.items()}
+
+
+async def rebuild_leaderboards(
+    boards: list[LeaderboardName], dry_run: bool = False
+) -> dict[str, int]:
+    """Recompute the given boards and replace them in Redis; returns member counts."""
+    sizes: dict[str, int] = {}
+    await redis_client.connect()
+    try:
+        leaderboards = RecipeLeaderboards(redis_client)
+        async with async_session_maker() as session:
+            repo = RecipeInteractionRepository(session)
+            for board in boards:
+                now = time.time()
+                scores = await compute_scores(repo, board, now)
+                sizes[board] = len(scores)
+                top = max(scores.items(), key=lambda item: item[1], default=None)
+                logger.info(f"  {board}: {len(scores)} members, top {top}")
+                if not dry_run:
+                    await leaderboards.replace(board, scores, now)
+    finally:
+        await redis_client.disconnect()
+
+    logger.info(f"=== Leaderboard Rebuild {'Analysis' if dry_run else 'Complete'} ===")
+    return sizes
+
+
+async def main() -> None:
+    boards = list(get_args(LeaderboardName))
+    parser = argparse.ArgumentParser(description="Rebuild the Redis recipe leaderboards")
+    parser.add_argument(
+        "--board",
+        choices=boards,
+        action="append",
+        help="Board to rebuild (repeatable, default: all)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Compute the boards without writing to Redis",
+    )
+    args = parser.parse_args()
+
+    await rebuild_leaderboards(args.board or boards, dry_run=args.dry_run)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
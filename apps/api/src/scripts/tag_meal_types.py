@@ -9,11 +9,11 @@ import argparse
 import asyncio
 import logging
 
-from sqlalchemy import func, select
+from sqlalchemy import func, or_, select, update
 
 from src.core.database import async_session_maker
 from src.models.cached_recipe import CachedRecipe
-from src.services.meal_type_tagger import classify_meal_types
+from src.services.meal_type_tagger import classify_meal_types_batch
 
 logging.basicConfig(
     level=logging.INFO,
@@ -22,7 +22,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-BATCH_SIZE = 100
+# Large enough that classify_meal_types_batch fans each page out across cores
+BATCH_SIZE = 50_000
 
 
 async def tag_all_recipes(dry_run: bool = False) -> dict[str, int]:
@@ -37,6 +38,12 @@ async def tag_all_recipes(dry_run: bool = False) -> dict[str, int]:
         "snack": 0,
     }
 
+    # Skip if already tagged (non-empty meal_types)
+    untagged = or_(
+        CachedRecipe.meal_types.is_(None),
+        func.cardinality(CachedRecipe.meal_types) == 0,
+    )
+
     async with async_session_maker() as session:
         # Count total
         count_result = await session.execute(select(func.count()).select_from(CachedRecipe))
@@ -44,58 +51,65 @@ async def tag_all_recipes(dry_run: bool = False) -> dict[str, int]:
         stats["total"] = total
         logger.info(f"Total cached recipes: {total}")
 
+        untagged_result = await session.execute(
+            select(func.count()).select_from(CachedRecipe).where(untagged)
+        )
+        stats["skipped"] = total - untagged_result.scalar_one()
+
         if dry_run:
             logger.info("[DRY RUN] Analyzing meal type distribution...")
 
-        # Process in batches
-        offset = 0
+        # Process in batches (keyset pagination: tagged rows drop out of the filter)
+        last_id = ""
         batch_count = 0
 
-        while offset < total:
+        while True:
             result = await session.execute(
-                select(CachedRecipe)
-                .order_by(CachedRecipe.created_at)
-                .offset(offset)
+                select(
+                    CachedRecipe.id,
+                    CachedRecipe.title,
+                    CachedRecipe.title_original,
+                    CachedRecipe.categories,
+                    CachedRecipe.tags,
+                )
+                .where(untagged, CachedRecipe.id > last_id)
+                .order_by(CachedRecipe.id)
                 .limit(BATCH_SIZE)
             )
-            recipes = list(result.scalars().all())
+            rows = result.all()
 
-            if not recipes:
+            if not rows:
                 break
+            last_id = rows[-1].id
 
-            for recipe in recipes:
-                # Skip if already tagged (non-empty meal_types)
-                if recipe.meal_types and len(recipe.meal_types) > 0:
-                    stats["skipped"] += 1
-                    offset += 1
-                    continue
-
-                meal_types = classify_meal_types(
-                    title=recipe.title,
-                    title_original=recipe.title_original,
-                    categories=recipe.categories,
-                    tags=recipe.tags,
-                )
-
-                if not dry_run:
-                    recipe.meal_types = meal_types
+            batch_meal_types = classify_meal_types_batch(
+                [row.title for row in rows],
+                [row.title_original for row in rows],
+                [row.categories for row in rows],
+                [row.tags for row in rows],
+            )
 
-                stats["tagged"] += 1
+            stats["tagged"] += len(rows)
+            for meal_types in batch_meal_types:
                 for mt in meal_types:
                     stats[mt] = stats.get(mt, 0) + 1
 
-                if stats["tagged"] % 50 == 0 or stats["tagged"] == 1:
-                    logger.info(
-                        f"  [{stats['tagged'] + stats['skipped']}/{total}] "
-                        f"{recipe.title} -> {meal_types}"
-                    )
+            logger.info(
+                f"  [{stats['tagged'] + stats['skipped']}/{total}] "
+                f"{rows[0].title} -> {batch_meal_types[0]}"
+            )
 
             if not dry_run:
+                await session.execute(
+                    update(CachedRecipe),
+                    [
+                        {"id": row.id, "meal_types": meal_types}
+                        for row, meal_types in zip(rows, batch_meal_types)
+                    ],
+                )
                 await session.commit()
                 batch_count += 1
-                logger.info(f"  Committed batch {batch_count} ({len(recipes)} recipes)")
-
-            offset += len(recipes)
+                logger.info(f"  Committed batch {batch_count} ({len(rows)} recipes)")
 
     logger.info(
         f"\n=== Tagging {'Analysis' if dry_run else 'Complete'} ===\n"
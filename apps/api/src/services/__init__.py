@@ -1,9 +1,28 @@
-from src.services.auth import AuthService
-from src.services.meal_plan import MealPlanService
-from src.services.recipe import RecipeService
-from src.services.recipe_interaction import RecipeInteractionService
-from src.services.shopping_list import ShoppingListService
-from src.services.user import UserService
+"""
+Service package. Exports resolve on first access, so settings-free modules such
+as src.services.seed_recipe import without configuration (see
+src.scripts.build_seed_artifact, which runs at image build time).
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from src.services.auth import AuthService
+    from src.services.meal_plan import MealPlanService
+    from src.services.recipe import RecipeService
+    from src.services.recipe_interaction import RecipeInteractionService
+    from src.services.shopping_list import ShoppingListService
+    from src.services.user import UserService
+
+_EXPORTS = {
+    "AuthService": "src.services.auth",
+    "UserService": "src.services.user",
+    "RecipeService": "src.services.recipe",
+    "RecipeInteractionService": "src.services.recipe_interaction",
+    "MealPlanService": "src.services.meal_plan",
+    "ShoppingListService": "src.services.shopping_list",
+}
 
 __all__ = [
     "AuthService",
@@ -13,3 +32,9 @@ __all__ = [
     "MealPlanService",
     "ShoppingListService",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
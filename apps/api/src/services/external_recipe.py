@@ -1,5 +1,6 @@
 """External recipe service for multi-source recipe discovery and import."""
 
+import asyncio
 import json
 import logging
 from datetime import date, datetime
@@ -13,14 +14,16 @@ from src.adapters.spoonacular import spoonacular_adapter
 from src.adapters.themealdb import themealdb_adapter
 from src.core.config import settings
 from src.core.exceptions import NotFoundError, RateLimitExceededError
+from src.core.nutrition import NutritionRanges
 from src.core.redis import RedisClient
 from src.repositories.cached_recipe import CachedRecipeRepository
 from src.repositories.recipe import RecipeRepository
 from src.schemas.ingredient import IngredientCreate
 from src.schemas.instruction import InstructionCreate
 from src.schemas.recipe import RecipeCreate
-from src.services.meal_type_tagger import classify_meal_types
-from src.services.seed_recipe import seed_recipe_service
+from src.services.leaderboard import RecipeLeaderboards
+from src.services.meal_type_tagger import classify_meal_types_batch
+from src.services.seed_recipe import get_seed_recipe_service
 from src.services.translation import TranslationService
 
 logger = logging.getLogger(__name__)
@@ -28,6 +31,7 @@ logger = logging.getLogger(__name__)
 CACHE_TTL_SECONDS = 3600  # 1시간
 RATE_LIMIT_KEY_PREFIX = "external_recipe:rate_limit"
 CACHE_KEY_PREFIX = "external_recipe:cache"
+IMPORT_FETCH_CONCURRENCY = 8  # 일괄 import 시 동시 외부 API 요청 수
 
 ExternalSource = Literal["spoonacular", "themealdb", "foodsafetykorea", "mafra", "korean_seed"]
 
@@ -41,6 +45,7 @@ class ExternalRecipeService:
         self.recipe_repo = RecipeRepository(session)
         self.cached_repo = CachedRecipeRepository(session)
         self.translation = TranslationService(redis)
+        self.leaderboards = RecipeLeaderboards(redis)
 
     async def discover_recipes(
         self,
@@ -48,6 +53,7 @@ class ExternalRecipeService:
         category: str | None = None,
         cuisine: str | None = None,
         meal_type: str | None = None,
+        nutrition: NutritionRanges | None = None,
         number: int = 20,
     ) -> dict[str, Any]:
         """
@@ -59,12 +65,18 @@ class ExternalRecipeService:
             category: Filter by category
             cuisine: Filter by cuisine/area
             meal_type: Filter by meal type
+            nutrition: (min, max) ranges per nutrition column
             number: Number of recipes per source
 
         Returns:
             Combined results from all sources
         """
-        cache_key = f"{CACHE_KEY_PREFIX}:discover:{category}:{cuisine}:{meal_type}:{number}"
+        nutrition_key = ",".join(
+            f"{column}={low}-{high}" for column, (low, high) in sorted((nutrition or {}).items())
+        )
+        cache_key = (
+            f"{CACHE_KEY_PREFIX}:discover:{category}:{cuisine}:{meal_type}:{nutrition_key}:{number}"
+        )
         cached = await self._get_cached(cache_key)
         if cached:
             return cached
@@ -87,6 +99,7 @@ class ExternalRecipeService:
                 cuisine=cuisine,
                 source="themealdb",
                 meal_type=meal_type,
+                nutrition=nutrition,
                 limit=per_source,
             )
             cached_spoonacular = await self.cached_repo.get_discover(
@@ -94,6 +107,7 @@ class ExternalRecipeService:
                 cuisine=cuisine,
                 source="spoonacular",
                 meal_type=meal_type,
+                nutrition=nutrition,
                 limit=per_source,
             )
         except Exception:
@@ -106,36 +120,28 @@ class ExternalRecipeService:
 
         # Korean seed recipes (always available, no API needed)
         include_korean_seed = not cuisine or "korean" in cuisine.lower()
-        if seed_recipe_service.is_configured and include_korean_seed:
+        seed_service = get_seed_recipe_service()
+        if seed_service.is_configured and include_korean_seed:
             try:
-                if meal_type:
-                    # Filter ALL recipes by meal_type first, then sample
-                    all_seed = seed_recipe_service.get_all_recipes()
-                    if category:
-                        cat_lower = category.lower()
-                        all_seed = [
-                            r
-                            for r in all_seed
-                            if cat_lower in [c.lower() for c in r.get("categories", [])]
-                        ]
-                    seed_list = [r for r in all_seed if meal_type in r.get("meal_types", [])]
-                    import random as _random
-
-                    _random.shuffle(seed_list)
-                    results["korean_seed"] = seed_list[:per_source]
+                if meal_type or nutrition:
+                    results["korean_seed"] = seed_service.sample_recipes(
+                        per_source, category=category, meal_type=meal_type, nutrition=nutrition
+                    )
                 elif category:
-                    seed_results = seed_recipe_service.search_recipes(
+                    seed_results = seed_service.search_recipes(
                         category=category,
                         number=per_source,
                     )
                     results["korean_seed"] = seed_results.get("results", [])
                 else:
-                    results["korean_seed"] = seed_recipe_service.get_random_recipes(per_source)
+                    results["korean_seed"] = seed_service.get_random_recipes(per_source)
             except Exception as e:
                 logger.error(f"Korean seed discover error: {e}")
 
-        # Fall back to live API if cache is empty
-        if not results["spoonacular"] and spoonacular_adapter.is_configured:
+        # Fall back to live API if cache is empty. Live previews (random, search and
+        # TheMealDB results) carry no nutrition, so a nutrition bound would discard
+        # every one of them after a paid call: only the cached DB can serve it.
+        if not results["spoonacular"] and spoonacular_adapter.is_configured and not nutrition:
             try:
                 if cuisine:
                     spoon_results = await spoonacular_adapter.search_recipes(
@@ -158,21 +164,13 @@ class ExternalRecipeService:
 
                 # Filter live results by meal_type
                 if meal_type and results["spoonacular"]:
-                    filtered = []
-                    for r in results["spoonacular"]:
-                        mt = classify_meal_types(
-                            title=r.get("title", ""),
-                            categories=r.get("categories", []),
-                            tags=r.get("tags", []),
-                        )
-                        if meal_type in mt:
-                            r["meal_types"] = mt
-                            filtered.append(r)
-                    results["spoonacular"] = filtered
+                    results["spoonacular"] = self._filter_by_meal_type(
+                        results["spoonacular"], meal_type
+                    )
             except Exception as e:
                 logger.error(f"Spoonacular discover error: {e}")
 
-        if not results["themealdb"]:
+        if not results["themealdb"] and not nutrition:
             try:
                 if cuisine:
                     mealdb_results = await themealdb_adapter.search_by_area(cuisine.capitalize())
@@ -187,17 +185,9 @@ class ExternalRecipeService:
 
                 # Filter live results by meal_type
                 if meal_type and results["themealdb"]:
-                    filtered = []
-                    for r in results["themealdb"]:
-                        mt = classify_meal_types(
-                            title=r.get("title", ""),
-                            categories=r.get("categories", []),
-                            tags=r.get("tags", []),
-                        )
-                        if meal_type in mt:
-                            r["meal_types"] = mt
-                            filtered.append(r)
-                    results["themealdb"] = filtered
+                    results["themealdb"] = self._filter_by_meal_type(
+                        results["themealdb"], meal_type
+                    )
             except Exception as e:
                 logger.error(f"TheMealDB discover error: {e}")
 
@@ -272,9 +262,10 @@ class ExternalRecipeService:
 
             # Also include korean_seed from live source
             if source is None or source == "korean_seed":
-                if seed_recipe_service.is_configured:
+                seed_service = get_seed_recipe_service()
+                if seed_service.is_configured:
                     try:
-                        seed_results = seed_recipe_service.search_recipes(
+                        seed_results = seed_service.search_recipes(
                             query=query,
                             category=cuisine,
                             number=limit,
@@ -323,9 +314,10 @@ class ExternalRecipeService:
                 logger.error(f"TheMealDB search error: {e}")
 
         if source is None or source == "korean_seed":
-            if seed_recipe_service.is_configured:
+            seed_service = get_seed_recipe_service()
+            if seed_service.is_configured:
                 try:
-                    seed_results = seed_recipe_service.search_recipes(
+                    seed_results = seed_service.search_recipes(
                         query=query,
                         category=cuisine,
                         number=limit,
@@ -387,6 +379,18 @@ class ExternalRecipeService:
             if cached_recipe:
                 return self._cached_to_detail(cached_recipe)
 
+        return await self._fetch_external_recipe(source, external_id)
+
+    async def _fetch_external_recipe(
+        self,
+        source: ExternalSource,
+        external_id: str,
+    ) -> dict[str, Any] | None:
+        """
+        Get recipe details from the Redis cache or the live API, translated.
+
+        Does not use the database session, so several calls can run concurrently.
+        """
         # 2. Check Redis cache
         cache_key = f"{CACHE_KEY_PREFIX}:recipe:{source}:{external_id}"
         cached = await self._get_cached(cache_key)
@@ -405,7 +409,7 @@ class ExternalRecipeService:
         elif source == "mafra":
             result = await mafra_adapter.get_recipe_details(external_id)
         elif source == "korean_seed":
-            result = seed_recipe_service.get_recipe_by_id(external_id)
+            result = get_seed_recipe_service().get_recipe_by_id(external_id)
 
         if result:
             # Translate English sources to Korean
@@ -444,24 +448,105 @@ class ExternalRecipeService:
         if existing:
             return existing
 
-        # Try cached DB first to get recipe data without API call
-        recipe_data = None
-        cached_recipe = None
-        if source in ("spoonacular", "themealdb"):
+        # get_external_recipe checks the cached DB before any API call
+        recipe_data = await self.get_external_recipe(source, external_id)
+        if not recipe_data:
+            raise NotFoundError(f"External recipe not found: {source}/{external_id}")
+
+        recipe = await self.recipe_repo.create_with_details(
+            *self._build_import_records(user_id, source, external_id, recipe_data)
+        )
+        await self.leaderboards.record_imports([(source, external_id)])
+        return recipe
+
+    async def import_recipes(
+        self,
+        user_id: str,
+        refs: list[tuple[ExternalSource, str]],
+        skip_missing: bool = False,
+    ) -> dict[tuple[str, str], Any]:
+        """
+        Import many external recipes at once.
+
+        Existing imports and cached DB rows are each looked up with one query,
+        the remaining recipes are fetched concurrently, and everything new is
+        created with one INSERT per table.
+
+        Args:
+            user_id: User ID
+            refs: (source, external_id) pairs, duplicates allowed
+            skip_missing: Leave recipes that cannot be found or fetched out of
+                the result instead of raising
+
+        Returns:
+            Imported recipes keyed by (source, external_id)
+
+        Raises:
+            NotFoundError: Recipe not found (unless skip_missing)
+        """
+        unique_refs = list(dict.fromkeys(refs))
+        recipes: dict[tuple[str, str], Any] = {
+            (recipe.external_source, recipe.external_id): recipe
+            for recipe in await self.recipe_repo.get_by_external_sources(unique_refs, user_id)
+        }
+        missing = [ref for ref in unique_refs if ref not in recipes]
+        if not missing:
+            return recipes
+
+        recipe_data: dict[tuple[str, str], dict[str, Any]] = {}
+        cacheable = [ref for ref in missing if ref[0] in ("spoonacular", "themealdb")]
+        if cacheable:
             try:
-                cached_recipe = await self.cached_repo.get_by_source(source, external_id)
+                for cached in await self.cached_repo.get_by_sources(cacheable):
+                    ref = (cached.external_source, cached.external_id)
+                    recipe_data[ref] = self._cached_to_detail(cached)
             except Exception:
                 logger.debug("Cached recipes table not available, falling back to API")
 
-            if cached_recipe:
-                recipe_data = self._cached_to_detail(cached_recipe)
+        to_fetch = [ref for ref in missing if ref not in recipe_data]
+        semaphore = asyncio.Semaphore(IMPORT_FETCH_CONCURRENCY)
 
-        if not recipe_data:
-            recipe_data = await self.get_external_recipe(source, external_id)
+        async def fetch(ref: tuple[ExternalSource, str]) -> dict[str, Any] | None:
+            async with semaphore:
+                return await self._fetch_external_recipe(*ref)
 
-        if not recipe_data:
-            raise NotFoundError(f"External recipe not found: {source}/{external_id}")
+        fetched = await asyncio.gather(
+            *(fetch(ref) for ref in to_fetch), return_exceptions=skip_missing
+        )
+        for (source, external_id), data in zip(to_fetch, fetched):
+            if isinstance(data, BaseException):
+                # Only errors are failed fetches; cancellation must propagate
+                if not isinstance(data, Exception):
+                    raise data
+                logger.error(f"External recipe fetch error for {source}/{external_id}: {data}")
+                data = None
+            if not data:
+                if skip_missing:
+                    continue
+                raise NotFoundError(f"External recipe not found: {source}/{external_id}")
+            recipe_data[(source, external_id)] = data
+
+        to_create = [ref for ref in missing if ref in recipe_data]
+        created = await self.recipe_repo.create_many_with_details(
+            [
+                self._build_import_records(
+                    user_id, source, external_id, recipe_data[(source, external_id)]
+                )
+                for source, external_id in to_create
+            ]
+        )
+        recipes.update(zip(to_create, created))
+        await self.leaderboards.record_imports(to_create)
+        return recipes
 
+    @staticmethod
+    def _build_import_records(
+        user_id: str,
+        source: ExternalSource,
+        external_id: str,
+        recipe_data: dict[str, Any],
+    ) -> tuple[dict[str, Any], list[dict[str, Any]], list[dict[str, Any]]]:
+        """Build recipe, ingredient and instruction rows for an imported recipe."""
         ingredients = [
             IngredientCreate(
                 name=ing["name"] or "재료",
@@ -538,14 +623,7 @@ class ExternalRecipeService:
 
         ingredients_data = [ing.model_dump() for ing in recipe_create.ingredients]
         instructions_data = [inst.model_dump() for inst in recipe_create.instructions]
-
-        recipe = await self.recipe_repo.create_with_details(
-            recipe_dict,
-            ingredients_data,
-            instructions_data,
-        )
-
-        return recipe
+        return recipe_dict, ingredients_data, instructions_data
 
     async def get_available_sources(self) -> list[dict[str, Any]]:
         """Get list of available external sources."""
@@ -556,7 +634,7 @@ class ExternalRecipeService:
                 "id": "korean_seed",
                 "name": "한국 레시피",
                 "description": "한국 전통 및 가정식 레시피 (30종, API 키 불필요)",
-                "available": seed_recipe_service.is_configured,
+                "available": get_seed_recipe_service().is_configured,
             }
         )
 
@@ -649,6 +727,24 @@ class ExternalRecipeService:
             logger.debug("Cached recipes table not available")
             return {"total": 0}
 
+    @staticmethod
+    def _filter_by_meal_type(
+        recipes: list[dict[str, Any]],
+        meal_type: str,
+    ) -> list[dict[str, Any]]:
+        """Classify live API results in one batch and keep those matching meal_type."""
+        batch_meal_types = classify_meal_types_batch(
+            [r.get("title", "") for r in recipes],
+            categories=[r.get("categories", []) for r in recipes],
+            tags=[r.get("tags", []) for r in recipes],
+        )
+        filtered = []
+        for recipe, meal_types in zip(recipes, batch_meal_types):
+            if meal_type in meal_types:
+                recipe["meal_types"] = meal_types
+                filtered.append(recipe)
+        return filtered
+
     @staticmethod
     def _cached_to_preview(cached: Any) -> dict[str, Any]:
         """Convert CachedRecipe model to discovery/search preview dict."""
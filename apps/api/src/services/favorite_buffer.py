@@ -0,0 +1,231 @@
+"""Write-behind buffer for recipe favorites (opt-in with FAVORITES_WRITE_BEHIND).
+
+Favorite changes only touch Redis; a background flusher writes them to
+recipe_favorites in batches. Per user, Redis keeps:
+
+- favorites:state:{user_id}, recipe_id -> "1"/"0": the current state of every
+  recipe the user changed recently, expiring STATE_TTL_SECONDS after the last
+  change. Reads answer from it and fall back to the database.
+- favorites:dirty:{user_id}, recipe_id -> "1:<seq>"/"0:<seq>": changes not yet
+  in the database, tagged with a number from favorites:seq that is unique per
+  change. Never expires.
+- favorites:dirty_users: the users with a non-empty dirty hash.
+
+Each change is one Lua script, so rapid taps are serialized by Redis and each
+toggle sees the previous one.
+
+A flush takes a per-user advisory lock in its transaction, reads the dirty
+entries only then, applies them with idempotent statements (INSERT ... ON
+CONFLICT DO NOTHING, DELETE) and commits, and only then removes each entry
+that still holds the exact change it wrote. So:
+
+- Flushes of one user (the background flusher, flush_user on the request path,
+  other workers) are serialized by the lock, and each one reads Redis after the
+  previous one committed: database writes follow the order of the changes.
+- A change made while the flush ran has a new sequence number and keeps its
+  entry for the next pass, even if it restored the value that was written.
+- If the process dies before the commit, the transaction rolls back and the
+  entries are still dirty.
+- If it dies between the commit and the cleanup, the entries are written again
+  by the next flush, which changes nothing.
+- Shutdown drains the buffer before Redis is disconnected.
+- If Redis itself loses data, unflushed changes are lost: up to one second
+  with appendfsync everysec, everything since the last snapshot without AOF.
+  Flushed favorites are safe in PostgreSQL and the state hashes are only a
+  cache of them. Leave the mode off where a lost tap is unacceptable.
+
+favorites_count and other database reads lag by up to one flush interval; the
+service flushes a user's own pending changes before listing their favorites.
+"""
+
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.database import async_session_maker
+from src.core.redis import RedisClient
+from src.repositories.recipe_interaction import RecipeInteractionRepository
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "favorites"
+DIRTY_USERS_KEY = f"{KEY_PREFIX}:dirty_users"
+SEQ_KEY = f"{KEY_PREFIX}:seq"
+STATE_TTL_SECONDS = 86400
+FLUSH_BATCH_USERS = 200
+
+# KEYS: dirty hash, state hash, dirty users set, sequence counter
+# ARGV: recipe_id, "1"/"0" to set or "t" to toggle, database state ("1"/"0"/""),
+#       state TTL, user_id
+# Returns {before, after}, or nil when the state is unknown and no database state
+# was given
+_SET_SCRIPT = """
+local before = redis.call('HGET', KEYS[1], ARGV[1])
+if before then
+    before = string.sub(before, 1, 1)
+else
+    before = redis.call('HGET', KEYS[2], ARGV[1])
+end
+if not before then
+    if ARGV[3] == '' then
+        return nil
+    end
+    before = ARGV[3]
+end
+local after = ARGV[2]
+if after == 't' then
+    after = before == '1' and '0' or '1'
+end
+redis.call('HSET', KEYS[2], ARGV[1], after)
+redis.call('EXPIRE', KEYS[2], ARGV[4])
+if after ~= before then
+    redis.call('HSET', KEYS[1], ARGV[1], after .. ':' .. redis.call('INCR', KEYS[4]))
+    redis.call('SADD', KEYS[3], ARGV[5])
+end
+return {before, after}
+"""
+
+# KEYS: dirty hash, dirty users set
+# ARGV: user_id, then recipe_id/dirty value pairs that were written
+_CLEAR_SCRIPT = """
+for i = 2, #ARGV, 2 do
+    if redis.call('HGET', KEYS[1], ARGV[i]) == ARGV[i + 1] then
+        redis.call('HDEL', KEYS[1], ARGV[i])
+    end
+end
+if redis.call('HLEN', KEYS[1]) == 0 then
+    redis.call('SREM', KEYS[2], ARGV[1])
+end
+return 0
+"""
+
+
+def _dirty_key(user_id: str) -> str:
+    return f"{KEY_PREFIX}:dirty:{user_id}"
+
+
+def _state_key(user_id: str) -> str:
+    return f"{KEY_PREFIX}:state:{user_id}"
+
+
+def _flag(value: bool) -> str:
+    return "1" if value else "0"
+
+
+class FavoriteWriteBuffer:
+    def __init__(
+        self,
+        redis: RedisClient,
+        session_factory: async_sessionmaker[AsyncSession] = async_session_maker,
+    ):
+        self.redis = redis
+        self.session_factory = session_factory
+
+    async def get(self, user_id: str, recipe_id: str) -> bool | None:
+        """The buffered state, or None when Redis does not know it."""
+        pipe = self.redis.pipeline()
+        pipe.hget(_dirty_key(user_id), recipe_id)
+        pipe.hget(_state_key(user_id), recipe_id)
+        dirty, state = await pipe.execute()
+        value = dirty or state
+        return None if value is None else value.startswith("1")
+
+    async def set(
+        self,
+        user_id: str,
+        recipe_id: str,
+        value: bool | None,
+        db_state: bool | None = None,
+    ) -> tuple[bool, bool] | None:
+        """
+        Favorite (True), unfavorite (False) or toggle (None); returns (before, after).
+
+        Returns None when Redis does not know the current state and db_state was
+        not given: read it from the database and call again.
+        """
+        result = await self.redis.eval(
+            _SET_SCRIPT,
+            [_dirty_key(user_id), _state_key(user_id), DIRTY_USERS_KEY, SEQ_KEY],
+            [
+                recipe_id,
+                "t" if value is None else _flag(value),
+                "" if db_state is None else _flag(db_state),
+                STATE_TTL_SECONDS,
+                user_id,
+            ],
+        )
+        if result is None:
+            return None
+        before, after = result
+        return before == "1", after == "1"
+
+    async def flush_user(self, user_id: str) -> None:
+        """Write one user's pending changes, if any, so database reads include them."""
+        if await self.redis.sismember(DIRTY_USERS_KEY, user_id):
+            await self.flush([user_id])
+
+    async def flush(self, user_ids: list[str] | None = None) -> int:
+        """
+        Write pending changes of the given users (default: a batch of dirty users)
+        in one transaction. Returns the number of users processed.
+        """
+        if user_ids is None:
+            user_ids = await self.redis.srandmember(DIRTY_USERS_KEY, FLUSH_BATCH_USERS)
+        if not user_ids:
+            return 0
+
+        async with self.session_factory() as session:
+            repo = RecipeInteractionRepository(session)
+            # Read only once no other flush of these users is between its read
+            # and its commit, so a stale read can never be committed last
+            await repo.lock_favorite_flush(user_ids)
+
+            pipe = self.redis.pipeline()
+            for user_id in user_ids:
+                pipe.hgetall(_dirty_key(user_id))
+            pending: list[dict[str, str]] = await pipe.execute()
+
+            added: list[tuple[str, str]] = []
+            removed: list[tuple[str, str]] = []
+            for user_id, changes in zip(user_ids, pending):
+                for recipe_id, value in changes.items():
+                    (added if value.startswith("1") else removed).append((user_id, recipe_id))
+
+            if added or removed:
+                await repo.apply_favorite_changes(added, removed)
+            # Also releases the locks when there was nothing to write
+            await session.commit()
+
+        # Only after the commit: anything still dirty is written again next time
+        pipe = self.redis.pipeline()
+        for user_id, changes in zip(user_ids, pending):
+            args = [user_id]
+            for recipe_id, value in changes.items():
+                args.extend((recipe_id, value))
+            pipe.eval(_CLEAR_SCRIPT, 2, _dirty_key(user_id), DIRTY_USERS_KEY, *args)
+        await pipe.execute()
+        return len(user_ids)
+
+    async def drain(self) -> None:
+        """Flush until a pass finds fewer dirty users than a full batch."""
+        while await self.flush() >= FLUSH_BATCH_USERS:
+            pass
+
+
+async def run_favorite_flusher(buffer: FavoriteWriteBuffer, interval: float) -> None:
+    """Flush every interval seconds until cancelled, then drain once more."""
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await buffer.drain()
+            except Exception as e:
+                # Entries stay dirty and are retried on the next pass
+                logger.error(f"Favorite flush failed: {e}")
+    except asyncio.CancelledError:
+        try:
+            await buffer.drain()
+        except Exception as e:
+            logger.error(f"Final favorite flush failed: {e}")
+        raise
@@ -0,0 +1,240 @@
+"""Recipe leaderboards kept incrementally in Redis sorted sets.
+
+Boards:
+
+- trending: recipe IDs by time-decayed activity (favorites and new ratings).
+- top_rated: recipe IDs by damped average rating, which pulls recipes with few
+  ratings towards RATING_PRIOR_MEAN so a single 5-star review does not top it.
+- imports: "source:external_id" by time-decayed import count. Every import
+  creates the importing user's own copy, so imports are counted per external
+  recipe rather than per recipe row.
+
+Decayed boards use forward decay: an event at time t adds
+weight * 2^((t - epoch) / half_life), with the epoch stored next to the board.
+Older events are worth exponentially less relative to newer ones without any
+member being rewritten, so an event is one ZINCRBY and reading the top N is a
+ZREVRANGE. Scores grow with time, so compaction periodically rebases a board to
+a new epoch, drops members whose decayed score fell below MIN_SCORE and trims
+every board to MAX_MEMBERS.
+
+Removing a favorite or rating subtracts its weight decayed to its created_at,
+which is exactly what adding it contributed. Boards are updated in the write
+paths, before the request's transaction commits, so a rolled-back request or
+lost Redis data leaves a board off until the rebuild job
+(src.scripts.rebuild_leaderboards) recomputes every board from the database.
+Redis errors are logged and never fail a write.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any, Literal
+
+from src.core.redis import RedisClient
+
+logger = logging.getLogger(__name__)
+
+LeaderboardName = Literal["trending", "top_rated", "imports"]
+RecipeLeaderboardName = Literal["trending", "top_rated"]
+
+KEY_PREFIX = "leaderboard"
+HALF_LIFE_SECONDS = 3 * 86400
+MAX_MEMBERS = 10_000
+MIN_SCORE = 0.01
+# Older events have decayed below MIN_SCORE (2^-10 of a weight of at most 3)
+REBUILD_WINDOW_SECONDS = 30 * 86400
+
+FAVORITE_WEIGHT = 3.0
+RATING_WEIGHT = 2.0
+IMPORT_WEIGHT = 1.0
+RATING_PRIOR_MEAN = 3.0
+RATING_PRIOR_WEIGHT = 5
+
+DECAYED_BOARDS: tuple[LeaderboardName, ...] = ("trending", "imports")
+BOARDS: tuple[LeaderboardName, ...] = ("trending", "top_rated", "imports")
+
+# KEYS: board, epoch
+# ARGV: event time, half-life, then member/weight pairs
+_INCR_SCRIPT = """
+local epoch = tonumber(redis.call('GET', KEYS[2]))
+if not epoch then
+    epoch = tonumber(ARGV[1])
+    redis.call('SET', KEYS[2], ARGV[1])
+end
+local factor = 2 ^ ((ARGV[1] - epoch) / ARGV[2])
+for i = 3, #ARGV, 2 do
+    redis.call('ZINCRBY', KEYS[1], ARGV[i + 1] * factor, ARGV[i])
+end
+return 0
+"""
+
+# KEYS: board, epoch
+# ARGV: now, half-life ("" for a board without decay), min score, max members
+# Returns the board size after compaction
+_COMPACT_SCRIPT = """
+redis.call('ZREMRANGEBYRANK', KEYS[1], 0, -ARGV[4] - 1)
+if ARGV[2] ~= '' then
+    local epoch = tonumber(redis.call('GET', KEYS[2]))
+    if epoch then
+        local factor = 2 ^ ((epoch - ARGV[1]) / ARGV[2])
+        local members = redis.call('ZRANGE', KEYS[1], 0, -1, 'WITHSCORES')
+        for i = 1, #members, 2 do
+            redis.call('ZADD', KEYS[1], members[i + 1] * factor, members[i])
+        end
+    end
+    redis.call('SET', KEYS[2], ARGV[1])
+end
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', '(' .. ARGV[3])
+return redis.call('ZCARD', KEYS[1])
+"""
+
+
+def board_key(board: LeaderboardName) -> str:
+    return f"{KEY_PREFIX}:{board}"
+
+
+def epoch_key(board: LeaderboardName) -> str:
+    return f"{KEY_PREFIX}:{board}:epoch"
+
+
+def import_member(source: str, external_id: str) -> str:
+    return f"{source}:{external_id}"
+
+
+def split_import_member(member: str) -> tuple[str, str]:
+    source, external_id = member.split(":", 1)
+    return source, external_id
+
+
+def damped_rating(rating_sum: float, rating_count: int) -> float:
+    return (rating_sum + RATING_PRIOR_MEAN * RATING_PRIOR_WEIGHT) / (
+        rating_count + RATING_PRIOR_WEIGHT
+    )
+
+
+class RecipeLeaderboards:
+    def __init__(self, redis: RedisClient):
+        self.redis = redis
+
+    async def _add(
+        self, board: LeaderboardName, weights: dict[str, float], at: datetime | None = None
+    ) -> None:
+        """Add weights decayed to the time of the event (default: now)."""
+        if not weights:
+            return
+        args: list[str | float] = [at.timestamp() if at else time.time(), HALF_LIFE_SECONDS]
+        for member, weight in weights.items():
+            args.extend((member, weight))
+        try:
+            await self.redis.eval(_INCR_SCRIPT, [board_key(board), epoch_key(board)], args)
+        except Exception as e:
+            logger.warning(f"Leaderboard {board} update failed: {e}")
+
+    async def record_favorite(
+        self, recipe_id: str, favorited: bool, created_at: datetime | None = None
+    ) -> None:
+        """
+        Count a new favorite, or take back a removed one given its created_at
+        (default: now).
+        """
+        weight = FAVORITE_WEIGHT if favorited else -FAVORITE_WEIGHT
+        await self._add("trending", {recipe_id: weight}, created_at)
+
+    async def record_rating(
+        self,
+        recipe_id: str,
+        stats: dict[str, Any] | None,
+        trending_weight: float = 0.0,
+        created_at: datetime | None = None,
+    ) -> None:
+        """
+        Refresh a recipe's top_rated score from its stats (get_recipe_stats) and
+        add trending_weight to its trending score, decayed to the rating's
+        created_at (default: now).
+        """
+        await self._add(
+            "trending", {recipe_id: trending_weight} if trending_weight else {}, created_at
+        )
+        try:
+            if stats and stats["total_ratings"]:
+                rating_sum = stats["average_rating"] * stats["total_ratings"]
+                score = damped_rating(rating_sum, stats["total_ratings"])
+                await self.redis.zadd(board_key("top_rated"), {recipe_id: score})
+            else:
+                await self.redis.zrem(board_key("top_rated"), recipe_id)
+        except Exception as e:
+            logger.warning(f"Leaderboard top_rated update failed: {e}")
+
+    async def record_imports(self, refs: Sequence[tuple[str, str]]) -> None:
+        weights: dict[str, float] = {}
+        for source, external_id in refs:
+            member = import_member(source, external_id)
+            weights[member] = weights.get(member, 0.0) + IMPORT_WEIGHT
+        await self._add("imports", weights)
+
+    async def top(self, board: LeaderboardName, limit: int) -> list[tuple[str, float]]:
+        """
+        The highest-scoring members, best first, in O(log n + limit).
+
+        Decayed scores are returned as of now, so they are comparable across
+        compactions.
+        """
+        pipe = self.redis.pipeline()
+        pipe.zrevrange(board_key(board), 0, limit - 1, withscores=True)
+        pipe.get(epoch_key(board))
+        members, epoch = await pipe.execute()
+        factor = 1.0
+        if board in DECAYED_BOARDS and epoch is not None:
+            factor = 2 ** ((float(epoch) - time.time()) / HALF_LIFE_SECONDS)
+        return [(member, float(score) * factor) for member, score in members]
+
+    async def remove(self, board: LeaderboardName, *members: str) -> None:
+        if members:
+            await self.redis.zrem(board_key(board), *members)
+
+    async def compact(self) -> dict[str, int]:
+        """Rebase decayed boards to now, drop members below MIN_SCORE and trim; returns sizes."""
+        now = time.time()
+        sizes: dict[str, int] = {}
+        for board in BOARDS:
+            sizes[board] = await self.redis.eval(
+                _COMPACT_SCRIPT,
+                [board_key(board), epoch_key(board)],
+                [
+                    now,
+                    HALF_LIFE_SECONDS if board in DECAYED_BOARDS else "",
+                    MIN_SCORE,
+                    MAX_MEMBERS,
+                ],
+            )
+        return sizes
+
+    async def replace(self, board: LeaderboardName, scores: dict[str, float], now: float) -> None:
+        """
+        Swap a board for freshly computed scores (decayed to now) in one step,
+        so readers never see it half-built.
+        """
+        staging = f"{board_key(board)}:rebuild"
+        pipe = self.redis.pipeline()
+        pipe.delete(staging)
+        if scores:
+            pipe.zadd(staging, scores)
+            pipe.rename(staging, board_key(board))
+        else:
+            pipe.delete(board_key(board))
+        if board in DECAYED_BOARDS:
+            pipe.set(epoch_key(board), now)
+        await pipe.execute()
+
+
+async def run_leaderboard_compactor(leaderboards: RecipeLeaderboards, interval: float) -> None:
+    """Compact every interval seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            sizes = await leaderboards.compact()
+            logger.info(f"Leaderboards compacted: {sizes}")
+        except Exception as e:
+            logger.error(f"Leaderboard compaction failed: {e}")
@@ -2,32 +2,77 @@ from datetime import date, timedelta
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.exceptions import MealPlanNotFoundError, MealSlotConflictError, NotFoundError
+from src.core.exceptions import (
+    BadRequestError,
+    MealPlanNotFoundError,
+    MealPlanTemplateConflictError,
+    MealSlotConflictError,
+    NotFoundError,
+)
 from src.core.redis import RedisClient
 from src.models.meal_plan import MealPlan
+from src.models.meal_plan_template import MealPlanTemplate
 from src.models.meal_slot import MealSlot
 from src.repositories.meal_plan import MealPlanRepository
+from src.repositories.meal_plan_template import MealPlanTemplateRepository
 from src.repositories.recipe import RecipeRepository
 from src.schemas.common import PaginationMeta
 from src.schemas.meal_plan import (
     ExternalMealSlotCreate,
+    MealPlanCopyRequest,
     MealPlanCreate,
+    MealPlanTemplateApply,
+    MealPlanTemplateCreate,
     MealSlotCreate,
     MealSlotUpdate,
     QuickPlanCreate,
+    QuickPlanSlotInput,
 )
 from src.services.external_recipe import ExternalRecipeService
+from src.services.shopping_list import ShoppingListService
 
 
 class MealPlanService:
     def __init__(self, session: AsyncSession):
         self.session = session
         self.meal_plan_repo = MealPlanRepository(session)
+        self.template_repo = MealPlanTemplateRepository(session)
         self.recipe_repo = RecipeRepository(session)
+        self.shopping_list_service = ShoppingListService(session)
 
     def _normalize_week_start(self, d: date) -> date:
         return d - timedelta(days=d.weekday())
 
+    async def _get_or_create_plan_id(
+        self,
+        user_id: str,
+        week_start: date,
+        notes: str | None,
+    ) -> str:
+        existing = await self.meal_plan_repo.get_version_by_user_and_week(user_id, week_start)
+        if existing:
+            return existing.id
+        meal_plan = await self.meal_plan_repo.create(
+            {
+                "user_id": user_id,
+                "week_start_date": week_start,
+                "notes": notes,
+            }
+        )
+        return meal_plan.id
+
+    async def _get_owned_plan(self, meal_plan_id: str, user_id: str) -> MealPlan:
+        """The plan row without its slots, for checks that only need its columns."""
+        meal_plan = await self.meal_plan_repo.get_by_id(meal_plan_id)
+        if not meal_plan or meal_plan.user_id != user_id:
+            raise MealPlanNotFoundError(meal_plan_id)
+        return meal_plan
+
+    async def _slots_written(self, meal_plan_id: str, slot_ids: list[str]) -> None:
+        if slot_ids:
+            await self.shopping_list_service.sync_meal_slots(meal_plan_id, slot_ids)
+            await self.meal_plan_repo.bump_version(meal_plan_id)
+
     async def create_meal_plan(
         self,
         user_id: str,
@@ -69,6 +114,26 @@ class MealPlanService:
         week_start = self._normalize_week_start(week_start_date)
         return await self.meal_plan_repo.get_by_user_and_week(user_id, week_start)
 
+    async def get_meal_plan_version(
+        self,
+        meal_plan_id: str,
+        user_id: str,
+    ) -> int:
+        row = await self.meal_plan_repo.get_version(meal_plan_id)
+        if not row or row.user_id != user_id:
+            raise MealPlanNotFoundError(meal_plan_id)
+        return row.version
+
+    async def get_meal_plan_version_by_week(
+        self,
+        user_id: str,
+        week_start_date: date,
+    ) -> tuple[str, int] | None:
+        """(meal_plan_id, version) for the week, or None if there is no plan."""
+        week_start = self._normalize_week_start(week_start_date)
+        row = await self.meal_plan_repo.get_version_by_user_and_week(user_id, week_start)
+        return (row.id, row.version) if row else None
+
     async def get_user_meal_plans(
         self,
         user_id: str,
@@ -100,14 +165,6 @@ class MealPlanService:
         if not recipe or recipe.user_id != user_id:
             raise NotFoundError("Recipe", data.recipe_id)
 
-        conflict = await self.meal_plan_repo.get_slot_conflict(
-            meal_plan_id,
-            data.date,
-            data.meal_type,
-        )
-        if conflict:
-            raise MealSlotConflictError(str(data.date), data.meal_type)
-
         slot = await self.meal_plan_repo.add_slot(
             meal_plan_id,
             {
@@ -118,6 +175,10 @@ class MealPlanService:
                 "notes": data.notes,
             },
         )
+        if not slot:
+            raise MealSlotConflictError(str(data.date), data.meal_type)
+        await self.shopping_list_service.sync_meal_slots(meal_plan_id, [slot.id])
+        await self.meal_plan_repo.bump_version(meal_plan_id)
 
         return await self.meal_plan_repo.get_slot_by_id(slot.id)  # type: ignore
 
@@ -139,20 +200,15 @@ class MealPlanService:
             if not recipe or recipe.user_id != user_id:
                 raise NotFoundError("Recipe", data.recipe_id)
 
-        if data.date or data.meal_type:
-            check_date = data.date or slot.date
-            check_type = data.meal_type or slot.meal_type
-            conflict = await self.meal_plan_repo.get_slot_conflict(
-                meal_plan_id,
-                check_date,
-                check_type,
-                exclude_slot_id=slot_id,
-            )
-            if conflict:
-                raise MealSlotConflictError(str(check_date), check_type)
-
+        target_date = data.date or slot.date
+        target_type = data.meal_type or slot.meal_type
         update_data = data.model_dump(exclude_unset=True)
-        slot = await self.meal_plan_repo.update_slot(slot, update_data)
+        updated = await self.meal_plan_repo.update_slot(slot, update_data)
+        if not updated:
+            raise MealSlotConflictError(str(target_date), target_type)
+        slot = updated
+        await self.shopping_list_service.sync_meal_slots(meal_plan_id, [slot.id])
+        await self.meal_plan_repo.bump_version(meal_plan_id)
 
         return await self.meal_plan_repo.get_slot_by_id(slot.id)  # type: ignore
 
@@ -168,7 +224,9 @@ class MealPlanService:
         if not slot or slot.meal_plan_id != meal_plan_id:
             raise NotFoundError("MealSlot", slot_id)
 
+        await self.shopping_list_service.sync_meal_slots(meal_plan_id, [slot.id], removed=True)
         await self.meal_plan_repo.delete_slot(slot)
+        await self.meal_plan_repo.bump_version(meal_plan_id)
 
     async def delete_meal_plan(
         self,
@@ -193,20 +251,19 @@ class MealPlanService:
         """
         await self.get_meal_plan(meal_plan_id, user_id)
 
-        # 외부 레시피 import (이미 있으면 기존 것 사용)
-        external_service = ExternalRecipeService(self.session, redis)
-        recipe = await external_service.import_recipe(user_id, data.source, data.external_id)
-
-        # 충돌 체크
-        conflict = await self.meal_plan_repo.get_slot_conflict(
+        # 충돌 체크 - 이미 찬 슬롯이면 import 전에 실패
+        occupied = await self.meal_plan_repo.get_occupied_slots(
             meal_plan_id,
-            data.date,
-            data.meal_type,
+            [(data.date, data.meal_type)],
         )
-        if conflict:
+        if occupied:
             raise MealSlotConflictError(str(data.date), data.meal_type)
 
-        # 슬롯 추가
+        # 외부 레시피 import (이미 있으면 기존 것 사용)
+        external_service = ExternalRecipeService(self.session, redis)
+        recipe = await external_service.import_recipe(user_id, data.source, data.external_id)
+
+        # 슬롯 추가 - 그 사이 다른 요청이 채웠다면 ON CONFLICT로 감지
         slot = await self.meal_plan_repo.add_slot(
             meal_plan_id,
             {
@@ -217,6 +274,10 @@ class MealPlanService:
                 "notes": data.notes,
             },
         )
+        if not slot:
+            raise MealSlotConflictError(str(data.date), data.meal_type)
+        await self.shopping_list_service.sync_meal_slots(meal_plan_id, [slot.id])
+        await self.meal_plan_repo.bump_version(meal_plan_id)
 
         return await self.meal_plan_repo.get_slot_by_id(slot.id)  # type: ignore
 
@@ -232,49 +293,133 @@ class MealPlanService:
         week_start = self._normalize_week_start(data.week_start_date)
 
         # 식사계획 생성 또는 기존 것 가져오기
-        existing = await self.meal_plan_repo.get_by_user_and_week(user_id, week_start)
-        if existing:
-            meal_plan_id = existing.id
-        else:
-            meal_plan = await self.meal_plan_repo.create(
-                {
-                    "user_id": user_id,
-                    "week_start_date": week_start,
-                    "notes": data.notes,
-                }
-            )
-            meal_plan_id = meal_plan.id
+        meal_plan_id = await self._get_or_create_plan_id(user_id, week_start, data.notes)
+
+        # 충돌 체크를 import 전에 한 번에 - 이미 찬 슬롯과 요청 내 중복은 건너뜀
+        requested: dict[tuple[date, str], QuickPlanSlotInput] = {}
+        for slot_input in data.slots:
+            requested.setdefault((slot_input.date, slot_input.meal_type), slot_input)
+        occupied = await self.meal_plan_repo.get_occupied_slots(meal_plan_id, list(requested))
+        slot_inputs = [s for key, s in requested.items() if key not in occupied]
 
+        # 외부 레시피 일괄 import (동시 조회, 테이블별 INSERT 한 번)
         external_service = ExternalRecipeService(self.session, redis)
+        recipes = await external_service.import_recipes(
+            user_id,
+            [(s.source, s.external_id) for s in slot_inputs],
+        )
 
-        # 각 슬롯 처리
-        for slot_input in data.slots:
-            # 외부 레시피 import
-            recipe = await external_service.import_recipe(
-                user_id,
-                slot_input.source,
-                slot_input.external_id,
-            )
-
-            # 충돌 체크 - 충돌 시 해당 슬롯은 건너뜀
-            conflict = await self.meal_plan_repo.get_slot_conflict(
-                meal_plan_id,
-                slot_input.date,
-                slot_input.meal_type,
-            )
-            if conflict:
-                continue
-
-            # 슬롯 추가
-            await self.meal_plan_repo.add_slot(
-                meal_plan_id,
+        # 슬롯 일괄 추가 - 그 사이 채워진 슬롯은 ON CONFLICT DO NOTHING으로 건너뜀
+        slots = await self.meal_plan_repo.add_slots(
+            meal_plan_id,
+            [
                 {
-                    "recipe_id": recipe.id,
-                    "date": slot_input.date,
-                    "meal_type": slot_input.meal_type,
-                    "servings": slot_input.servings or recipe.servings,
+                    "recipe_id": recipes[(s.source, s.external_id)].id,
+                    "date": s.date,
+                    "meal_type": s.meal_type,
+                    "servings": s.servings or recipes[(s.source, s.external_id)].servings,
                     "notes": None,
-                },
-            )
+                }
+                for s in slot_inputs
+            ],
+        )
+        await self._slots_written(meal_plan_id, [slot.id for slot in slots])
+
+        return await self.meal_plan_repo.get_by_id_with_slots(meal_plan_id)  # type: ignore
+
+    async def copy_meal_plan(
+        self,
+        meal_plan_id: str,
+        user_id: str,
+        data: MealPlanCopyRequest,
+    ) -> MealPlan:
+        """
+        식사계획의 슬롯을 다른 주로 복사합니다.
+
+        대상 주의 식사계획이 없으면 만들고, 슬롯은 날짜를 옮겨
+        INSERT ... SELECT 한 번으로 복사합니다.
+        """
+        source = await self._get_owned_plan(meal_plan_id, user_id)
+        target_week = self._normalize_week_start(data.target_week_start_date)
+        if target_week == source.week_start_date:
+            raise BadRequestError("Cannot copy a meal plan onto its own week")
+
+        target_id = await self._get_or_create_plan_id(user_id, target_week, data.notes)
+        slot_ids = await self.meal_plan_repo.copy_slots(
+            meal_plan_id,
+            target_id,
+            (target_week - source.week_start_date).days,
+            replace=data.on_conflict == "replace",
+        )
+        await self._slots_written(target_id, slot_ids)
+
+        return await self.meal_plan_repo.get_by_id_with_slots(target_id)  # type: ignore
+
+    async def save_template(
+        self,
+        user_id: str,
+        data: MealPlanTemplateCreate,
+    ) -> MealPlanTemplate:
+        """식사계획의 슬롯을 요일 기준으로 이름 붙인 템플릿에 저장합니다."""
+        meal_plan = await self._get_owned_plan(data.meal_plan_id, user_id)
+
+        template = await self.template_repo.create_template(
+            {
+                "user_id": user_id,
+                "name": data.name,
+                "notes": data.notes,
+            }
+        )
+        if not template:
+            raise MealPlanTemplateConflictError(data.name)
+        await self.template_repo.add_slots_from_meal_plan(
+            template.id, meal_plan.id, meal_plan.week_start_date
+        )
+
+        return await self.template_repo.get_by_id_with_slots(template.id)  # type: ignore
+
+    async def get_templates(self, user_id: str) -> list[MealPlanTemplate]:
+        return await self.template_repo.get_user_templates(user_id)
+
+    async def get_template(
+        self,
+        template_id: str,
+        user_id: str,
+    ) -> MealPlanTemplate:
+        template = await self.template_repo.get_by_id_with_slots(template_id)
+        if not template or template.user_id != user_id:
+            raise NotFoundError("MealPlanTemplate", template_id)
+        return template
+
+    async def apply_template(
+        self,
+        template_id: str,
+        user_id: str,
+        data: MealPlanTemplateApply,
+    ) -> MealPlan:
+        """템플릿을 특정 주의 식사계획에 INSERT ... SELECT 한 번으로 적용합니다."""
+        template = await self.template_repo.get_by_id(template_id)
+        if not template or template.user_id != user_id:
+            raise NotFoundError("MealPlanTemplate", template_id)
+
+        week_start = self._normalize_week_start(data.week_start_date)
+        meal_plan_id = await self._get_or_create_plan_id(user_id, week_start, data.notes)
+        slot_ids = await self.meal_plan_repo.apply_template_slots(
+            template_id,
+            meal_plan_id,
+            week_start,
+            replace=data.on_conflict == "replace",
+        )
+        await self._slots_written(meal_plan_id, slot_ids)
 
         return await self.meal_plan_repo.get_by_id_with_slots(meal_plan_id)  # type: ignore
+
+    async def delete_template(
+        self,
+        template_id: str,
+        user_id: str,
+    ) -> None:
+        template = await self.template_repo.get_by_id(template_id)
+        if not template or template.user_id != user_id:
+            raise NotFoundError("MealPlanTemplate", template_id)
+        await self.template_repo.delete(template)
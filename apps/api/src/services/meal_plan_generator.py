@@ -0,0 +1,440 @@
+"""Automatic weekly meal plan generation.
+
+Candidates come from cached external recipes, the Korean seed recipes and the
+user's own recipes. External candidates are indexed per meal type once and
+reused across requests; the user's recipes are added per request. A greedy pass
+fills each slot with the candidate closest to the slot's share of the daily
+targets, then a time-boxed local search swaps candidates while that lowers the
+total deviation from the targets. Index building and solving are pure CPU work
+and run in a worker thread, so they do not stall other requests on the event
+loop.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.redis import RedisClient
+from src.models.meal_plan import MealPlan
+from src.repositories.cached_recipe import CachedRecipeRepository
+from src.repositories.meal_plan import MealPlanRepository
+from src.repositories.recipe import RecipeRepository
+from src.schemas.meal_plan import GenerateMealPlanRequest
+from src.services.external_recipe import ExternalRecipeService
+from src.services.meal_type_tagger import classify_meal_types_batch
+from src.services.seed_recipe import get_seed_recipe_service
+from src.services.shopping_list import ShoppingListService
+
+logger = logging.getLogger(__name__)
+
+OWN_SOURCE = "own"
+MEAL_TYPES = ("breakfast", "lunch", "dinner", "snack")
+# Share of the daily targets each meal is expected to cover, before
+# normalizing over the meal types actually requested
+MEAL_SHARES = {"breakfast": 0.25, "lunch": 0.35, "dinner": 0.35, "snack": 0.05}
+NUTRIENTS = ("calories", "protein_grams", "carbs_grams", "fat_grams")
+
+EXTERNAL_INDEX_TTL_SECONDS = 600
+GREEDY_SAMPLE_SIZE = 64  # candidates scored per slot in the greedy pass
+TIME_BUDGET_SECONDS = 0.08
+MAX_STALE_MOVES = 2000  # local search stops early after this many rejected moves
+UNKNOWN_NUTRITION_PENALTY = 0.05
+VARIETY_NOISE = 0.02
+
+
+@dataclass(frozen=True, slots=True)
+class Candidate:
+    """A recipe the generator can place in a slot."""
+
+    source: str  # OWN_SOURCE or an external source
+    ref: str  # recipe id for own recipes, external_id otherwise
+    title: str
+    meal_types: frozenset[str]
+    total_minutes: int | None
+    servings: int
+    # Per serving, in NUTRIENTS order; None where unknown
+    nutrition: tuple[float | None, ...]
+
+
+@dataclass
+class CandidateIndex:
+    """Candidates grouped per meal type, built once and shared read-only."""
+
+    candidates: list[Candidate] = field(default_factory=list)
+    by_meal_type: dict[str, list[Candidate]] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, candidates: list[Candidate]) -> "CandidateIndex":
+        by_meal_type: dict[str, list[Candidate]] = defaultdict(list)
+        for candidate in candidates:
+            for meal_type in candidate.meal_types:
+                by_meal_type[meal_type].append(candidate)
+        return cls(candidates=candidates, by_meal_type=dict(by_meal_type))
+
+    def merged(self, extra: "CandidateIndex") -> "CandidateIndex":
+        by_meal_type = {
+            meal_type: self.by_meal_type.get(meal_type, []) + extra.by_meal_type.get(meal_type, [])
+            for meal_type in set(self.by_meal_type) | set(extra.by_meal_type)
+        }
+        return CandidateIndex(self.candidates + extra.candidates, by_meal_type)
+
+
+def _float_or_none(value: Any) -> float | None:
+    return float(value) if value is not None else None
+
+
+def _total_minutes(prep: int | None, cook: int | None) -> int | None:
+    if prep is None and cook is None:
+        return None
+    return (prep or 0) + (cook or 0)
+
+
+def build_candidates(
+    source: str | None,
+    rows: list[Any],
+    meal_types: list[list[str] | None] | None = None,
+) -> list[Candidate]:
+    """
+    Turn recipe rows or dicts into candidates.
+
+    Args:
+        source: Source for every row, or None to read external_source from each row
+        rows: Objects or dicts with id/external_id, title, timing and nutrition fields
+        meal_types: Meal types per row; rows without any are classified here
+    """
+
+    def get(row: Any, key: str) -> Any:
+        return row.get(key) if isinstance(row, dict) else getattr(row, key, None)
+
+    meal_types = meal_types or [get(row, "meal_types") for row in rows]
+    unclassified = [i for i, types in enumerate(meal_types) if not types]
+    if unclassified:
+        classified = classify_meal_types_batch(
+            [get(rows[i], "title") or "" for i in unclassified],
+            categories=[get(rows[i], "categories") for i in unclassified],
+            tags=[get(rows[i], "tags") for i in unclassified],
+        )
+        meal_types = list(meal_types)
+        for i, types in zip(unclassified, classified):
+            meal_types[i] = types
+
+    candidates = []
+    for row, types in zip(rows, meal_types):
+        row_source = source or get(row, "external_source")
+        ref = get(row, "id") if row_source == OWN_SOURCE else get(row, "external_id")
+        candidates.append(
+            Candidate(
+                source=row_source,
+                ref=str(ref),
+                title=get(row, "title") or "",
+                meal_types=frozenset(types or ()),
+                total_minutes=_total_minutes(
+                    get(row, "prep_time_minutes"), get(row, "cook_time_minutes")
+                ),
+                servings=get(row, "servings") or 4,
+                nutrition=tuple(_float_or_none(get(row, key)) for key in NUTRIENTS),
+            )
+        )
+    return candidates
+
+
+class PlanSolver:
+    """
+    Constraint-aware greedy + local search over (day, meal_type) slots.
+
+    Hard constraints: the slot's meal type, max_minutes and the no-repeat
+    window (a recipe is not used twice within no_repeat_days days). Soft
+    constraints: each day's nutrition totals should match the targets.
+    """
+
+    def __init__(
+        self,
+        index: CandidateIndex,
+        slots: list[tuple[int, str]],
+        targets: dict[str, float],
+        max_minutes: int | None = None,
+        no_repeat_days: int = 0,
+        rng: random.Random | None = None,
+        time_budget: float = TIME_BUDGET_SECONDS,
+    ) -> None:
+        self.slots = slots
+        self.targets = [(NUTRIENTS.index(name), value) for name, value in targets.items() if value]
+        self.no_repeat_days = no_repeat_days
+        self.rng = rng or random.Random()
+        self.time_budget = time_budget
+
+        requested = {meal_type for _, meal_type in slots}
+        total_share = sum(MEAL_SHARES[meal_type] for meal_type in requested) or 1.0
+        self.shares = {t: MEAL_SHARES[t] / total_share for t in requested}
+
+        def allowed(candidate: Candidate) -> bool:
+            if max_minutes is None or candidate.total_minutes is None:
+                return True
+            return candidate.total_minutes <= max_minutes
+
+        fallback = [c for c in index.candidates if allowed(c)]
+        self.pools: dict[str, list[Candidate]] = {}
+        for meal_type in requested:
+            pool = [c for c in index.by_meal_type.get(meal_type, []) if allowed(c)]
+            # No recipe tagged for this meal: any recipe beats an empty slot
+            self.pools[meal_type] = pool or fallback
+
+    def _slot_cost(self, candidate: Candidate, meal_type: str) -> float:
+        """Deviation of one candidate from the slot's share of the targets."""
+        cost = 0.0
+        for i, target in self.targets:
+            value = candidate.nutrition[i]
+            if value is None:
+                cost += UNKNOWN_NUTRITION_PENALTY
+                continue
+            share = target * self.shares[meal_type]
+            cost += ((value - share) / share) ** 2
+        return cost
+
+    def _day_cost(self, totals: list[float], unknown: int) -> float:
+        cost = unknown * UNKNOWN_NUTRITION_PENALTY
+        for i, target in self.targets:
+            cost += ((totals[i] - target) / target) ** 2
+        return cost
+
+    def _conflicts(self, candidate: Candidate, day: int, usage: dict[tuple, list[int]]) -> bool:
+        if not self.no_repeat_days:
+            return False
+        key = (candidate.source, candidate.ref)
+        return any(abs(day - used) < self.no_repeat_days for used in usage.get(key, ()))
+
+    def solve(self) -> list[Candidate | None]:
+        """Return one candidate (or None if nothing fits) per slot, in slot order."""
+        deadline = time.perf_counter() + self.time_budget
+        usage: dict[tuple, list[int]] = defaultdict(list)
+        chosen: list[Candidate | None] = []
+
+        # Greedy: best of a random sample per slot, with a little noise for variety
+        for day, meal_type in self.slots:
+            pool = self.pools[meal_type]
+            sample = (
+                self.rng.sample(pool, GREEDY_SAMPLE_SIZE)
+                if len(pool) > GREEDY_SAMPLE_SIZE
+                else pool
+            )
+            best, best_cost = None, float("inf")
+            for candidate in sample:
+                if self._conflicts(candidate, day, usage):
+                    continue
+                cost = self._slot_cost(candidate, meal_type) + self.rng.random() * VARIETY_NOISE
+                if cost < best_cost:
+                    best, best_cost = candidate, cost
+            if best is not None:
+                usage[(best.source, best.ref)].append(day)
+            chosen.append(best)
+
+        if self.targets:
+            self._improve(chosen, usage, deadline)
+        return chosen
+
+    def _improve(
+        self,
+        chosen: list[Candidate | None],
+        usage: dict[tuple, list[int]],
+        deadline: float,
+    ) -> None:
+        """Swap single slots for random alternatives while the day cost drops."""
+        days: dict[int, list[int]] = defaultdict(list)
+        for pos, (day, _) in enumerate(self.slots):
+            days[day].append(pos)
+        totals: dict[int, list[float]] = {}
+        unknown: dict[int, int] = {}
+        for day, positions in days.items():
+            totals[day] = [0.0] * len(NUTRIENTS)
+            unknown[day] = 0
+            for pos in positions:
+                self._add(chosen[pos], totals[day], unknown, day, 1)
+
+        filled = [pos for pos, candidate in enumerate(chosen) if candidate is not None]
+        stale = 0
+        while filled and stale < MAX_STALE_MOVES and time.perf_counter() < deadline:
+            stale += 1
+            pos = self.rng.choice(filled)
+            day, meal_type = self.slots[pos]
+            current = chosen[pos]
+            alternative = self.rng.choice(self.pools[meal_type])
+            if alternative is current:
+                continue
+            key = (current.source, current.ref)  # type: ignore[union-attr]
+            usage[key].remove(day)
+            if self._conflicts(alternative, day, usage):
+                usage[key].append(day)
+                continue
+
+            before = self._day_cost(totals[day], unknown[day])
+            self._add(current, totals[day], unknown, day, -1)
+            self._add(alternative, totals[day], unknown, day, 1)
+            if self._day_cost(totals[day], unknown[day]) < before:
+                chosen[pos] = alternative
+                usage[(alternative.source, alternative.ref)].append(day)
+                stale = 0
+            else:
+                self._add(alternative, totals[day], unknown, day, -1)
+                self._add(current, totals[day], unknown, day, 1)
+                usage[key].append(day)
+
+    def _add(
+        self,
+        candidate: Candidate | None,
+        totals: list[float],
+        unknown: dict[int, int],
+        day: int,
+        sign: int,
+    ) -> None:
+        if candidate is None:
+            return
+        for i, _ in self.targets:
+            value = candidate.nutrition[i]
+            if value is None:
+                unknown[day] += sign
+            else:
+                totals[i] += sign * value
+
+
+_external_index: CandidateIndex | None = None
+_external_index_built_at = 0.0
+_external_index_lock = asyncio.Lock()
+
+
+class MealPlanGeneratorService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.meal_plan_repo = MealPlanRepository(session)
+        self.recipe_repo = RecipeRepository(session)
+        self.cached_repo = CachedRecipeRepository(session)
+        self.shopping_list_service = ShoppingListService(session)
+
+    async def _get_external_index(self) -> CandidateIndex:
+        """Cached + seed recipe candidates, rebuilt at most every EXTERNAL_INDEX_TTL_SECONDS."""
+        global _external_index, _external_index_built_at
+        async with _external_index_lock:
+            now = time.monotonic()
+            if (
+                _external_index is None
+                or now - _external_index_built_at > EXTERNAL_INDEX_TTL_SECONDS
+            ):
+                seed_recipes = get_seed_recipe_service().recipes
+                rows = []
+                try:
+                    rows = await self.cached_repo.get_plan_candidates()
+                except Exception:
+                    logger.debug("Cached recipes table not available, using seed recipes only")
+
+                def build() -> CandidateIndex:
+                    return CandidateIndex.build(
+                        build_candidates("korean_seed", seed_recipes) + build_candidates(None, rows)
+                    )
+
+                _external_index = await asyncio.to_thread(build)
+                _external_index_built_at = now
+                logger.info(
+                    f"Built meal plan candidate index with {len(_external_index.candidates)} recipes"
+                )
+            return _external_index
+
+    async def generate_week(
+        self,
+        user_id: str,
+        data: GenerateMealPlanRequest,
+        redis: RedisClient,
+        rng: random.Random | None = None,
+    ) -> MealPlan:
+        """
+        Fill the empty slots of a week with generated meals.
+
+        Slots that already have a meal are kept; the rest are solved, external
+        picks are imported in bulk and all new slots are inserted in one statement.
+        """
+        week_start = data.week_start_date - timedelta(days=data.week_start_date.weekday())
+        existing = await self.meal_plan_repo.get_by_user_and_week(user_id, week_start)
+        if existing:
+            meal_plan_id = existing.id
+        else:
+            meal_plan = await self.meal_plan_repo.create(
+                {"user_id": user_id, "week_start_date": week_start, "notes": data.notes}
+            )
+            meal_plan_id = meal_plan.id
+
+        requested = [
+            (week_start + timedelta(days=day), meal_type)
+            for day in range(7)
+            for meal_type in MEAL_TYPES
+            if meal_type in data.meal_types
+        ]
+        occupied = await self.meal_plan_repo.get_occupied_slots(meal_plan_id, requested)
+        open_slots = [slot for slot in requested if slot not in occupied]
+        if not open_slots:
+            return await self.meal_plan_repo.get_by_id_with_slots(meal_plan_id)  # type: ignore
+
+        external_index = await self._get_external_index()
+        own_rows = (
+            await self.recipe_repo.get_plan_candidates(user_id) if data.include_own_recipes else []
+        )
+
+        def solve() -> tuple[CandidateIndex, list[Candidate | None]]:
+            index = external_index
+            if own_rows:
+                index = index.merged(CandidateIndex.build(build_candidates(OWN_SOURCE, own_rows)))
+            solver = PlanSolver(
+                index,
+                [((slot_date - week_start).days, meal_type) for slot_date, meal_type in open_slots],
+                targets={
+                    "calories": data.calories_per_day,
+                    "protein_grams": data.protein_grams_per_day,
+                    "carbs_grams": data.carbs_grams_per_day,
+                    "fat_grams": data.fat_grams_per_day,
+                },
+                max_minutes=data.max_total_minutes,
+                no_repeat_days=data.no_repeat_days,
+                rng=rng,
+            )
+            return index, solver.solve()
+
+        start = time.perf_counter()
+        index, chosen = await asyncio.to_thread(solve)
+        logger.info(
+            f"Generated {sum(c is not None for c in chosen)}/{len(open_slots)} slots "
+            f"from {len(index.candidates)} candidates in {(time.perf_counter() - start) * 1000:.1f}ms"
+        )
+
+        external_refs = [(c.source, c.ref) for c in chosen if c and c.source != OWN_SOURCE]
+        imported = await ExternalRecipeService(self.session, redis).import_recipes(
+            user_id,
+            external_refs,  # type: ignore[arg-type]
+        )
+        recipe_ids = {(OWN_SOURCE, c.ref): c.ref for c in chosen if c and c.source == OWN_SOURCE}
+        recipe_ids.update((ref, recipe.id) for ref, recipe in imported.items())
+
+        slots = await self.meal_plan_repo.add_slots(
+            meal_plan_id,
+            [
+                {
+                    "recipe_id": recipe_ids[(c.source, c.ref)],
+                    "date": slot_date,
+                    "meal_type": meal_type,
+                    "servings": data.servings or c.servings,
+                    "notes": None,
+                }
+                for (slot_date, meal_type), c in zip(open_slots, chosen)
+                if c is not None
+            ],
+        )
+        if slots:
+            await self.shopping_list_service.sync_meal_slots(
+                meal_plan_id, [slot.id for slot in slots]
+            )
+            await self.meal_plan_repo.bump_version(meal_plan_id)
+
+        return await self.meal_plan_repo.get_by_id_with_slots(meal_plan_id)  # type: ignore
@@ -1,62 +1,18 @@
-"""Keyword-based meal type classification engine."""
+"""Keyword-based meal type classification engine.
 
-import re
-
-
-def _has_keyword(keywords: list[str], text: str) -> bool:
-    """Check if any keyword exists as a whole word in text."""
-    for kw in keywords:
-        # Korean: simple substring match (Korean words are space-separated)
-        if any("\uac00" <= ch <= "\ud7a3" for ch in kw):
-            if kw in text:
-                return True
-        else:
-            # English: word boundary match to avoid "egg" matching "eggplant"
-            if re.search(r"\b" + re.escape(kw) + r"\b", text):
-                return True
-    return False
-
-
-def classify_meal_types(
-    title: str,
-    title_original: str | None = None,
-    categories: list[str] | None = None,
-    tags: list[str] | None = None,
-) -> list[str]:
-    """
-    Classify a recipe into meal types based on title, categories, and tags.
-
-    Returns list of meal types: breakfast, lunch, dinner, snack.
-    A recipe can belong to multiple meal types.
-    """
-    categories = categories or []
-    tags = tags or []
-
-    # Combine all text for keyword matching
-    all_text = " ".join(
-        [
-            title.lower(),
-            (title_original or "").lower(),
-            " ".join(c.lower() for c in categories),
-            " ".join(t.lower() for t in tags),
-        ]
-    )
+The keyword vocabulary is compiled once at import time into a single regex
+that reports every keyword hit in one pass over the text.
+"""
 
-    meal_types: set[str] = set()
+import os
+import re
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
 
-    # Category-based mapping (highest priority)
-    cat_lower = [c.lower() for c in categories]
-    if "breakfast" in cat_lower:
-        meal_types.add("breakfast")
-    if "dessert" in cat_lower:
-        meal_types.add("snack")
-    if "side" in cat_lower:
-        meal_types.update(["lunch", "dinner"])
-    if "starter" in cat_lower or "appetizer" in cat_lower:
-        meal_types.add("snack")
-
-    # Korean keyword matching
-    breakfast_kr = [
+# Korean keywords use plain substring matching (Korean words are space-separated)
+_KOREAN_KEYWORDS: dict[str, tuple[str, ...]] = {
+    "breakfast": (
         "죽",
         "토스트",
         "시리얼",
@@ -68,8 +24,8 @@ def classify_meal_types(
         "그래놀라",
         "식빵",
         "잼",
-    ]
-    lunch_kr = [
+    ),
+    "lunch": (
         "볶음밥",
         "비빔밥",
         "국수",
@@ -84,8 +40,8 @@ def classify_meal_types(
         "칼국수",
         "자장면",
         "짬뽕",
-    ]
-    dinner_kr = [
+    ),
+    "dinner": (
         "스테이크",
         "찜",
         "구이",
@@ -100,8 +56,8 @@ def classify_meal_types(
         "족발",
         "수육",
         "샤브샤브",
-    ]
-    snack_kr = [
+    ),
+    "snack": (
         "떡볶이",
         "떡",
         "쿠키",
@@ -124,10 +80,12 @@ def classify_meal_types(
         "호떡",
         "붕어빵",
         "튀김",
-    ]
+    ),
+}
 
-    # English keyword matching
-    breakfast_en = [
+# English keywords use word boundary matching to avoid "egg" matching "eggplant"
+_ENGLISH_KEYWORDS: dict[str, tuple[str, ...]] = {
+    "breakfast": (
         "porridge",
         "toast",
         "cereal",
@@ -144,8 +102,8 @@ def classify_meal_types(
         "omelette",
         "french toast",
         "scramble",
-    ]
-    lunch_en = [
+    ),
+    "lunch": (
         "fried rice",
         "bibimbap",
         "noodle",
@@ -161,8 +119,8 @@ def classify_meal_types(
         "burger",
         "taco",
         "quesadilla",
-    ]
-    dinner_en = [
+    ),
+    "dinner": (
         "steak",
         "stew",
         "roast",
@@ -177,8 +135,8 @@ def classify_meal_types(
         "chicken roast",
         "pot roast",
         "ribs",
-    ]
-    snack_en = [
+    ),
+    "snack": (
         "cookie",
         "cake",
         "muffin",
@@ -197,22 +155,185 @@ def classify_meal_types(
         "macaron",
         "fudge",
         "candy",
+    ),
+}
+
+# Category-based mapping (highest priority)
+_CATEGORY_MEAL_TYPES: dict[str, tuple[str, ...]] = {
+    "breakfast": ("breakfast",),
+    "dessert": ("snack",),
+    "side": ("lunch", "dinner"),
+    "starter": ("snack",),
+    "appetizer": ("snack",),
+}
+
+ALL_MEAL_TYPES = frozenset(("breakfast", "lunch", "dinner", "snack"))
+DEFAULT_MEAL_TYPES = ["dinner", "lunch"]
+
+# Batches at least this large are split across a process pool; below it the
+# worker start-up and pickling cost more than classifying in-process.
+PARALLEL_BATCH_THRESHOLD = 20_000
+
+
+def _is_korean(keyword: str) -> bool:
+    return any("\uac00" <= ch <= "\ud7a3" for ch in keyword)
+
+
+def _trie_pattern(words: list[str]) -> str:
+    """Build a prefix-sharing regex alternation that prefers the longest word."""
+    trie: dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+    return _trie_node_pattern(trie)
+
+
+def _trie_node_pattern(node: dict[str, Any]) -> str:
+    branches = [
+        re.escape(ch) + _trie_node_pattern(child) for ch, child in sorted(node.items()) if ch
     ]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    # A word ends here: the longer continuations are optional (greedy, so tried first)
+    return f"(?:{body})?" if "" in node else body
+
 
-    if _has_keyword(breakfast_kr + breakfast_en, all_text):
-        meal_types.add("breakfast")
+def _build_matcher() -> tuple[re.Pattern[str], dict[str, frozenset[str]]]:
+    """
+    Compile the whole vocabulary into one regex plus a hit -> meal types table.
+
+    The regex is a zero-width lookahead, so it is tried at every position and
+    reports the longest keyword starting there. Shorter keywords hidden inside
+    that hit (e.g. "떡" in "떡볶이", "toast" in "french toast") are folded into
+    the hit's meal types ahead of time, so overlapping matches are never lost.
+    """
+    keyword_types: dict[str, set[str]] = {}
+    for table in (_KOREAN_KEYWORDS, _ENGLISH_KEYWORDS):
+        for meal_type, keywords in table.items():
+            for kw in keywords:
+                keyword_types.setdefault(kw, set()).add(meal_type)
+
+    korean = [kw for kw in keyword_types if _is_korean(kw)]
+    english = [kw for kw in keyword_types if not _is_korean(kw)]
+
+    hit_types: dict[str, frozenset[str]] = {}
+    for hit in keyword_types:
+        types: set[str] = set()
+        for kw, kw_types in keyword_types.items():
+            if _is_korean(kw):
+                if kw in hit:
+                    types |= kw_types
+            elif re.search(r"\b" + re.escape(kw) + r"\b", hit):
+                types |= kw_types
+        hit_types[hit] = frozenset(types)
+
+    pattern = rf"(?=({_trie_pattern(korean)}|\b{_trie_pattern(english)}\b))"
+    return re.compile(pattern), hit_types
+
+
+_MATCHER, _HIT_MEAL_TYPES = _build_matcher()
+
+
+def match_meal_types(text: str) -> set[str]:
+    """Return the meal types whose keywords occur in (lowercased) text."""
+    found: set[str] = set()
+    for match in _MATCHER.finditer(text):
+        found |= _HIT_MEAL_TYPES[match.group(1)]
+        if len(found) == len(ALL_MEAL_TYPES):
+            break
+    return found
+
+
+def classify_meal_types(
+    title: str,
+    title_original: str | None = None,
+    categories: list[str] | None = None,
+    tags: list[str] | None = None,
+) -> list[str]:
+    """
+    Classify a recipe into meal types based on title, categories, and tags.
+
+    Returns list of meal types: breakfast, lunch, dinner, snack.
+    A recipe can belong to multiple meal types.
+    """
+    categories = categories or []
+    tags = tags or []
+
+    cat_lower = [c.lower() for c in categories]
 
-    if _has_keyword(lunch_kr + lunch_en, all_text):
-        meal_types.add("lunch")
+    # Combine all text for keyword matching
+    all_text = " ".join(
+        [
+            title.lower(),
+            (title_original or "").lower(),
+            " ".join(cat_lower),
+            " ".join(t.lower() for t in tags),
+        ]
+    )
 
-    if _has_keyword(dinner_kr + dinner_en, all_text):
-        meal_types.add("dinner")
+    meal_types: set[str] = set()
+    for category in cat_lower:
+        meal_types.update(_CATEGORY_MEAL_TYPES.get(category, ()))
 
-    if _has_keyword(snack_kr + snack_en, all_text):
-        meal_types.add("snack")
+    meal_types |= match_meal_types(all_text)
 
     # Fallback: if no meal_type matched, default to lunch + dinner
     if not meal_types:
-        meal_types = {"lunch", "dinner"}
+        return list(DEFAULT_MEAL_TYPES)
 
     return sorted(meal_types)
+
+
+def _classify_columns(
+    titles: Sequence[str],
+    title_originals: Sequence[str | None],
+    categories: Sequence[list[str] | None],
+    tags: Sequence[list[str] | None],
+) -> list[list[str]]:
+    return [
+        classify_meal_types(title, title_original, cats, tag_list)
+        for title, title_original, cats, tag_list in zip(titles, title_originals, categories, tags)
+    ]
+
+
+def classify_meal_types_batch(
+    titles: Sequence[str],
+    title_originals: Sequence[str | None] | None = None,
+    categories: Sequence[list[str] | None] | None = None,
+    tags: Sequence[list[str] | None] | None = None,
+    max_workers: int | None = None,
+) -> list[list[str]]:
+    """
+    Classify many recipes at once from column lists.
+
+    Each column is aligned with ``titles``; omitted columns are treated as empty.
+    Batches of PARALLEL_BATCH_THRESHOLD or more records are split into one chunk
+    per worker and classified in a ProcessPoolExecutor.
+
+    Returns one meal type list per title, in input order.
+    """
+    size = len(titles)
+    title_originals = title_originals if title_originals is not None else [None] * size
+    categories = categories if categories is not None else [None] * size
+    tags = tags if tags is not None else [None] * size
+    if not len(title_originals) == len(categories) == len(tags) == size:
+        raise ValueError("All columns must have the same length as titles")
+
+    workers = max_workers or os.cpu_count() or 1
+    if size < PARALLEL_BATCH_THRESHOLD or workers < 2:
+        return _classify_columns(titles, title_originals, categories, tags)
+
+    chunk_size = -(-size // workers)
+    bounds = [(start, start + chunk_size) for start in range(0, size, chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunks = pool.map(
+            _classify_columns,
+            [titles[a:b] for a, b in bounds],
+            [title_originals[a:b] for a, b in bounds],
+            [categories[a:b] for a, b in bounds],
+            [tags[a:b] for a, b in bounds],
+        )
+        return [meal_types for chunk in chunks for meal_types in chunk]
@@ -2,17 +2,32 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.exceptions import RecipeNotFoundError
+from src.core.redis import RedisClient
+from src.core.units import canonicalize
 from src.models.cached_recipe import CachedRecipe
 from src.models.recipe import Recipe
 from src.repositories.recipe import RecipeRepository
 from src.schemas.common import PaginationMeta
-from src.schemas.recipe import RecipeCreate, RecipeSearchParams, RecipeUpdate
+from src.schemas.recipe import (
+    BrowseRecipeWithDetailsResponse,
+    NutritionFilter,
+    RecipeCreate,
+    RecipeSearchParams,
+    RecipeUpdate,
+)
+from src.services.recipe_detail_cache import RecipeDetailCache
 
 
 class RecipeService:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, redis: RedisClient | None = None):
         self.session = session
         self.recipe_repo = RecipeRepository(session)
+        # Without Redis, browse detail reads go to the database and writes skip invalidation
+        self.detail_cache = RecipeDetailCache(redis) if redis else None
+
+    async def _invalidate_detail(self, recipe_id: str) -> None:
+        if self.detail_cache:
+            await self.detail_cache.invalidate(recipe_id)
 
     async def create_recipe(
         self,
@@ -94,6 +109,7 @@ class RecipeService:
             difficulty=params.difficulty,
             max_prep_time=params.max_prep_time,
             max_cook_time=params.max_cook_time,
+            nutrition=params.nutrition.ranges() if params.nutrition else None,
             skip=skip,
             limit=params.limit,
         )
@@ -117,6 +133,7 @@ class RecipeService:
 
         update_data = data.model_dump(exclude_unset=True)
         recipe = await self.recipe_repo.update(recipe, update_data)
+        await self._invalidate_detail(recipe.id)
 
         return await self.recipe_repo.get_by_id_with_details(recipe.id)  # type: ignore
 
@@ -127,6 +144,7 @@ class RecipeService:
     ) -> None:
         recipe = await self.get_recipe(recipe_id, user_id)
         await self.recipe_repo.delete(recipe)
+        await self._invalidate_detail(recipe_id)
 
     async def adjust_servings(
         self,
@@ -143,9 +161,13 @@ class RecipeService:
 
         for ingredient in recipe.ingredients:
             ingredient.amount = round(float(ingredient.amount) * multiplier, 2)
+            ingredient.canonical_amount, ingredient.canonical_unit = canonicalize(
+                ingredient.amount, ingredient.unit
+            )
 
         recipe.servings = new_servings
         await self.session.flush()
+        await self._invalidate_detail(recipe.id)
 
         return await self.recipe_repo.get_by_id_with_details(recipe.id)  # type: ignore
 
@@ -154,6 +176,7 @@ class RecipeService:
         query: str | None = None,
         categories: list[str] | None = None,
         difficulty: str | None = None,
+        nutrition: NutritionFilter | None = None,
         page: int = 1,
         limit: int = 20,
     ) -> tuple[list[dict], PaginationMeta]:
@@ -164,6 +187,7 @@ class RecipeService:
             query=query,
             categories=categories,
             difficulty=difficulty,
+            nutrition=nutrition.ranges() if nutrition else None,
             skip=skip,
             limit=limit,
         )
@@ -177,6 +201,53 @@ class RecipeService:
 
         return rows, meta
 
+    async def find_by_ingredients(
+        self,
+        ingredients: list[str],
+        min_coverage: float = 0.0,
+        page: int = 1,
+        limit: int = 20,
+    ) -> tuple[list[dict], PaginationMeta]:
+        """Recipes ranked by how many of their ingredients the user already has."""
+        skip = (page - 1) * limit
+
+        rows, total = await self.recipe_repo.match_ingredients(
+            ingredients=ingredients,
+            min_coverage=min_coverage,
+            skip=skip,
+            limit=limit,
+        )
+
+        meta = PaginationMeta(
+            total=total,
+            page=page,
+            limit=limit,
+            total_pages=(total + limit - 1) // limit if total > 0 else 1,
+        )
+
+        return rows, meta
+
+    async def get_browse_recipe_json(self, recipe_id: str) -> str:
+        """
+        Get a user or cached recipe's browse detail as a serialized JSON document.
+
+        Read through the detail cache when Redis is available. User recipes are
+        serialized by PostgreSQL in a single query, cached recipes by Pydantic.
+        """
+        if self.detail_cache:
+            document = await self.detail_cache.get(recipe_id)
+            if document:
+                return document
+
+        document = await self.recipe_repo.get_detail_json(recipe_id)
+        if document is None:
+            data = await self.get_cached_recipe_public(recipe_id)
+            document = BrowseRecipeWithDetailsResponse(**data).model_dump_json()
+
+        if self.detail_cache:
+            await self.detail_cache.fill(recipe_id, document)
+        return document
+
     async def get_recipe_or_cached_public(self, recipe_id: str) -> tuple[dict, bool]:
         """Get recipe by ID from recipes table first, then cached_recipes. Returns (data_dict, is_cached)."""
         recipe = await self.recipe_repo.get_by_id_with_details(recipe_id)
@@ -232,7 +303,10 @@ class RecipeService:
             }
             return data, False
 
-        # Try cached_recipes
+        return await self.get_cached_recipe_public(recipe_id), True
+
+    async def get_cached_recipe_public(self, recipe_id: str) -> dict:
+        """Get a cached external recipe as a browse detail dict."""
         result = await self.session.execute(
             select(CachedRecipe).where(CachedRecipe.id == recipe_id)
         )
@@ -296,4 +370,4 @@ class RecipeService:
             "ingredients": ingredients,
             "instructions": instructions,
         }
-        return data, True
+        return data
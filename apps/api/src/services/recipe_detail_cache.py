@@ -0,0 +1,61 @@
+"""Read-through cache of serialized browse recipe detail documents.
+
+Documents are keyed by recipe ID and FORMAT_VERSION, so a change to the shape
+of BrowseRecipeWithDetailsResponse only needs the version bumped.
+
+Services invalidate inside their transaction, before it commits. Deleting the
+key there would let a concurrent reader refill it from the old row, so an
+invalidation writes a short-lived empty marker instead and fills use SET NX:
+nothing can be stored until the marker expires, by which time the writer's
+transaction has finished.
+"""
+
+import logging
+
+from src.core.redis import RedisClient
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "recipe:detail"
+FORMAT_VERSION = 2
+DETAIL_TTL_SECONDS = 3600
+INVALIDATION_HOLD_SECONDS = 10
+
+
+def detail_cache_key(recipe_id: str) -> str:
+    return f"{KEY_PREFIX}:v{FORMAT_VERSION}:{recipe_id}"
+
+
+class RecipeDetailCache:
+    """Redis errors are logged and treated as misses so reads fall back to the database."""
+
+    def __init__(self, redis: RedisClient):
+        self.redis = redis
+
+    async def get(self, recipe_id: str) -> str | None:
+        try:
+            document = await self.redis.get(detail_cache_key(recipe_id))
+        except Exception as e:
+            logger.warning(f"Recipe detail cache read failed: {e}")
+            return None
+        # An invalidation marker is empty
+        return document or None
+
+    async def fill(self, recipe_id: str, document: str) -> None:
+        try:
+            await self.redis.set(
+                detail_cache_key(recipe_id), document, ex=DETAIL_TTL_SECONDS, nx=True
+            )
+        except Exception as e:
+            logger.warning(f"Recipe detail cache write failed: {e}")
+
+    async def invalidate(self, *recipe_ids: str) -> None:
+        if not recipe_ids:
+            return
+        try:
+            pipe = self.redis.pipeline()
+            for recipe_id in recipe_ids:
+                pipe.set(detail_cache_key(recipe_id), "", ex=INVALIDATION_HOLD_SECONDS)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Recipe detail cache invalidation failed: {e}")
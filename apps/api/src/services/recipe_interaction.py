@@ -1,23 +1,56 @@
+from datetime import datetime
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.config import settings
 from src.core.exceptions import BadRequestError, NotFoundError
+from src.core.redis import RedisClient
 from src.models.recipe import Recipe
 from src.models.recipe_rating import RecipeRating
 from src.repositories.recipe import RecipeRepository
 from src.repositories.recipe_interaction import RecipeInteractionRepository
 from src.schemas.common import PaginationMeta
 from src.schemas.recipe_interaction import (
+    RecipeListInclude,
     RecipeRatingCreate,
     RecipeRatingUpdate,
     RecipeStatsResponse,
+    RecipeUserInteractionResponse,
+)
+from src.services.favorite_buffer import FavoriteWriteBuffer
+from src.services.leaderboard import (
+    RATING_WEIGHT,
+    RecipeLeaderboardName,
+    RecipeLeaderboards,
+    split_import_member,
 )
 
 
+def _list_extras(interactions: dict | None, include: set[RecipeListInclude]) -> dict:
+    """Response fields for include=interactions,stats; defaults for recipes never touched."""
+    interactions = interactions or {}
+    extras: dict = {}
+    if "interactions" in include:
+        extras["interactions"] = RecipeUserInteractionResponse(
+            user_rating=interactions.get("user_rating"),
+            is_favorite=interactions.get("is_favorite", False),
+        )
+    if "stats" in include:
+        extras["stats"] = RecipeStatsResponse(**interactions.get("stats", {}))
+    return extras
+
+
 class RecipeInteractionService:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, redis: RedisClient | None = None):
         self.session = session
         self.interaction_repo = RecipeInteractionRepository(session)
         self.recipe_repo = RecipeRepository(session)
+        # Favorite changes go through Redis only in write-behind mode
+        self.favorite_buffer = (
+            FavoriteWriteBuffer(redis) if redis and settings.favorites_write_behind else None
+        )
+        # Without Redis, writes skip the leaderboards
+        self.leaderboards = RecipeLeaderboards(redis) if redis else None
 
     async def _verify_recipe_exists(self, recipe_id: str) -> Recipe:
         recipe = await self.recipe_repo.get_by_id(recipe_id)
@@ -49,6 +82,7 @@ class RecipeInteractionService:
             rating=data.rating,
             review=data.review,
         )
+        await self._record_rating(recipe_id, RATING_WEIGHT)
         return rating
 
     async def update_rating(
@@ -66,6 +100,7 @@ class RecipeInteractionService:
             rating=data.rating,
             review=data.review,
         )
+        await self._record_rating(recipe_id)
         return rating
 
     async def delete_rating(self, user_id: str, recipe_id: str) -> None:
@@ -74,6 +109,15 @@ class RecipeInteractionService:
             raise NotFoundError("You haven't rated this recipe yet")
 
         await self.interaction_repo.delete_rating(existing)
+        await self._record_rating(recipe_id, -RATING_WEIGHT, existing.created_at)
+
+    async def _record_rating(
+        self, recipe_id: str, trending_weight: float = 0.0, created_at: datetime | None = None
+    ) -> None:
+        """Update the leaderboards from the counters the rating triggers just changed."""
+        if self.leaderboards:
+            stats = await self.interaction_repo.get_recipe_stats(recipe_id)
+            await self.leaderboards.record_rating(recipe_id, stats, trending_weight, created_at)
 
     async def get_recipe_ratings(
         self,
@@ -100,41 +144,172 @@ class RecipeInteractionService:
         return ratings, meta
 
     async def get_recipe_stats(self, recipe_id: str) -> RecipeStatsResponse:
-        await self._verify_recipe_exists(recipe_id)
         stats = await self.interaction_repo.get_recipe_stats(recipe_id)
+        if stats is None:
+            raise NotFoundError(f"Recipe with id {recipe_id} not found")
         return RecipeStatsResponse(**stats)
 
+    async def get_top_rated_recipes(
+        self,
+        min_ratings: int = 1,
+        page: int = 1,
+        limit: int = 20,
+    ) -> tuple[list[Recipe], PaginationMeta]:
+        skip = (page - 1) * limit
+        recipes, total = await self.interaction_repo.get_top_rated(
+            min_ratings=min_ratings,
+            skip=skip,
+            limit=limit,
+        )
+
+        meta = PaginationMeta(
+            total=total,
+            page=page,
+            limit=limit,
+            total_pages=(total + limit - 1) // limit if total > 0 else 1,
+        )
+
+        return recipes, meta
+
+    async def get_leaderboard(
+        self, board: RecipeLeaderboardName, limit: int = 20
+    ) -> list[tuple[Recipe, float]]:
+        """Top recipes of a Redis leaderboard with their scores, best first."""
+        if not self.leaderboards:
+            return []
+        entries = await self.leaderboards.top(board, limit)
+        recipes = {
+            recipe.id: recipe
+            for recipe in await self.recipe_repo.get_by_ids([member for member, _ in entries])
+        }
+        # Deleted recipes leave their members behind until read
+        await self.leaderboards.remove(board, *(m for m, _ in entries if m not in recipes))
+        return [(recipes[member], score) for member, score in entries if member in recipes]
+
+    async def get_import_leaderboard(self, limit: int = 20) -> list[dict]:
+        """Most imported external recipes recently, best first."""
+        if not self.leaderboards:
+            return []
+        entries = await self.leaderboards.top("imports", limit)
+        leaders = []
+        for member, score in entries:
+            source, external_id = split_import_member(member)
+            leaders.append({"source": source, "external_id": external_id, "score": score})
+        return leaders
+
     # ========== Favorite Methods ==========
 
+    async def _set_buffered_favorite(
+        self, buffer: FavoriteWriteBuffer, user_id: str, recipe_id: str, value: bool | None
+    ) -> tuple[bool, bool] | None:
+        """
+        Apply a change through the write-behind buffer; returns (before, after).
+
+        Only a recipe the user has not changed recently costs a database read
+        (existence and current state in one query). None if the recipe does not exist.
+        """
+        result = await buffer.set(user_id, recipe_id, value)
+        if result is None:
+            db_state = await self.interaction_repo.get_favorite_state(user_id, recipe_id)
+            if db_state is None:
+                return None
+            result = await buffer.set(user_id, recipe_id, value, db_state=db_state)
+        return result
+
+    async def _favorite_created_at(self, user_id: str, recipe_id: str) -> datetime | None:
+        """
+        created_at of a buffered favorite being removed: when a flush wrote it, or
+        None (now) if it never reached the database, i.e. it is recent.
+        """
+        favorite = await self.interaction_repo.get_favorite(user_id, recipe_id)
+        return favorite.created_at if favorite else None
+
+    async def _flush_pending_favorites(self, user_id: str) -> None:
+        """Let database reads see the user's own buffered changes."""
+        if self.favorite_buffer:
+            await self.favorite_buffer.flush_user(user_id)
+
     async def is_favorite(self, user_id: str, recipe_id: str) -> bool:
+        if self.favorite_buffer:
+            buffered = await self.favorite_buffer.get(user_id, recipe_id)
+            if buffered is not None:
+                return buffered
         return await self.interaction_repo.is_favorite(user_id, recipe_id)
 
     async def toggle_favorite(self, user_id: str, recipe_id: str) -> bool:
         """Toggle favorite status. Returns True if favorited, False if unfavorited."""
-        await self._verify_recipe_exists(recipe_id)
-
-        existing = await self.interaction_repo.get_favorite(user_id, recipe_id)
-        if existing:
-            await self.interaction_repo.remove_favorite(user_id, recipe_id)
-            return False
+        created_at = None
+        if self.favorite_buffer:
+            result = await self._set_buffered_favorite(
+                self.favorite_buffer, user_id, recipe_id, None
+            )
+            if result is None:
+                raise NotFoundError(f"Recipe with id {recipe_id} not found")
+            favorited = result[1]
+            if not favorited and self.leaderboards:
+                created_at = await self._favorite_created_at(user_id, recipe_id)
         else:
-            await self.interaction_repo.add_favorite(user_id, recipe_id)
-            return True
+            await self._verify_recipe_exists(recipe_id)
+
+            existing = await self.interaction_repo.get_favorite(user_id, recipe_id)
+            if existing:
+                await self.interaction_repo.remove_favorite(user_id, recipe_id)
+                favorited = False
+                created_at = existing.created_at
+            else:
+                await self.interaction_repo.add_favorite(user_id, recipe_id)
+                favorited = True
+
+        await self._record_favorite(recipe_id, favorited, created_at)
+        return favorited
 
     async def add_favorite(self, user_id: str, recipe_id: str) -> bool:
         """Add to favorites. Returns True if added, False if already favorited."""
-        await self._verify_recipe_exists(recipe_id)
+        if self.favorite_buffer:
+            result = await self._set_buffered_favorite(
+                self.favorite_buffer, user_id, recipe_id, True
+            )
+            if result is None:
+                raise NotFoundError(f"Recipe with id {recipe_id} not found")
+            added = not result[0]
+        else:
+            await self._verify_recipe_exists(recipe_id)
 
-        existing = await self.interaction_repo.get_favorite(user_id, recipe_id)
-        if existing:
-            return False
+            added = not await self.interaction_repo.get_favorite(user_id, recipe_id)
+            if added:
+                await self.interaction_repo.add_favorite(user_id, recipe_id)
 
-        await self.interaction_repo.add_favorite(user_id, recipe_id)
-        return True
+        if added:
+            await self._record_favorite(recipe_id, True)
+        return added
 
     async def remove_favorite(self, user_id: str, recipe_id: str) -> bool:
         """Remove from favorites. Returns True if removed, False if not found."""
-        return await self.interaction_repo.remove_favorite(user_id, recipe_id)
+        created_at = None
+        if self.favorite_buffer:
+            result = await self._set_buffered_favorite(
+                self.favorite_buffer, user_id, recipe_id, False
+            )
+            removed = result is not None and result[0]
+            if removed and self.leaderboards:
+                created_at = await self._favorite_created_at(user_id, recipe_id)
+        else:
+            existing = await self.interaction_repo.get_favorite(user_id, recipe_id)
+            removed = existing is not None
+            if existing:
+                await self.interaction_repo.remove_favorite(user_id, recipe_id)
+                created_at = existing.created_at
+
+        if removed:
+            await self._record_favorite(recipe_id, False, created_at)
+        return removed
+
+    async def _record_favorite(
+        self, recipe_id: str, favorited: bool, created_at: datetime | None = None
+    ) -> None:
+        """created_at: when a removed favorite was made, so its exact weight is taken back."""
+        if self.leaderboards:
+            await self.leaderboards.record_favorite(recipe_id, favorited, created_at)
 
     async def get_favorite_recipes(
         self,
@@ -142,6 +317,7 @@ class RecipeInteractionService:
         page: int = 1,
         limit: int = 20,
     ) -> tuple[list[Recipe], PaginationMeta]:
+        await self._flush_pending_favorites(user_id)
         skip = (page - 1) * limit
         recipes, total = await self.interaction_repo.get_user_favorites(
             user_id=user_id,
@@ -166,6 +342,7 @@ class RecipeInteractionService:
         recipe_ids: list[str],
     ) -> dict[str, dict]:
         """Get user's interactions for multiple recipes (for list views)."""
+        await self._flush_pending_favorites(user_id)
         return await self.interaction_repo.get_user_interactions_for_recipes(
             user_id=user_id,
             recipe_ids=recipe_ids,
@@ -174,3 +351,29 @@ class RecipeInteractionService:
     async def get_stats_for_recipes(self, recipe_ids: list[str]) -> dict[str, dict]:
         """Get stats for multiple recipes (for list views)."""
         return await self.interaction_repo.get_stats_for_recipes(recipe_ids)
+
+    async def get_list_extras(
+        self,
+        user_id: str,
+        recipe_ids: list[str],
+        include: set[RecipeListInclude],
+    ) -> dict[str, dict]:
+        """Requested interaction fields for a page of recipes, keyed by recipe id."""
+        if not include or not recipe_ids:
+            return {}
+        await self._flush_pending_favorites(user_id)
+        found = await self.interaction_repo.get_list_interactions(user_id, recipe_ids)
+        return {recipe_id: _list_extras(found.get(recipe_id), include) for recipe_id in recipe_ids}
+
+    async def get_external_list_extras(
+        self,
+        user_id: str,
+        refs: list[tuple[str, str]],
+        include: set[RecipeListInclude],
+    ) -> dict[tuple[str, str], dict]:
+        """Requested interaction fields for external previews, keyed by (source, external_id)."""
+        if not include or not refs:
+            return {}
+        await self._flush_pending_favorites(user_id)
+        found = await self.interaction_repo.get_list_interactions_by_external(user_id, refs)
+        return {ref: _list_extras(found.get(ref), include) for ref in refs}
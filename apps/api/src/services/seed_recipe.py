@@ -1,13 +1,35 @@
 """Seed recipe service for Korean recipes without external API calls."""
 
+import hashlib
 import json
 import logging
 import random
+import struct
+from collections import defaultdict
+from collections.abc import Sequence
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+from src.core.nutrition import NutritionRanges, matches_nutrition
+from src.services.meal_type_tagger import classify_meal_types_batch
+
 logger = logging.getLogger(__name__)
 
+SEED_FILE = Path(__file__).parent.parent / "data" / "korean_recipes_seed.json"
+
+# Meal types precomputed at build time (see src.scripts.build_seed_artifact).
+# Layout: magic, recipe count, sha256 of the seed JSON, then one bitmask byte
+# per recipe in file order (bit i set = MEAL_TYPE_BITS[i]).
+MEAL_TYPES_FILE = SEED_FILE.with_suffix(".meal_types.bin")
+MEAL_TYPE_BITS = ("breakfast", "lunch", "dinner", "snack")
+_ARTIFACT_MAGIC = b"SMT1"
+_ARTIFACT_HEADER = struct.Struct("<4sI32s")
+_MASK_MEAL_TYPES = [
+    sorted(t for bit, t in enumerate(MEAL_TYPE_BITS) if mask >> bit & 1)
+    for mask in range(1 << len(MEAL_TYPE_BITS))
+]
+
 # Load seed data once at module level
 _seed_data: dict[str, Any] | None = None
 
@@ -18,7 +40,7 @@ def _load_seed_data() -> dict[str, Any]:
     if _seed_data is not None:
         return _seed_data
 
-    seed_file = Path(__file__).parent.parent / "data" / "korean_recipes_seed.json"
+    seed_file = SEED_FILE
     try:
         with open(seed_file, encoding="utf-8") as f:
             _seed_data = json.load(f)
@@ -34,20 +56,54 @@ def _load_seed_data() -> dict[str, Any]:
         return _seed_data
 
 
-def _normalize_recipe(recipe: dict[str, Any]) -> dict[str, Any]:
-    """Convert seed recipe format to API schema format."""
-    from src.services.meal_type_tagger import classify_meal_types
+def _seed_digest(seed_file: Path = SEED_FILE) -> bytes:
+    return hashlib.sha256(seed_file.read_bytes()).digest()
+
+
+def write_meal_types_artifact(
+    path: Path, digest: bytes, batch_meal_types: Sequence[list[str]]
+) -> None:
+    """Write per-recipe meal types as a compact bitmask artifact."""
+    masks = bytearray()
+    for meal_types in batch_meal_types:
+        mask = 0
+        for meal_type in meal_types:
+            mask |= 1 << MEAL_TYPE_BITS.index(meal_type)
+        masks.append(mask)
+
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_ARTIFACT_HEADER.pack(_ARTIFACT_MAGIC, len(masks), digest))
+        f.write(masks)
+    tmp_path.replace(path)
+
+
+def _read_meal_types_artifact(path: Path, digest: bytes, count: int) -> list[list[str]] | None:
+    """
+    Read and decode the meal types artifact (a few KB, one byte per recipe).
 
+    Returns None if the artifact is missing or was built from different seed data,
+    in which case the caller classifies at runtime.
+    """
+    try:
+        buf = path.read_bytes()
+    except FileNotFoundError:
+        return None
+    if len(buf) < _ARTIFACT_HEADER.size + count:
+        return None
+    magic, stored_count, stored_digest = _ARTIFACT_HEADER.unpack_from(buf)
+    if magic != _ARTIFACT_MAGIC or stored_count != count or stored_digest != digest:
+        return None
+    start = _ARTIFACT_HEADER.size
+    return [list(_MASK_MEAL_TYPES[mask & 0x0F]) for mask in buf[start : start + count]]
+
+
+def _normalize_recipe(recipe: dict[str, Any], meal_types: list[str]) -> dict[str, Any]:
+    """Convert seed recipe format to API schema format."""
     title = recipe.get("title", "")
     categories = recipe.get("categories", [])
     tags = recipe.get("tags", [])
 
-    meal_types = classify_meal_types(
-        title=title,
-        categories=categories,
-        tags=tags,
-    )
-
     return {
         "source": "korean_seed",
         "external_id": recipe.get("id", ""),
@@ -70,12 +126,149 @@ def _normalize_recipe(recipe: dict[str, Any]) -> dict[str, Any]:
     }
 
 
+def classify_seed_meal_types(raw_recipes: list[dict[str, Any]]) -> list[list[str]]:
+    """Classify raw seed recipes into meal types, in input order."""
+    return classify_meal_types_batch(
+        [r.get("title", "") for r in raw_recipes],
+        categories=[r.get("categories", []) for r in raw_recipes],
+        tags=[r.get("tags", []) for r in raw_recipes],
+    )
+
+
 class SeedRecipeService:
-    """Service for Korean seed recipes without external API dependencies."""
+    """
+    Service for Korean seed recipes without external API dependencies.
+
+    Recipes are indexed once at construction: an external_id lookup table,
+    lowercased search fields, and inverted indexes from search tokens,
+    categories, tags and meal types to recipe positions. Filters intersect
+    posting sets instead of rescanning every recipe.
+    """
+
+    def __init__(
+        self,
+        data: dict[str, Any] | None = None,
+        meal_types_file: Path | None = MEAL_TYPES_FILE,
+    ) -> None:
+        """
+        Args:
+            data: Seed data to serve; defaults to the bundled seed JSON
+            meal_types_file: Precomputed meal types artifact, only used with the
+                bundled seed JSON. None always classifies at runtime.
+        """
+        self.data = data if data is not None else _load_seed_data()
+        raw_recipes = self.data.get("recipes", [])
+
+        batch_meal_types = None
+        if data is None and meal_types_file is not None and raw_recipes:
+            batch_meal_types = _read_meal_types_artifact(
+                meal_types_file, _seed_digest(), len(raw_recipes)
+            )
+            if batch_meal_types is None:
+                logger.warning(
+                    f"Meal types artifact {meal_types_file.name} missing or stale, "
+                    "classifying seed recipes at runtime"
+                )
+        if batch_meal_types is None:
+            batch_meal_types = classify_seed_meal_types(raw_recipes)
+        self.recipes = [
+            _normalize_recipe(r, meal_types) for r, meal_types in zip(raw_recipes, batch_meal_types)
+        ]
+        self._build_indexes()
+
+    def _build_indexes(self) -> None:
+        self._by_id: dict[str, dict[str, Any]] = {}
+        self._search_fields: list[tuple[str, ...]] = []
+        self._token_index: dict[str, set[int]] = defaultdict(set)
+        self._category_index: dict[str, set[int]] = defaultdict(set)
+        self._tag_index: dict[str, set[int]] = defaultdict(set)
+        self._meal_type_index: dict[str, set[int]] = defaultdict(set)
+        categories: set[str] = set()
+        tags: set[str] = set()
+
+        for pos, recipe in enumerate(self.recipes):
+            # First occurrence wins, matching a front-to-back scan
+            self._by_id.setdefault(recipe["external_id"], recipe)
+
+            fields = (
+                recipe["title"].lower(),
+                (recipe["description"] or "").lower(),
+                *(t.lower() for t in recipe["tags"]),
+            )
+            self._search_fields.append(fields)
+            for field in fields:
+                for token in field.split():
+                    self._token_index[token].add(pos)
+
+            for category in recipe["categories"]:
+                self._category_index[category.lower()].add(pos)
+            for tag in recipe["tags"]:
+                self._tag_index[tag.lower()].add(pos)
+            for meal_type in recipe["meal_types"]:
+                self._meal_type_index[meal_type].add(pos)
+            categories.update(recipe["categories"])
+            tags.update(recipe["tags"])
 
-    def __init__(self) -> None:
-        self.data = _load_seed_data()
-        self.recipes = [_normalize_recipe(r) for r in self.data.get("recipes", [])]
+        self._categories = sorted(categories)
+        self._tags = sorted(tags)
+
+    def _query_positions(self, query_lower: str) -> set[int]:
+        """
+        Positions of recipes whose title, description or a tag contains the query.
+
+        A whitespace-free piece of the query must sit inside a single token of any
+        field that contains the whole query, so the tokens containing the longest
+        piece give a candidate set that is then verified against the full fields.
+        """
+        pieces = query_lower.split()
+        if not pieces:
+            candidates: set[int] = set(range(len(self.recipes)))
+        else:
+            anchor = max(pieces, key=len)
+            candidates = set()
+            for token, positions in self._token_index.items():
+                if anchor in token:
+                    candidates |= positions
+        return {
+            pos
+            for pos in candidates
+            if any(query_lower in field for field in self._search_fields[pos])
+        }
+
+    def _filter_positions(
+        self,
+        query: str | None = None,
+        category: str | None = None,
+        tag: str | None = None,
+        meal_type: str | None = None,
+    ) -> list[int] | None:
+        """
+        Intersect the index postings for the given filters.
+
+        Returns sorted recipe positions, or None when no filter was given.
+        """
+        postings: list[set[int]] = []
+        if category:
+            postings.append(self._category_index.get(category.lower(), set()))
+        if tag:
+            postings.append(self._tag_index.get(tag.lower(), set()))
+        if meal_type:
+            postings.append(self._meal_type_index.get(meal_type, set()))
+        if not postings and not query:
+            return None
+
+        postings.sort(key=len)
+        if query:
+            if postings and not postings[0]:
+                return []
+            postings.insert(0, self._query_positions(query.lower()))
+
+        matched = set(postings[0])
+        for posting in postings[1:]:
+            matched.intersection_update(posting)
+            if not matched:
+                break
+        return sorted(matched)
 
     @property
     def is_configured(self) -> bool:
@@ -88,10 +281,7 @@ class SeedRecipeService:
 
     def get_recipe_by_id(self, recipe_id: str) -> dict[str, Any] | None:
         """Get a recipe by its external_id."""
-        for recipe in self.recipes:
-            if recipe.get("external_id") == recipe_id:
-                return recipe
-        return None
+        return self._by_id.get(recipe_id)
 
     def get_random_recipes(self, number: int = 10) -> list[dict[str, Any]]:
         """Get random recipes from seed data."""
@@ -100,6 +290,25 @@ class SeedRecipeService:
         count = min(number, len(self.recipes))
         return random.sample(self.recipes, count)
 
+    def sample_recipes(
+        self,
+        number: int = 10,
+        category: str | None = None,
+        meal_type: str | None = None,
+        nutrition: NutritionRanges | None = None,
+    ) -> list[dict[str, Any]]:
+        """Get random recipes matching the category, meal type and nutrition filters."""
+        positions = self._filter_positions(category=category, meal_type=meal_type)
+        if nutrition:
+            candidates = range(len(self.recipes)) if positions is None else positions
+            positions = [
+                pos for pos in candidates if matches_nutrition(self.recipes[pos], nutrition)
+            ]
+        if positions is None:
+            return self.get_random_recipes(number)
+        count = min(number, len(positions))
+        return [self.recipes[pos] for pos in random.sample(positions, count)]
+
     def search_recipes(
         self,
         query: str | None = None,
@@ -112,7 +321,7 @@ class SeedRecipeService:
         Search recipes with optional filters.
 
         Args:
-            query: Search in title and description
+            query: Search in title, description and tags
             category: Filter by category (breakfast, lunch, dinner, snack, dessert)
             tag: Filter by tag
             number: Maximum results to return
@@ -121,33 +330,13 @@ class SeedRecipeService:
         Returns:
             Search results with pagination info
         """
-        results = self.recipes.copy()
-
-        # Filter by query (title and description)
-        if query:
-            query_lower = query.lower()
-            results = [
-                r
-                for r in results
-                if query_lower in r.get("title", "").lower()
-                or query_lower in r.get("description", "").lower()
-                or any(query_lower in tag.lower() for tag in r.get("tags", []))
-            ]
-
-        # Filter by category
-        if category:
-            category_lower = category.lower()
-            results = [
-                r for r in results if category_lower in [c.lower() for c in r.get("categories", [])]
-            ]
-
-        # Filter by tag
-        if tag:
-            tag_lower = tag.lower()
-            results = [r for r in results if tag_lower in [t.lower() for t in r.get("tags", [])]]
-
-        total = len(results)
-        paginated = results[offset : offset + number]
+        positions = self._filter_positions(query=query, category=category, tag=tag)
+        if positions is None:
+            total = len(self.recipes)
+            paginated = self.recipes[offset : offset + number]
+        else:
+            total = len(positions)
+            paginated = [self.recipes[pos] for pos in positions[offset : offset + number]]
 
         return {
             "results": paginated,
@@ -158,18 +347,14 @@ class SeedRecipeService:
 
     def get_categories(self) -> list[str]:
         """Get all unique categories from seed recipes."""
-        categories = set()
-        for recipe in self.recipes:
-            categories.update(recipe.get("categories", []))
-        return sorted(categories)
+        return list(self._categories)
 
     def get_tags(self) -> list[str]:
         """Get all unique tags from seed recipes."""
-        tags = set()
-        for recipe in self.recipes:
-            tags.update(recipe.get("tags", []))
-        return sorted(tags)
+        return list(self._tags)
 
 
-# Global instance
-seed_recipe_service = SeedRecipeService()
+@lru_cache
+def get_seed_recipe_service() -> SeedRecipeService:
+    """Shared service instance, built on first use rather than at import."""
+    return SeedRecipeService()
@@ -1,14 +1,23 @@
 from collections import defaultdict
+from datetime import date
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.exceptions import MealPlanNotFoundError, NotFoundError, ShoppingListNotFoundError
+from src.core.exceptions import (
+    BadRequestError,
+    MealPlanNotFoundError,
+    NotFoundError,
+    ShoppingListNotFoundError,
+)
+from src.core.ingredient_category import categorize_ingredient
+from src.core.units import to_display_unit
 from src.models.shopping_item import ShoppingItem
 from src.models.shopping_list import ShoppingList
 from src.repositories.meal_plan import MealPlanRepository
 from src.repositories.shopping_list import ShoppingListRepository
 from src.schemas.common import PaginationMeta
 from src.schemas.shopping_list import (
+    ShoppingItemBatchRequest,
     ShoppingItemCreate,
     ShoppingItemUpdate,
     ShoppingListCreate,
@@ -53,6 +62,22 @@ class ShoppingListService:
             raise ShoppingListNotFoundError(shopping_list_id)
         return shopping_list
 
+    async def get_shopping_list_version(
+        self,
+        shopping_list_id: str,
+        user_id: str,
+    ) -> int:
+        row = await self.shopping_list_repo.get_version(shopping_list_id)
+        if not row or row.user_id != user_id:
+            raise ShoppingListNotFoundError(shopping_list_id)
+        return row.version
+
+    async def _verify_owner(self, shopping_list_id: str, user_id: str) -> None:
+        """Ownership check for item mutations; does not load the items."""
+        owner_id = await self.shopping_list_repo.get_owner_id(shopping_list_id)
+        if owner_id != user_id:
+            raise ShoppingListNotFoundError(shopping_list_id)
+
     async def get_user_shopping_lists(
         self,
         user_id: str,
@@ -80,9 +105,6 @@ class ShoppingListService:
         dates: list[str] | None = None,
         meal_types: list[str] | None = None,
     ) -> ShoppingList:
-        # Use get_by_id (not get_by_id_with_slots) to avoid loading Recipe objects
-        # without ingredients into the SQLAlchemy identity map, which would prevent
-        # the subsequent eager load of ingredients from working correctly.
         meal_plan = await self.meal_plan_repo.get_by_id(meal_plan_id)
         if not meal_plan:
             raise MealPlanNotFoundError(meal_plan_id)
@@ -90,7 +112,14 @@ class ShoppingListService:
             raise MealPlanNotFoundError(meal_plan_id)
 
         existing = await self.shopping_list_repo.get_by_meal_plan_id(meal_plan_id)
+        checked_keys: set[tuple[str, str]] = set()
         if existing:
+            # Carry checked state over to the regenerated items
+            checked_keys = {
+                (item.ingredient_key, item.canonical_unit)
+                for item in existing.items
+                if item.is_checked and item.ingredient_key and item.canonical_unit
+            }
             await self.shopping_list_repo.delete(existing)
 
         # Generate descriptive name based on filters
@@ -105,98 +134,152 @@ class ShoppingListService:
         else:
             list_name = f"{meal_plan.week_start_date} 주간 장보기 목록"
 
+        filter_dates = [date.fromisoformat(d) for d in dates] if dates else None
+        filter_meal_types = meal_types or None
         shopping_list = await self.shopping_list_repo.create(
             {
                 "user_id": user_id,
                 "name": list_name,
                 "meal_plan_id": meal_plan_id,
+                "auto_sync": True,
+                "filter_dates": filter_dates,
+                "filter_meal_types": filter_meal_types,
             }
         )
 
-        # Get ALL slots for this meal plan with ingredients eagerly loaded.
-        # Using get_all_slots_with_ingredients instead of date-range query
-        # to avoid missing slots due to frontend (Sunday-start) vs backend
-        # (Monday-start) week start date mismatch.
-        slots = await self.meal_plan_repo.get_all_slots_with_ingredients(meal_plan_id)
-
-        # Filter slots by dates and meal_types
-        if dates:
-            from datetime import date as date_type
-
-            date_set = {date_type.fromisoformat(d) for d in dates}
-            slots = [s for s in slots if s.date in date_set]
-
-        if meal_types:
-            meal_type_set = set(meal_types)
-            slots = [s for s in slots if s.meal_type in meal_type_set]
+        # Filter by meal plan id rather than a date range to avoid missing slots
+        # due to frontend (Sunday-start) vs backend (Monday-start) week start
+        # date mismatch; dates and meal_types narrow it down in SQL.
+        rows = await self.meal_plan_repo.aggregate_slot_ingredients(
+            meal_plan_id,
+            dates=filter_dates,
+            meal_types=filter_meal_types,
+        )
+        await self._apply_contributions(shopping_list.id, rows, checked_keys=checked_keys)
 
-        aggregated = defaultdict(lambda: {"amount": 0, "unit": "", "category": "other"})
+        return await self.shopping_list_repo.get_by_id_with_items(shopping_list.id)  # type: ignore
 
-        for slot in slots:
-            if not slot.recipe or not slot.recipe.ingredients:
-                continue
+    async def sync_meal_slots(
+        self,
+        meal_plan_id: str,
+        slot_ids: list[str],
+        removed: bool = False,
+    ) -> None:
+        """
+        Apply meal slot changes to the meal plan's generated shopping list.
+
+        The slots' previous contributions are withdrawn and, unless the slots were
+        removed, their current ones added back, so only the touched items change
+        and their checked state is kept. Call with removed=True before deleting
+        slots; otherwise after the slots are written.
+        """
+        if not slot_ids:
+            return
+        shopping_list = await self.shopping_list_repo.get_auto_sync_by_meal_plan_id(meal_plan_id)
+        if not shopping_list:
+            return
+
+        affected = set(await self.shopping_list_repo.delete_slot_contributions(slot_ids))
+        if not removed:
+            rows = await self.meal_plan_repo.aggregate_slot_ingredients(
+                meal_plan_id,
+                dates=shopping_list.filter_dates,
+                meal_types=shopping_list.filter_meal_types,
+                slot_ids=slot_ids,
+            )
+            affected |= await self._apply_contributions(shopping_list.id, rows, match_existing=True)
 
-            servings_multiplier = slot.servings / slot.recipe.servings
+        if affected:
+            await self._recompute_items(list(affected))
+        await self.shopping_list_repo.bump_version(shopping_list.id)
 
-            for ing in slot.recipe.ingredients:
-                key = (ing.name.lower(), ing.unit.lower())
-                aggregated[key]["amount"] += float(ing.amount) * servings_multiplier
-                aggregated[key]["unit"] = ing.unit
-                aggregated[key]["category"] = self._categorize_ingredient(ing.name)
+    async def _apply_contributions(
+        self,
+        shopping_list_id: str,
+        rows: list,
+        checked_keys: set[tuple[str, str]] | None = None,
+        match_existing: bool = False,
+    ) -> set[str]:
+        """
+        Store per-slot ingredient rows as contributions to the list's items.
+
+        Items missing for a (name, unit) key are created with the summed amount.
+        Returns ids of pre-existing items that gained contributions, whose
+        amounts the caller has to recompute.
+        """
+        totals: dict[tuple[str, str], float] = defaultdict(float)
+        categories: dict[tuple[str, str], str | None] = {}
+        for row in rows:
+            key = (row.name, row.unit)
+            totals[key] += float(row.amount or 0)
+            categories[key] = row.category or categories.get(key)
+        if not totals:
+            return set()
+
+        existing = {}
+        if match_existing:
+            items = await self.shopping_list_repo.get_items_by_keys(shopping_list_id, list(totals))
+            existing = {(item.ingredient_key, item.canonical_unit): item for item in items}
+
+        new_keys = [key for key in totals if key not in existing]
+        new_items = await self.shopping_list_repo.add_items(
+            shopping_list_id,
+            [
+                self._generated_item_data(
+                    key,
+                    totals[key],
+                    categories[key],
+                    is_checked=key in (checked_keys or ()),
+                )
+                for key in new_keys
+            ],
+        )
 
-        items_data = []
-        for (name_lower, _), data in aggregated.items():
-            items_data.append(
+        item_ids = {key: item.id for key, item in existing.items()}
+        item_ids.update((key, item.id) for key, item in zip(new_keys, new_items))
+        await self.shopping_list_repo.add_contributions(
+            [
                 {
-                    "ingredient_name": name_lower.title(),
-                    "amount": round(data["amount"], 2),
-                    "unit": data["unit"],
-                    "category": data["category"],
-                    "is_checked": False,
+                    "shopping_item_id": item_ids[(row.name, row.unit)],
+                    "meal_slot_id": row.slot_id,
+                    "amount": float(row.amount or 0),
                 }
-            )
-
-        if items_data:
-            await self.shopping_list_repo.add_items(shopping_list.id, items_data)
-
-        return await self.shopping_list_repo.get_by_id_with_items(shopping_list.id)  # type: ignore
-
-    def _categorize_ingredient(self, name: str) -> str:
-        name_lower = name.lower()
-
-        produce_keywords = [
-            "채소",
-            "야채",
-            "과일",
-            "상추",
-            "당근",
-            "양파",
-            "마늘",
-            "토마토",
-            "감자",
-        ]
-        meat_keywords = ["고기", "소고기", "돼지", "닭", "beef", "pork", "chicken"]
-        dairy_keywords = ["우유", "치즈", "버터", "요구르트", "milk", "cheese"]
-        bakery_keywords = ["빵", "bread", "베이커리"]
-        frozen_keywords = ["냉동", "frozen"]
-
-        for kw in produce_keywords:
-            if kw in name_lower:
-                return "produce"
-        for kw in meat_keywords:
-            if kw in name_lower:
-                return "meat"
-        for kw in dairy_keywords:
-            if kw in name_lower:
-                return "dairy"
-        for kw in bakery_keywords:
-            if kw in name_lower:
-                return "bakery"
-        for kw in frozen_keywords:
-            if kw in name_lower:
-                return "frozen"
-
-        return "pantry"
+                for row in rows
+            ]
+        )
+        return {item.id for item in existing.values()}
+
+    async def _recompute_items(self, item_ids: list[str]) -> None:
+        """Reset generated items to the sum of their contributions."""
+        totals = await self.shopping_list_repo.get_contribution_totals(item_ids)
+        for item in await self.shopping_list_repo.get_items_by_ids(item_ids):
+            if item.id not in totals:
+                # No slot needs this ingredient any more
+                await self.session.delete(item)
+                continue
+            amount, unit = to_display_unit(totals[item.id], item.canonical_unit or item.unit)
+            item.amount = round(amount, 2)
+            item.unit = unit
+        await self.session.flush()
+
+    @staticmethod
+    def _generated_item_data(
+        key: tuple[str, str],
+        canonical_amount: float,
+        category: str | None,
+        is_checked: bool = False,
+    ) -> dict:
+        name, canonical_unit = key
+        amount, unit = to_display_unit(canonical_amount, canonical_unit)
+        return {
+            "ingredient_name": name.title(),
+            "amount": round(amount, 2),
+            "unit": unit,
+            "category": category or categorize_ingredient(name),
+            "is_checked": is_checked,
+            "ingredient_key": name,
+            "canonical_unit": canonical_unit,
+        }
 
     async def add_item(
         self,
@@ -204,12 +287,13 @@ class ShoppingListService:
         user_id: str,
         data: ShoppingItemCreate,
     ) -> ShoppingItem:
-        await self.get_shopping_list(shopping_list_id, user_id)
+        await self._verify_owner(shopping_list_id, user_id)
 
         item = await self.shopping_list_repo.add_item(
             shopping_list_id,
             data.model_dump(),
         )
+        await self.shopping_list_repo.bump_version(shopping_list_id)
 
         return item
 
@@ -220,7 +304,7 @@ class ShoppingListService:
         user_id: str,
         data: ShoppingItemUpdate,
     ) -> ShoppingItem:
-        await self.get_shopping_list(shopping_list_id, user_id)
+        await self._verify_owner(shopping_list_id, user_id)
 
         item = await self.shopping_list_repo.get_item_by_id(item_id)
         if not item or item.shopping_list_id != shopping_list_id:
@@ -228,6 +312,7 @@ class ShoppingListService:
 
         update_data = data.model_dump(exclude_unset=True)
         item = await self.shopping_list_repo.update_item(item, update_data)
+        await self.shopping_list_repo.bump_version(shopping_list_id)
 
         return item
 
@@ -237,13 +322,14 @@ class ShoppingListService:
         item_id: str,
         user_id: str,
     ) -> None:
-        await self.get_shopping_list(shopping_list_id, user_id)
+        await self._verify_owner(shopping_list_id, user_id)
 
         item = await self.shopping_list_repo.get_item_by_id(item_id)
         if not item or item.shopping_list_id != shopping_list_id:
             raise NotFoundError("ShoppingItem", item_id)
 
         await self.shopping_list_repo.delete_item(item)
+        await self.shopping_list_repo.bump_version(shopping_list_id)
 
     async def check_item(
         self,
@@ -259,6 +345,65 @@ class ShoppingListService:
             ShoppingItemUpdate(is_checked=is_checked),
         )
 
+    async def batch_update_items(
+        self,
+        shopping_list_id: str,
+        user_id: str,
+        data: ShoppingItemBatchRequest,
+    ) -> ShoppingList:
+        """
+        Apply item updates, checks, deletes and adds in one transaction.
+
+        Ownership is verified once and every referenced item must belong to the
+        list; each kind of change then runs as a single set-based statement.
+        """
+        await self._verify_owner(shopping_list_id, user_id)
+
+        check_ids, uncheck_ids, delete_ids = set(data.check), set(data.uncheck), set(data.delete)
+        update_ids = [u.id for u in data.update]
+        if check_ids & uncheck_ids:
+            raise BadRequestError("Items cannot be both checked and unchecked")
+        if delete_ids & (check_ids | uncheck_ids | set(update_ids)):
+            raise BadRequestError("Deleted items cannot also be updated")
+        if len(update_ids) != len(set(update_ids)):
+            raise BadRequestError("Each item can only be updated once")
+
+        referenced = check_ids | uncheck_ids | delete_ids | set(update_ids)
+        if referenced:
+            found = await self.shopping_list_repo.get_item_ids(shopping_list_id, list(referenced))
+            missing = referenced - found
+            if missing:
+                raise NotFoundError("ShoppingItem", sorted(missing)[0])
+
+        update_rows = []
+        for update in data.update:
+            fields = {
+                field: value
+                for field, value in update.model_dump(exclude_unset=True, exclude={"id"}).items()
+                if value is not None
+            }
+            if fields:
+                update_rows.append({"id": update.id, **fields})
+        if update_rows:
+            await self.shopping_list_repo.update_items(update_rows)
+        if check_ids:
+            await self.shopping_list_repo.check_all_items(
+                shopping_list_id, True, item_ids=list(check_ids)
+            )
+        if uncheck_ids:
+            await self.shopping_list_repo.check_all_items(
+                shopping_list_id, False, item_ids=list(uncheck_ids)
+            )
+        if delete_ids:
+            await self.shopping_list_repo.delete_items(shopping_list_id, list(delete_ids))
+        if data.add:
+            await self.shopping_list_repo.add_items(
+                shopping_list_id, [item.model_dump() for item in data.add]
+            )
+        await self.shopping_list_repo.bump_version(shopping_list_id)
+
+        return await self.shopping_list_repo.get_by_id_with_items(shopping_list_id)  # type: ignore
+
     async def delete_shopping_list(
         self,
         shopping_list_id: str,
@@ -394,6 +394,55 @@ class TestMealPlanEndpoints:
         data = response.json()
         assert data["success"] is True
 
+    async def test_get_meal_plan_by_week_not_modified(
+        self,
+        async_client: AsyncClient,
+        auth_headers: dict,
+        sample_meal_plan_data: dict,
+    ):
+        """Test polling a week with its ETag returns 304 until the plan changes."""
+        await async_client.post(
+            "/api/v1/meal-plans",
+            json=sample_meal_plan_data,
+            headers=auth_headers,
+        )
+        url = f"/api/v1/meal-plans/week/{sample_meal_plan_data['week_start_date']}"
+
+        response = await async_client.get(url, headers=auth_headers)
+        etag = response.headers["ETag"]
+
+        response = await async_client.get(url, headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+
+        response = await async_client.get(url, headers={**auth_headers, "If-None-Match": '"stale"'})
+        assert response.status_code == 200
+
+    async def test_copy_meal_plan_to_next_week(
+        self,
+        async_client: AsyncClient,
+        auth_headers: dict,
+        sample_meal_plan_data: dict,
+    ):
+        """Test copying a meal plan creates the target week's plan."""
+        response = await async_client.post(
+            "/api/v1/meal-plans",
+            json=sample_meal_plan_data,
+            headers=auth_headers,
+        )
+        meal_plan_id = response.json()["data"]["id"]
+
+        response = await async_client.post(
+            f"/api/v1/meal-plans/{meal_plan_id}/copy",
+            json={"target_week_start_date": "2026-02-03"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 201
+        data = response.json()
+        assert data["data"]["week_start_date"] == "2026-02-02"
+        assert data["data"]["id"] != meal_plan_id
+
     async def test_get_nonexistent_week_meal_plan(
         self,
         async_client: AsyncClient,
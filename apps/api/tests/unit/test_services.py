@@ -7,7 +7,10 @@ import pytest
 from src.core.exceptions import (
     AuthenticationError,
     EmailAlreadyExistsError,
+    MealPlanNotFoundError,
+    NotFoundError,
     RecipeNotFoundError,
+    ShoppingListNotFoundError,
 )
 from src.models.ingredient import Ingredient
 from src.models.instruction import Instruction
@@ -17,6 +20,7 @@ from src.schemas.auth import LoginRequest, RegisterRequest
 from src.schemas.recipe import IngredientCreate, InstructionCreate, RecipeCreate, RecipeSearchParams
 from src.services.auth import AuthService
 from src.services.recipe import RecipeService
+from src.services.shopping_list import ShoppingListService
 
 
 class TestAuthService:
@@ -268,6 +272,55 @@ class TestRecipeService:
         assert result.servings == 4
         assert result.ingredients[0].amount == 200  # 100 * 2
 
+    async def test_delete_recipe_invalidates_detail_cache(self, recipe_service, sample_recipe):
+        """Test deleting a recipe invalidates its cached browse detail."""
+        recipe_service.recipe_repo.get_by_id_with_details = AsyncMock(return_value=sample_recipe)
+        recipe_service.recipe_repo.delete = AsyncMock()
+        recipe_service.detail_cache = MagicMock()
+        recipe_service.detail_cache.invalidate = AsyncMock()
+
+        await recipe_service.delete_recipe("recipe-123", "user-123")
+
+        recipe_service.detail_cache.invalidate.assert_awaited_once_with("recipe-123")
+
+    async def test_browse_recipe_json_cache_hit(self, recipe_service):
+        """Test a cached browse detail document is served without a query."""
+        recipe_service.recipe_repo.get_detail_json = AsyncMock()
+        recipe_service.detail_cache = MagicMock()
+        recipe_service.detail_cache.get = AsyncMock(return_value='{"id":"recipe-123"}')
+
+        document = await recipe_service.get_browse_recipe_json("recipe-123")
+
+        assert document == '{"id":"recipe-123"}'
+        recipe_service.recipe_repo.get_detail_json.assert_not_awaited()
+
+    async def test_browse_recipe_json_cache_miss_fills(self, recipe_service):
+        """Test a cache miss reads the database document and stores it."""
+        recipe_service.recipe_repo.get_detail_json = AsyncMock(return_value='{"id":"recipe-123"}')
+        recipe_service.detail_cache = MagicMock()
+        recipe_service.detail_cache.get = AsyncMock(return_value=None)
+        recipe_service.detail_cache.fill = AsyncMock()
+
+        document = await recipe_service.get_browse_recipe_json("recipe-123")
+
+        assert document == '{"id":"recipe-123"}'
+        recipe_service.detail_cache.fill.assert_awaited_once_with("recipe-123", document)
+
+    async def test_find_by_ingredients_pagination(self, recipe_service):
+        """Test ingredient matching passes the offset and builds page meta."""
+        recipe_service.recipe_repo.match_ingredients = AsyncMock(return_value=([], 45))
+
+        rows, meta = await recipe_service.find_by_ingredients(
+            ["양파", "계란"], min_coverage=0.5, page=3, limit=20
+        )
+
+        assert rows == []
+        assert meta.total == 45
+        assert meta.total_pages == 3
+        recipe_service.recipe_repo.match_ingredients.assert_awaited_once_with(
+            ingredients=["양파", "계란"], min_coverage=0.5, skip=40, limit=20
+        )
+
     async def test_adjust_servings_same_value(self, recipe_service, sample_recipe):
         """Test adjusting servings to same value does nothing."""
         recipe_service.recipe_repo.get_by_id_with_details = AsyncMock(return_value=sample_recipe)
@@ -278,6 +331,462 @@ class TestRecipeService:
         assert result.ingredients[0].amount == 100  # unchanged
 
 
+class TestRawApiResponse:
+    """Tests for sending documents serialized by the database."""
+
+    def test_wraps_document_in_envelope(self):
+        """Test the document becomes the data of an ApiResponse body unchanged."""
+        import json
+
+        from src.core.responses import raw_api_response
+
+        document = '{"id" : "recipe-1", "ingredients" : [{"name" : "양파"}]}'
+        response = raw_api_response(document)
+
+        assert response.media_type == "application/json"
+        assert document in response.body.decode()
+        assert json.loads(response.body) == {
+            "success": True,
+            "data": {"id": "recipe-1", "ingredients": [{"name": "양파"}]},
+            "error": None,
+            "meta": None,
+        }
+
+
+class TestRecipeDetailCache:
+    """Tests for the browse recipe detail cache."""
+
+    async def test_invalidation_marker_is_a_miss(self):
+        """Test the empty invalidation marker reads as a miss."""
+        from src.services.recipe_detail_cache import RecipeDetailCache
+
+        redis = MagicMock()
+        redis.get = AsyncMock(return_value="")
+
+        assert await RecipeDetailCache(redis).get("recipe-123") is None
+
+    async def test_fill_does_not_overwrite_marker(self):
+        """Test fills use SET NX so a pending invalidation blocks them."""
+        from src.services.recipe_detail_cache import (
+            DETAIL_TTL_SECONDS,
+            RecipeDetailCache,
+            detail_cache_key,
+        )
+
+        redis = MagicMock()
+        redis.set = AsyncMock(return_value=None)
+
+        await RecipeDetailCache(redis).fill("recipe-123", "{}")
+
+        redis.set.assert_awaited_once_with(
+            detail_cache_key("recipe-123"), "{}", ex=DETAIL_TTL_SECONDS, nx=True
+        )
+
+    async def test_invalidate_writes_markers(self):
+        """Test invalidation replaces each document with a short-lived marker."""
+        from src.services.recipe_detail_cache import (
+            INVALIDATION_HOLD_SECONDS,
+            RecipeDetailCache,
+            detail_cache_key,
+        )
+
+        pipe = MagicMock()
+        pipe.execute = AsyncMock()
+        redis = MagicMock()
+        redis.pipeline.return_value = pipe
+
+        await RecipeDetailCache(redis).invalidate("recipe-1", "recipe-2")
+
+        assert [c.args for c in pipe.set.call_args_list] == [
+            (detail_cache_key("recipe-1"), ""),
+            (detail_cache_key("recipe-2"), ""),
+        ]
+        assert all(c.kwargs == {"ex": INVALIDATION_HOLD_SECONDS} for c in pipe.set.call_args_list)
+        pipe.execute.assert_awaited_once()
+
+    async def test_redis_errors_fall_back_to_database(self):
+        """Test a Redis failure is treated as a miss."""
+        from src.services.recipe_detail_cache import RecipeDetailCache
+
+        redis = MagicMock()
+        redis.get = AsyncMock(side_effect=ConnectionError("down"))
+
+        assert await RecipeDetailCache(redis).get("recipe-123") is None
+
+    async def test_detail_document_has_every_response_field(self):
+        """Test the database document has the keys a cached recipe is dumped with."""
+        from src.repositories.recipe import RecipeRepository
+        from src.schemas.recipe import BrowseRecipeWithDetailsResponse
+
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=MagicMock())
+        await RecipeRepository(session).get_detail_json("recipe-123")
+
+        (statement,) = session.execute.call_args.args
+        # SELECT CAST(json_build_object('key', value, ...) AS TEXT)
+        arguments = statement.selected_columns[0].clause.clauses.clauses
+        keys = [key.name.strip("'") for key in arguments[::2]]
+        assert keys == list(BrowseRecipeWithDetailsResponse.model_fields)
+
+
+class TestRecipeInteractionService:
+    """Tests for RecipeInteractionService."""
+
+    async def test_get_recipe_stats_reads_counters(self):
+        """Test stats come from the recipe counters in a single lookup."""
+        from src.services.recipe_interaction import RecipeInteractionService
+
+        session = MagicMock()
+        result = MagicMock()
+        result.one_or_none.return_value = MagicMock(rating_sum=9, rating_count=2, favorites_count=3)
+        session.execute = AsyncMock(return_value=result)
+
+        stats = await RecipeInteractionService(session).get_recipe_stats("recipe-1")
+
+        assert stats.average_rating == 4.5
+        assert stats.total_ratings == 2
+        assert stats.favorites_count == 3
+        session.execute.assert_awaited_once()
+
+    async def test_get_recipe_stats_not_found(self):
+        """Test stats for a missing recipe raise NotFoundError."""
+        from src.services.recipe_interaction import RecipeInteractionService
+
+        session = MagicMock()
+        result = MagicMock()
+        result.one_or_none.return_value = None
+        session.execute = AsyncMock(return_value=result)
+
+        with pytest.raises(NotFoundError):
+            await RecipeInteractionService(session).get_recipe_stats("missing")
+
+    async def test_get_list_extras(self):
+        """Test list extras cover every id and only the requested fields."""
+        from src.services.recipe_interaction import RecipeInteractionService
+
+        service = RecipeInteractionService(MagicMock())
+        service.interaction_repo = MagicMock()
+        service.interaction_repo.get_list_interactions = AsyncMock(
+            return_value={
+                "recipe-1": {
+                    "user_rating": 4,
+                    "is_favorite": True,
+                    "stats": {"average_rating": 4.0, "total_ratings": 1, "favorites_count": 1},
+                }
+            }
+        )
+
+        extras = await service.get_list_extras(
+            "user-1", ["recipe-1", "cached-1"], {"interactions", "stats"}
+        )
+
+        service.interaction_repo.get_list_interactions.assert_awaited_once_with(
+            "user-1", ["recipe-1", "cached-1"]
+        )
+        assert extras["recipe-1"]["interactions"].user_rating == 4
+        assert extras["recipe-1"]["interactions"].is_favorite is True
+        assert extras["recipe-1"]["stats"].average_rating == 4.0
+        assert extras["cached-1"]["interactions"].is_favorite is False
+        assert extras["cached-1"]["stats"].total_ratings == 0
+
+        stats_only = await service.get_list_extras("user-1", ["recipe-1"], {"stats"})
+        assert set(stats_only["recipe-1"]) == {"stats"}
+
+    async def test_get_list_extras_without_include(self):
+        """Test no include skips the interaction query."""
+        from src.services.recipe_interaction import RecipeInteractionService
+
+        service = RecipeInteractionService(MagicMock())
+        service.interaction_repo = MagicMock()
+        service.interaction_repo.get_list_interactions = AsyncMock()
+
+        assert await service.get_list_extras("user-1", ["recipe-1"], set()) == {}
+        service.interaction_repo.get_list_interactions.assert_not_awaited()
+
+    async def test_buffered_add_favorite_reads_database_once(self):
+        """Test a cold buffered change reads the database state, a warm one does not."""
+        from src.services.recipe_interaction import RecipeInteractionService
+
+        service = RecipeInteractionService(MagicMock())
+        service.favorite_buffer = MagicMock()
+        service.favorite_buffer.set = AsyncMock(side_effect=[None, (False, True), (True, False)])
+        service.interaction_repo = MagicMock()
+        service.interaction_repo.get_favorite_state = AsyncMock(return_value=False)
+
+        assert await service.add_favorite("user-1", "recipe-1") is True
+        service.favorite_buffer.set.assert_awaited_with("user-1", "recipe-1", True, db_state=False)
+
+        assert await service.toggle_favorite("user-1", "recipe-1") is False
+        service.interaction_repo.get_favorite_state.assert_awaited_once()
+
+    async def test_buffered_favorite_missing_recipe(self):
+        """Test buffered changes to a missing recipe are rejected without buffering."""
+        from src.services.recipe_interaction import RecipeInteractionService
+
+        service = RecipeInteractionService(MagicMock())
+        service.favorite_buffer = MagicMock()
+        service.favorite_buffer.set = AsyncMock(return_value=None)
+        service.interaction_repo = MagicMock()
+        service.interaction_repo.get_favorite_state = AsyncMock(return_value=None)
+
+        with pytest.raises(NotFoundError):
+            await service.toggle_favorite("user-1", "missing")
+        assert await service.remove_favorite("user-1", "missing") is False
+        assert service.favorite_buffer.set.await_count == 2
+
+    async def test_favorite_buffer_flush_clears_after_commit(self):
+        """Test a flush writes all pending changes in one commit before clearing them."""
+        from src.services.favorite_buffer import FavoriteWriteBuffer
+
+        read_pipe = MagicMock()
+        read_pipe.execute = AsyncMock(return_value=[{"recipe-1": "1:7", "recipe-2": "0:8"}])
+        clear_pipe = MagicMock()
+        clear_pipe.execute = AsyncMock()
+        redis = MagicMock()
+        redis.pipeline.side_effect = [read_pipe, clear_pipe]
+
+        session = MagicMock()
+        session.execute = AsyncMock()
+        session.commit = AsyncMock(side_effect=lambda: clear_pipe.execute.assert_not_awaited())
+        factory = MagicMock()
+        factory.return_value.__aenter__ = AsyncMock(return_value=session)
+        factory.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        assert await FavoriteWriteBuffer(redis, factory).flush(["user-1"]) == 1
+
+        assert session.execute.await_count == 3  # lock, insert, delete
+        session.commit.assert_awaited_once()
+        clear_args = clear_pipe.eval.call_args.args
+        assert clear_args[-5:] == ("user-1", "recipe-1", "1:7", "recipe-2", "0:8")
+        clear_pipe.execute.assert_awaited_once()
+
+    async def test_favorite_buffer_interleaved_flushes_keep_latest(self, monkeypatch):
+        """Test a flush started during another waits for it, so the newer change commits last."""
+        import asyncio
+
+        from src.services import favorite_buffer
+        from src.services.favorite_buffer import FavoriteWriteBuffer
+
+        dirty = {"recipe-1": "1:1"}
+        favorites: set[str] = set()
+        # Stands in for the per-user advisory lock, held until commit
+        lock = asyncio.Lock()
+        first_applied = asyncio.Event()
+        resume_first = asyncio.Event()
+
+        class Pipeline:
+            def __init__(self):
+                self.ops = []
+
+            def hgetall(self, key):
+                self.ops.append(lambda: dict(dirty))
+
+            def eval(self, script, numkeys, dirty_key, users_key, user_id, *pairs):
+                def clear():
+                    for recipe_id, value in zip(pairs[::2], pairs[1::2]):
+                        if dirty.get(recipe_id) == value:
+                            del dirty[recipe_id]
+
+                self.ops.append(clear)
+
+            async def execute(self):
+                return [op() for op in self.ops]
+
+        class Session:
+            def __init__(self):
+                self.writes = []
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc_info):
+                return False
+
+            async def commit(self):
+                for added, removed in self.writes:
+                    favorites.update(recipe_id for _, recipe_id in added)
+                    favorites.difference_update(recipe_id for _, recipe_id in removed)
+                lock.release()
+
+        class Repository:
+            def __init__(self, session):
+                self.session = session
+
+            async def lock_favorite_flush(self, user_ids):
+                await lock.acquire()
+
+            async def apply_favorite_changes(self, added, removed):
+                self.session.writes.append((added, removed))
+                if not first_applied.is_set():
+                    first_applied.set()
+                    await resume_first.wait()
+
+        monkeypatch.setattr(favorite_buffer, "RecipeInteractionRepository", Repository)
+        redis = MagicMock()
+        redis.pipeline.side_effect = Pipeline
+        buffer = FavoriteWriteBuffer(redis, Session)
+
+        first = asyncio.create_task(buffer.flush(["user-1"]))
+        await first_applied.wait()
+        dirty["recipe-1"] = "0:2"  # unfavorited while the first flush writes "1"
+        second = asyncio.create_task(buffer.flush(["user-1"]))
+        await asyncio.sleep(0)
+        resume_first.set()
+        await asyncio.gather(first, second)
+
+        assert favorites == set()
+        assert dirty == {}
+
+    async def test_favorite_changes_update_trending(self):
+        """Test only favorites that change state reach the trending leaderboard."""
+        from src.services.recipe_interaction import RecipeInteractionService
+
+        service = RecipeInteractionService(MagicMock())
+        service.leaderboards = MagicMock()
+        service.leaderboards.record_favorite = AsyncMock()
+        service.recipe_repo = MagicMock()
+        service.recipe_repo.get_by_id = AsyncMock(return_value=Recipe(id="recipe-1"))
+        service.interaction_repo = MagicMock()
+        service.interaction_repo.get_favorite = AsyncMock(side_effect=[None, MagicMock(), None])
+        service.interaction_repo.add_favorite = AsyncMock()
+        service.interaction_repo.remove_favorite = AsyncMock()
+
+        assert await service.add_favorite("user-1", "recipe-1") is True
+        assert await service.add_favorite("user-1", "recipe-1") is False
+        assert await service.remove_favorite("user-1", "other") is False
+
+        service.leaderboards.record_favorite.assert_awaited_once_with("recipe-1", True, None)
+        service.interaction_repo.remove_favorite.assert_not_awaited()
+
+    async def test_removals_take_back_weight_at_created_at(self):
+        """Test removing a favorite or rating subtracts its weight decayed to when it was made."""
+        from datetime import UTC, datetime
+
+        from src.services.leaderboard import (
+            FAVORITE_WEIGHT,
+            HALF_LIFE_SECONDS,
+            RATING_WEIGHT,
+            RecipeLeaderboards,
+        )
+        from src.services.recipe_interaction import RecipeInteractionService
+
+        favorited_at = datetime(2026, 10, 1, tzinfo=UTC)
+        rated_at = datetime(2026, 10, 2, tzinfo=UTC)
+        redis = MagicMock()
+        redis.eval = AsyncMock()
+        redis.zrem = AsyncMock()
+        service = RecipeInteractionService(MagicMock(), redis)
+        service.favorite_buffer = None
+        service.interaction_repo = MagicMock()
+        service.interaction_repo.get_favorite = AsyncMock(
+            return_value=MagicMock(created_at=favorited_at)
+        )
+        service.interaction_repo.remove_favorite = AsyncMock()
+        service.interaction_repo.get_user_rating = AsyncMock(
+            return_value=MagicMock(created_at=rated_at)
+        )
+        service.interaction_repo.delete_rating = AsyncMock()
+        service.interaction_repo.get_recipe_stats = AsyncMock(return_value=None)
+
+        assert isinstance(service.leaderboards, RecipeLeaderboards)
+        assert await service.remove_favorite("user-1", "recipe-1") is True
+        await service.delete_rating("user-1", "recipe-1")
+
+        favorite_args, rating_args = (call.args[2] for call in redis.eval.await_args_list)
+        assert favorite_args == [
+            favorited_at.timestamp(),
+            HALF_LIFE_SECONDS,
+            "recipe-1",
+            -FAVORITE_WEIGHT,
+        ]
+        assert rating_args == [rated_at.timestamp(), HALF_LIFE_SECONDS, "recipe-1", -RATING_WEIGHT]
+
+    async def test_rating_updates_leaderboards(self):
+        """Test a new rating refreshes top_rated from the counters and adds to trending."""
+        from src.schemas.recipe_interaction import RecipeRatingCreate
+        from src.services.leaderboard import RATING_WEIGHT
+        from src.services.recipe_interaction import RecipeInteractionService
+
+        stats = {"average_rating": 4.0, "total_ratings": 2, "favorites_count": 0}
+        service = RecipeInteractionService(MagicMock())
+        service.leaderboards = MagicMock()
+        service.leaderboards.record_rating = AsyncMock()
+        service.recipe_repo = MagicMock()
+        service.recipe_repo.get_by_id = AsyncMock(return_value=Recipe(id="recipe-1"))
+        service.interaction_repo = MagicMock()
+        service.interaction_repo.get_user_rating = AsyncMock(return_value=None)
+        service.interaction_repo.create_rating = AsyncMock()
+        service.interaction_repo.get_recipe_stats = AsyncMock(return_value=stats)
+
+        await service.rate_recipe("user-1", "recipe-1", RecipeRatingCreate(rating=5))
+
+        service.leaderboards.record_rating.assert_awaited_once_with(
+            "recipe-1", stats, RATING_WEIGHT, None
+        )
+
+    async def test_get_leaderboard_drops_deleted_recipes(self):
+        """Test leaderboard members without a recipe are skipped and removed."""
+        from src.services.recipe_interaction import RecipeInteractionService
+
+        service = RecipeInteractionService(MagicMock())
+        service.leaderboards = MagicMock()
+        service.leaderboards.top = AsyncMock(return_value=[("recipe-2", 9.0), ("gone", 5.0)])
+        service.leaderboards.remove = AsyncMock()
+        service.recipe_repo = MagicMock()
+        service.recipe_repo.get_by_ids = AsyncMock(return_value=[Recipe(id="recipe-2")])
+
+        leaders = await service.get_leaderboard("trending", 2)
+
+        assert [(recipe.id, score) for recipe, score in leaders] == [("recipe-2", 9.0)]
+        service.leaderboards.remove.assert_awaited_once_with("trending", "gone")
+
+    async def test_get_leaderboards_without_redis(self):
+        """Test the leaderboards read as empty when the service has no Redis."""
+        from src.services.recipe_interaction import RecipeInteractionService
+
+        service = RecipeInteractionService(MagicMock())
+
+        assert await service.get_leaderboard("trending") == []
+        assert await service.get_import_leaderboard() == []
+
+    async def test_leaderboard_top_rated_score(self):
+        """Test top_rated uses the damped average and drops recipes without ratings."""
+        from src.services.leaderboard import RecipeLeaderboards, board_key, damped_rating
+
+        redis = MagicMock()
+        redis.zadd = AsyncMock()
+        redis.zrem = AsyncMock()
+        leaderboards = RecipeLeaderboards(redis)
+
+        await leaderboards.record_rating(
+            "recipe-1", {"average_rating": 5.0, "total_ratings": 1, "favorites_count": 0}
+        )
+        await leaderboards.record_rating(
+            "recipe-2", {"average_rating": None, "total_ratings": 0, "favorites_count": 0}
+        )
+
+        redis.zadd.assert_awaited_once_with(
+            board_key("top_rated"), {"recipe-1": damped_rating(5, 1)}
+        )
+        redis.zrem.assert_awaited_once_with(board_key("top_rated"), "recipe-2")
+        assert damped_rating(5, 1) < damped_rating(45, 10)
+
+    def test_parse_include(self):
+        """Test include accepts comma-separated known values only."""
+        from src.api.v1.endpoints.recipes import _parse_include
+        from src.core.exceptions import BadRequestError
+
+        assert _parse_include(None) == set()
+        assert _parse_include("interactions, stats") == {"interactions", "stats"}
+        with pytest.raises(BadRequestError):
+            _parse_include("interactions,reviews")
+
+    def test_average_rating(self):
+        """Test the recipe average is derived from the counters."""
+        assert Recipe(rating_sum=7, rating_count=2).average_rating == 3.5
+        assert Recipe(rating_sum=0, rating_count=0).average_rating is None
+
+
 class TestURLExtractorService:
     """Tests for URLExtractorService."""
 
@@ -406,3 +915,1095 @@ class TestSecurityFunctions:
             decode_token("invalid-token")
 
         assert exc_info.value.status_code == 401
+
+
+class TestMealTypeTagger:
+    """Tests for the compiled meal type matcher."""
+
+    @pytest.mark.parametrize(
+        ("title", "expected"),
+        [
+            ("김치볶음밥", ["lunch"]),
+            ("떡볶이", ["snack"]),
+            ("해물전골", ["dinner", "snack"]),
+            ("French Toast", ["breakfast"]),
+            ("Fried Rice Bowl", ["lunch"]),
+            ("Belgian Waffle", ["breakfast", "snack"]),
+            ("Eggplant Parmesan", ["dinner", "lunch"]),
+        ],
+    )
+    def test_classify_meal_types(self, title, expected):
+        """Test overlapping and word-bounded keyword hits."""
+        from src.services.meal_type_tagger import classify_meal_types
+
+        assert classify_meal_types(title) == expected
+
+    def test_classify_uses_categories_and_tags(self):
+        """Test category mapping and tag keywords are combined."""
+        from src.services.meal_type_tagger import classify_meal_types
+
+        result = classify_meal_types(
+            "Mystery Dish",
+            title_original="Plain",
+            categories=["Dessert"],
+            tags=["Breakfast"],
+        )
+
+        assert result == ["breakfast", "snack"]
+
+    def test_classify_meal_types_batch_matches_single(self):
+        """Test batch classification returns per-record results in order."""
+        from src.services.meal_type_tagger import classify_meal_types, classify_meal_types_batch
+
+        titles = ["김치찌개", "Pancake", "Mystery Dish"]
+        categories = [["side"], None, ["dessert"]]
+
+        result = classify_meal_types_batch(titles, categories=categories)
+
+        assert result == [
+            classify_meal_types(title, categories=cats) for title, cats in zip(titles, categories)
+        ]
+
+    def test_classify_meal_types_batch_process_pool(self, monkeypatch):
+        """Test batches over the threshold are split across worker processes."""
+        from src.services import meal_type_tagger
+
+        monkeypatch.setattr(meal_type_tagger, "PARALLEL_BATCH_THRESHOLD", 4)
+        titles = ["비빔밥", "Beef Stew", "Chocolate Cake", "Oatmeal", "Plain Rice"]
+
+        result = meal_type_tagger.classify_meal_types_batch(titles, max_workers=2)
+
+        assert result == [meal_type_tagger.classify_meal_types(t) for t in titles]
+
+
+class TestPrefetchRecipes:
+    """Tests for the recipe prefetch script."""
+
+    async def test_store_batch_isolates_failed_upserts(self, monkeypatch):
+        """Test one failing upsert is counted alone and the rest of the batch commits."""
+        from src.scripts import prefetch_recipes
+
+        invalidate = AsyncMock()
+        monkeypatch.setattr(prefetch_recipes, "_tag_meal_types", lambda batch: None)
+        monkeypatch.setattr(prefetch_recipes, "_invalidate_details", invalidate)
+        session = MagicMock()
+        session.begin_nested.return_value.__aexit__ = AsyncMock(return_value=False)
+        session.commit = AsyncMock()
+        repo = MagicMock()
+        repo.upsert = AsyncMock(
+            side_effect=[MagicMock(id="c-1"), ValueError("bad payload"), MagicMock(id="c-3")]
+        )
+        batch = [{"external_id": "1"}, {"external_id": "2"}, {"external_id": "3"}]
+        stats = {"new": 0, "failed": 0}
+
+        await prefetch_recipes._store_batch(session, repo, batch, stats)
+
+        assert stats == {"new": 2, "failed": 1}
+        assert session.begin_nested.call_count == 3
+        session.commit.assert_awaited_once()
+        invalidate.assert_awaited_once_with(["c-1", "c-3"])
+        assert batch == []
+
+
+class TestSeedRecipeService:
+    """Tests for the indexed seed recipe service."""
+
+    @pytest.fixture
+    def service(self):
+        from src.services.seed_recipe import SeedRecipeService
+
+        return SeedRecipeService(
+            {
+                "recipes": [
+                    {
+                        "id": "kr-1",
+                        "title": "김치찌개",
+                        "description": "매콤한 돼지고기 김치 찌개",
+                        "categories": ["Dinner"],
+                        "tags": ["한식", "찌개"],
+                        "calories": 450,
+                        "protein_grams": 25.0,
+                    },
+                    {
+                        "id": "kr-2",
+                        "title": "김치볶음밥",
+                        "description": None,
+                        "categories": ["lunch"],
+                        "tags": ["볶음밥"],
+                    },
+                    {
+                        "id": "kr-3",
+                        "title": "호떡",
+                        "description": "달콤한 간식",
+                        "categories": ["snack"],
+                        "tags": ["길거리음식"],
+                        "calories": 300,
+                        "protein_grams": 5.0,
+                    },
+                ]
+            }
+        )
+
+    def test_get_recipe_by_id(self, service):
+        """Test id lookup hits and misses."""
+        assert service.get_recipe_by_id("kr-2")["title"] == "김치볶음밥"
+        assert service.get_recipe_by_id("kr-404") is None
+
+    @pytest.mark.parametrize(
+        ("kwargs", "expected_ids"),
+        [
+            ({"query": "김치"}, ["kr-1", "kr-2"]),
+            ({"query": "치찌"}, ["kr-1"]),
+            ({"query": "돼지고기 김치"}, ["kr-1"]),
+            ({"query": "거리음"}, ["kr-3"]),
+            ({"query": "김치", "category": "DINNER"}, ["kr-1"]),
+            ({"tag": "볶음밥"}, ["kr-2"]),
+            ({"query": "없음"}, []),
+        ],
+    )
+    def test_search_recipes(self, service, kwargs, expected_ids):
+        """Test substring query and filters keep the original recipe order."""
+        result = service.search_recipes(**kwargs)
+
+        assert [r["external_id"] for r in result["results"]] == expected_ids
+        assert result["totalResults"] == len(expected_ids)
+
+    def test_search_recipes_paginates(self, service):
+        """Test offset and number apply after filtering."""
+        result = service.search_recipes(number=1, offset=1)
+
+        assert [r["external_id"] for r in result["results"]] == ["kr-2"]
+        assert result["totalResults"] == 3
+
+    def test_sample_recipes_filters_by_meal_type_and_category(self, service):
+        """Test filtered sampling only returns matching recipes."""
+        assert [r["external_id"] for r in service.sample_recipes(10, meal_type="snack")] == ["kr-3"]
+        assert service.sample_recipes(10, category="lunch", meal_type="snack") == []
+
+    def test_sample_recipes_filters_by_nutrition(self, service):
+        """Test nutrition ranges skip recipes outside the range or without values."""
+        high_protein = service.sample_recipes(10, nutrition={"protein_grams": (20, None)})
+        light = service.sample_recipes(10, nutrition={"calories": (None, 500)})
+
+        assert [r["external_id"] for r in high_protein] == ["kr-1"]
+        assert sorted(r["external_id"] for r in light) == ["kr-1", "kr-3"]
+
+    def test_meal_types_artifact_round_trip(self, tmp_path):
+        """Test precomputed meal types decode to the classifier output."""
+        from src.services.seed_recipe import (
+            _read_meal_types_artifact,
+            write_meal_types_artifact,
+        )
+
+        meal_types = [["dinner", "lunch"], ["snack"], ["breakfast", "dinner", "lunch", "snack"]]
+        path = tmp_path / "seed.meal_types.bin"
+        write_meal_types_artifact(path, b"d" * 32, meal_types)
+
+        assert _read_meal_types_artifact(path, b"d" * 32, 3) == meal_types
+
+    @pytest.mark.parametrize(("digest", "count"), [(b"x" * 32, 3), (b"d" * 32, 4)])
+    def test_meal_types_artifact_stale(self, tmp_path, digest, count):
+        """Test an artifact built from other seed data is ignored."""
+        from src.services.seed_recipe import (
+            _read_meal_types_artifact,
+            write_meal_types_artifact,
+        )
+
+        path = tmp_path / "seed.meal_types.bin"
+        write_meal_types_artifact(path, b"d" * 32, [["lunch"]] * 3)
+
+        assert _read_meal_types_artifact(path, digest, count) is None
+        assert _read_meal_types_artifact(tmp_path / "missing.bin", digest, count) is None
+
+    def test_seed_artifact_build_needs_no_settings(self):
+        """Test the build-time artifact script imports without runtime secrets."""
+        import os
+        import subprocess
+        import sys
+        from pathlib import Path
+
+        env = {
+            key: value
+            for key, value in os.environ.items()
+            if key not in ("DATABASE_URL", "REDIS_URL", "JWT_SECRET_KEY")
+        }
+        code = (
+            "import sys, src.scripts.build_seed_artifact; "
+            "assert 'src.core.config' not in sys.modules"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=Path(__file__).parents[2],
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+
+        assert result.returncode == 0, result.stderr
+
+
+class TestShoppingListService:
+    """Tests for ShoppingListService."""
+
+    @pytest.fixture
+    def shopping_service(self):
+        """Create ShoppingListService with mocked repositories."""
+        session = MagicMock()
+        session.flush = AsyncMock()
+        session.delete = AsyncMock()
+        service = ShoppingListService(session)
+        service.meal_plan_repo = MagicMock()
+        service.meal_plan_repo.get_by_id = AsyncMock(
+            return_value=MagicMock(user_id="user-123", week_start_date="2026-01-26")
+        )
+        service.shopping_list_repo = MagicMock()
+        service.shopping_list_repo.get_by_meal_plan_id = AsyncMock(return_value=None)
+        service.shopping_list_repo.create = AsyncMock(return_value=MagicMock(id="list-123"))
+        service.shopping_list_repo.add_items = AsyncMock(
+            side_effect=lambda _list_id, items: [
+                MagicMock(id=f"item-{i['ingredient_key']}") for i in items
+            ]
+        )
+        service.shopping_list_repo.add_contributions = AsyncMock()
+        service.shopping_list_repo.get_by_id_with_items = AsyncMock()
+        service.shopping_list_repo.bump_version = AsyncMock()
+        return service
+
+    @staticmethod
+    def _row(slot_id, name, unit, amount, category=None):
+        from decimal import Decimal
+        from types import SimpleNamespace
+
+        return SimpleNamespace(
+            slot_id=slot_id, name=name, unit=unit, amount=Decimal(amount), category=category
+        )
+
+    async def test_generate_from_meal_plan_uses_sql_aggregate(self, shopping_service):
+        """Test filters go to the aggregate query and per-slot rows are summed."""
+        from datetime import date
+
+        shopping_service.meal_plan_repo.aggregate_slot_ingredients = AsyncMock(
+            return_value=[
+                self._row("slot-1", "양파", "개", "1"),
+                self._row("slot-2", "양파", "개", "2"),
+                self._row("slot-2", "beef", "g", "333.333", "meat"),
+            ]
+        )
+
+        await shopping_service.generate_from_meal_plan(
+            "user-123", "plan-123", dates=["2026-01-27"], meal_types=["dinner"]
+        )
+
+        shopping_service.meal_plan_repo.aggregate_slot_ingredients.assert_awaited_once_with(
+            "plan-123", dates=[date(2026, 1, 27)], meal_types=["dinner"]
+        )
+        created = shopping_service.shopping_list_repo.create.call_args[0][0]
+        assert created["auto_sync"] is True
+        assert created["filter_dates"] == [date(2026, 1, 27)]
+        items = shopping_service.shopping_list_repo.add_items.call_args[0][1]
+        assert [(i["ingredient_name"], i["amount"], i["unit"], i["category"]) for i in items] == [
+            ("양파", 3.0, "개", "produce"),
+            ("Beef", 333.33, "g", "meat"),
+        ]
+        contributions = shopping_service.shopping_list_repo.add_contributions.call_args[0][0]
+        assert [(c["shopping_item_id"], c["meal_slot_id"]) for c in contributions] == [
+            ("item-양파", "slot-1"),
+            ("item-양파", "slot-2"),
+            ("item-beef", "slot-2"),
+        ]
+
+    async def test_generate_from_meal_plan_keeps_checked_state(self, shopping_service):
+        """Test regenerating a list keeps items checked that were checked before."""
+        shopping_service.shopping_list_repo.get_by_meal_plan_id = AsyncMock(
+            return_value=MagicMock(
+                items=[
+                    MagicMock(ingredient_key="양파", canonical_unit="개", is_checked=True),
+                    MagicMock(ingredient_key="beef", canonical_unit="g", is_checked=False),
+                ]
+            )
+        )
+        shopping_service.shopping_list_repo.delete = AsyncMock()
+        shopping_service.meal_plan_repo.aggregate_slot_ingredients = AsyncMock(
+            return_value=[
+                self._row("slot-1", "양파", "개", "1"),
+                self._row("slot-1", "beef", "g", "200"),
+            ]
+        )
+
+        await shopping_service.generate_from_meal_plan("user-123", "plan-123")
+
+        items = shopping_service.shopping_list_repo.add_items.call_args[0][1]
+        assert {i["ingredient_key"]: i["is_checked"] for i in items} == {
+            "양파": True,
+            "beef": False,
+        }
+
+    async def test_sync_meal_slots_applies_delta(self, shopping_service):
+        """Test a slot change only touches its items and keeps checked state."""
+        repo = shopping_service.shopping_list_repo
+        checked = MagicMock(
+            id="item-onion", ingredient_key="양파", canonical_unit="개", is_checked=True
+        )
+        stale = MagicMock(id="item-pork", ingredient_key="돼지고기", canonical_unit="g")
+        repo.get_auto_sync_by_meal_plan_id = AsyncMock(
+            return_value=MagicMock(id="list-123", filter_dates=None, filter_meal_types=None)
+        )
+        repo.delete_slot_contributions = AsyncMock(return_value=["item-onion", "item-pork"])
+        repo.get_items_by_keys = AsyncMock(return_value=[checked])
+        repo.get_contribution_totals = AsyncMock(return_value={"item-onion": 4.0})
+        repo.get_items_by_ids = AsyncMock(return_value=[checked, stale])
+        shopping_service.meal_plan_repo.aggregate_slot_ingredients = AsyncMock(
+            return_value=[
+                self._row("slot-9", "양파", "개", "2"),
+                self._row("slot-9", "간장", "ml", "30"),
+            ]
+        )
+
+        await shopping_service.sync_meal_slots("plan-123", ["slot-9"])
+
+        new_items = repo.add_items.call_args[0][1]
+        assert [i["ingredient_key"] for i in new_items] == ["간장"]
+        assert checked.amount == 4.0
+        assert checked.is_checked is True
+        shopping_service.session.delete.assert_awaited_once_with(stale)
+
+    async def test_sync_meal_slots_without_generated_list(self, shopping_service):
+        """Test slot changes are ignored when the plan has no generated list."""
+        repo = shopping_service.shopping_list_repo
+        repo.get_auto_sync_by_meal_plan_id = AsyncMock(return_value=None)
+        repo.delete_slot_contributions = AsyncMock()
+
+        await shopping_service.sync_meal_slots("plan-123", ["slot-1"], removed=True)
+
+        repo.delete_slot_contributions.assert_not_awaited()
+
+    async def test_generate_from_meal_plan_wrong_owner(self, shopping_service):
+        """Test generating from another user's meal plan is rejected."""
+        with pytest.raises(MealPlanNotFoundError):
+            await shopping_service.generate_from_meal_plan("other-user", "plan-123")
+
+    async def test_batch_update_items_uses_set_based_statements(self, shopping_service):
+        """Test a batch verifies ownership once and issues one statement per change kind."""
+        from src.schemas.shopping_list import ShoppingItemBatchRequest
+
+        repo = shopping_service.shopping_list_repo
+        repo.get_owner_id = AsyncMock(return_value="user-123")
+        repo.get_item_ids = AsyncMock(return_value={"a", "b", "c", "d"})
+        repo.update_items = AsyncMock()
+        repo.check_all_items = AsyncMock()
+        repo.delete_items = AsyncMock()
+        repo.add_items = AsyncMock()
+        data = ShoppingItemBatchRequest(
+            check=["a", "b"],
+            update=[{"id": "c", "amount": 2, "notes": "큰 것"}, {"id": "a", "notes": None}],
+            delete=["d"],
+            add=[{"ingredient_name": "우유", "amount": 1, "unit": "L", "category": "dairy"}],
+        )
+
+        await shopping_service.batch_update_items("list-123", "user-123", data)
+
+        repo.get_owner_id.assert_awaited_once_with("list-123")
+        repo.update_items.assert_awaited_once_with([{"id": "c", "amount": 2.0, "notes": "큰 것"}])
+        repo.check_all_items.assert_awaited_once()
+        _, is_checked = repo.check_all_items.call_args[0]
+        assert is_checked is True
+        assert sorted(repo.check_all_items.call_args[1]["item_ids"]) == ["a", "b"]
+        repo.delete_items.assert_awaited_once_with("list-123", ["d"])
+        assert repo.add_items.call_args[0][1][0]["ingredient_name"] == "우유"
+        repo.get_by_id_with_items.assert_awaited_once_with("list-123")
+
+    async def test_batch_update_items_rejects_foreign_items(self, shopping_service):
+        """Test items outside the list fail the whole batch before any write."""
+        from src.core.exceptions import NotFoundError
+        from src.schemas.shopping_list import ShoppingItemBatchRequest
+
+        repo = shopping_service.shopping_list_repo
+        repo.get_owner_id = AsyncMock(return_value="user-123")
+        repo.get_item_ids = AsyncMock(return_value={"a"})
+        repo.check_all_items = AsyncMock()
+
+        with pytest.raises(NotFoundError):
+            await shopping_service.batch_update_items(
+                "list-123", "user-123", ShoppingItemBatchRequest(check=["a", "other"])
+            )
+        repo.check_all_items.assert_not_awaited()
+
+    async def test_batch_update_items_wrong_owner(self, shopping_service):
+        """Test batches on another user's list are rejected."""
+        from src.schemas.shopping_list import ShoppingItemBatchRequest
+
+        shopping_service.shopping_list_repo.get_owner_id = AsyncMock(return_value="user-123")
+
+        with pytest.raises(ShoppingListNotFoundError):
+            await shopping_service.batch_update_items(
+                "list-123", "other-user", ShoppingItemBatchRequest(check=["a"])
+            )
+
+
+class TestMealPlanService:
+    """Tests for MealPlanService."""
+
+    async def test_create_quick_plan_batches_imports_and_slots(self):
+        """Test quick plans resolve conflicts once, import in bulk and insert slots once."""
+        from datetime import date
+        from unittest.mock import patch
+
+        from src.schemas.meal_plan import QuickPlanCreate
+        from src.services.meal_plan import MealPlanService
+
+        service = MealPlanService(MagicMock())
+        service.meal_plan_repo = MagicMock()
+        service.meal_plan_repo.get_version_by_user_and_week = AsyncMock(
+            return_value=MagicMock(id="plan-1")
+        )
+        service.meal_plan_repo.get_occupied_slots = AsyncMock(
+            return_value={(date(2026, 1, 26), "lunch")}
+        )
+        service.meal_plan_repo.add_slots = AsyncMock(
+            return_value=[MagicMock(id="slot-1"), MagicMock(id="slot-2")]
+        )
+        service.meal_plan_repo.get_by_id_with_slots = AsyncMock()
+        service.meal_plan_repo.bump_version = AsyncMock()
+        service.shopping_list_service = MagicMock()
+        service.shopping_list_service.sync_meal_slots = AsyncMock()
+        recipe = MagicMock(id="recipe-1", servings=2)
+        data = QuickPlanCreate(
+            week_start_date=date(2026, 1, 26),
+            slots=[
+                {
+                    "source": "korean_seed",
+                    "external_id": "kr-1",
+                    "date": "2026-01-26",
+                    "meal_type": "dinner",
+                },
+                {
+                    "source": "korean_seed",
+                    "external_id": "kr-2",
+                    "date": "2026-01-26",
+                    "meal_type": "dinner",
+                },
+                {
+                    "source": "korean_seed",
+                    "external_id": "kr-3",
+                    "date": "2026-01-26",
+                    "meal_type": "lunch",
+                },
+                {
+                    "source": "korean_seed",
+                    "external_id": "kr-1",
+                    "date": "2026-01-27",
+                    "meal_type": "dinner",
+                    "servings": 4,
+                },
+            ],
+        )
+
+        with patch("src.services.meal_plan.ExternalRecipeService") as external_cls:
+            external_cls.return_value.import_recipes = AsyncMock(
+                return_value={("korean_seed", "kr-1"): recipe}
+            )
+            await service.create_quick_plan("user-123", data, MagicMock())
+
+        # The taken lunch slot and the duplicate dinner slot are never imported
+        external_cls.return_value.import_recipes.assert_awaited_once_with(
+            "user-123", [("korean_seed", "kr-1"), ("korean_seed", "kr-1")]
+        )
+        service.meal_plan_repo.get_occupied_slots.assert_awaited_once()
+        slots = service.meal_plan_repo.add_slots.call_args[0][1]
+        assert [(s["date"].day, s["meal_type"], s["servings"]) for s in slots] == [
+            (26, "dinner", 2),
+            (27, "dinner", 4),
+        ]
+        service.shopping_list_service.sync_meal_slots.assert_awaited_once_with(
+            "plan-1", ["slot-1", "slot-2"]
+        )
+        service.meal_plan_repo.bump_version.assert_awaited_once_with("plan-1")
+
+    async def test_add_meal_slot_conflict(self):
+        """Test a slot insert skipped by ON CONFLICT is reported as a conflict."""
+        from datetime import date
+
+        from src.core.exceptions import MealSlotConflictError
+        from src.schemas.meal_plan import MealSlotCreate
+        from src.services.meal_plan import MealPlanService
+
+        service = MealPlanService(MagicMock())
+        service.get_meal_plan = AsyncMock()
+        service.recipe_repo = MagicMock()
+        service.recipe_repo.get_by_id = AsyncMock(
+            return_value=MagicMock(user_id="user-123", servings=2)
+        )
+        service.meal_plan_repo = MagicMock()
+        service.meal_plan_repo.add_slot = AsyncMock(return_value=None)
+        data = MealSlotCreate(recipe_id="recipe-1", date=date(2026, 1, 26), meal_type="dinner")
+
+        with pytest.raises(MealSlotConflictError):
+            await service.add_meal_slot("plan-1", "user-123", data)
+
+    async def test_add_external_meal_slot_conflict_skips_import(self):
+        """Test a taken slot fails before the external recipe is imported."""
+        from datetime import date
+        from unittest.mock import patch
+
+        from src.core.exceptions import MealSlotConflictError
+        from src.schemas.meal_plan import ExternalMealSlotCreate
+        from src.services.meal_plan import MealPlanService
+
+        service = MealPlanService(MagicMock())
+        service.get_meal_plan = AsyncMock()
+        service.meal_plan_repo = MagicMock()
+        service.meal_plan_repo.get_occupied_slots = AsyncMock(
+            return_value={(date(2026, 1, 26), "dinner")}
+        )
+        data = ExternalMealSlotCreate(
+            source="korean_seed", external_id="kr-1", date=date(2026, 1, 26), meal_type="dinner"
+        )
+
+        with (
+            patch("src.services.meal_plan.ExternalRecipeService") as external_cls,
+            pytest.raises(MealSlotConflictError),
+        ):
+            await service.add_external_meal_slot("plan-1", "user-123", data, MagicMock())
+        external_cls.assert_not_called()
+
+    async def test_copy_meal_plan_shifts_dates_in_one_statement(self):
+        """Test copying a plan creates the target week and copies slots with one insert."""
+        from datetime import date
+
+        from src.schemas.meal_plan import MealPlanCopyRequest
+        from src.services.meal_plan import MealPlanService
+
+        service = MealPlanService(MagicMock())
+        service.meal_plan_repo = MagicMock()
+        service.meal_plan_repo.get_by_id = AsyncMock(
+            return_value=MagicMock(
+                id="plan-1", user_id="user-123", week_start_date=date(2026, 1, 26)
+            )
+        )
+        service.meal_plan_repo.get_version_by_user_and_week = AsyncMock(return_value=None)
+        service.meal_plan_repo.create = AsyncMock(return_value=MagicMock(id="plan-2"))
+        service.meal_plan_repo.copy_slots = AsyncMock(return_value=["slot-1", "slot-2"])
+        service.meal_plan_repo.bump_version = AsyncMock()
+        service.meal_plan_repo.get_by_id_with_slots = AsyncMock()
+        service.shopping_list_service = MagicMock()
+        service.shopping_list_service.sync_meal_slots = AsyncMock()
+        data = MealPlanCopyRequest(target_week_start_date=date(2026, 2, 4), on_conflict="replace")
+
+        await service.copy_meal_plan("plan-1", "user-123", data)
+
+        created = service.meal_plan_repo.create.call_args[0][0]
+        assert created["week_start_date"] == date(2026, 2, 2)
+        service.meal_plan_repo.copy_slots.assert_awaited_once_with(
+            "plan-1", "plan-2", 7, replace=True
+        )
+        service.shopping_list_service.sync_meal_slots.assert_awaited_once_with(
+            "plan-2", ["slot-1", "slot-2"]
+        )
+        service.meal_plan_repo.bump_version.assert_awaited_once_with("plan-2")
+
+    async def test_copy_meal_plan_rejects_own_week(self):
+        """Test a plan cannot be copied onto its own week."""
+        from datetime import date
+
+        from src.core.exceptions import BadRequestError
+        from src.schemas.meal_plan import MealPlanCopyRequest
+        from src.services.meal_plan import MealPlanService
+
+        service = MealPlanService(MagicMock())
+        service.meal_plan_repo = MagicMock()
+        service.meal_plan_repo.get_by_id = AsyncMock(
+            return_value=MagicMock(user_id="user-123", week_start_date=date(2026, 1, 26))
+        )
+        data = MealPlanCopyRequest(target_week_start_date=date(2026, 1, 28))
+
+        with pytest.raises(BadRequestError):
+            await service.copy_meal_plan("plan-1", "user-123", data)
+
+    async def test_save_template_duplicate_name(self):
+        """Test saving a template under a taken name is a conflict and copies nothing."""
+        from datetime import date
+
+        from src.core.exceptions import MealPlanTemplateConflictError
+        from src.schemas.meal_plan import MealPlanTemplateCreate
+        from src.services.meal_plan import MealPlanService
+
+        service = MealPlanService(MagicMock())
+        service.meal_plan_repo = MagicMock()
+        service.meal_plan_repo.get_by_id = AsyncMock(
+            return_value=MagicMock(user_id="user-123", week_start_date=date(2026, 1, 26))
+        )
+        service.template_repo = MagicMock()
+        service.template_repo.create_template = AsyncMock(return_value=None)
+        service.template_repo.add_slots_from_meal_plan = AsyncMock()
+        data = MealPlanTemplateCreate(meal_plan_id="plan-1", name="평일 식단")
+
+        with pytest.raises(MealPlanTemplateConflictError):
+            await service.save_template("user-123", data)
+        service.template_repo.add_slots_from_meal_plan.assert_not_awaited()
+
+    async def test_apply_template_skips_sync_when_nothing_written(self):
+        """Test applying a template whose slots are all taken leaves the plan untouched."""
+        from datetime import date
+
+        from src.schemas.meal_plan import MealPlanTemplateApply
+        from src.services.meal_plan import MealPlanService
+
+        service = MealPlanService(MagicMock())
+        service.template_repo = MagicMock()
+        service.template_repo.get_by_id = AsyncMock(return_value=MagicMock(user_id="user-123"))
+        service.meal_plan_repo = MagicMock()
+        service.meal_plan_repo.get_version_by_user_and_week = AsyncMock(
+            return_value=MagicMock(id="plan-1")
+        )
+        service.meal_plan_repo.apply_template_slots = AsyncMock(return_value=[])
+        service.meal_plan_repo.bump_version = AsyncMock()
+        service.meal_plan_repo.get_by_id_with_slots = AsyncMock()
+        service.shopping_list_service = MagicMock()
+        service.shopping_list_service.sync_meal_slots = AsyncMock()
+        data = MealPlanTemplateApply(week_start_date=date(2026, 1, 29))
+
+        await service.apply_template("template-1", "user-123", data)
+
+        service.meal_plan_repo.apply_template_slots.assert_awaited_once_with(
+            "template-1", "plan-1", date(2026, 1, 26), replace=False
+        )
+        service.shopping_list_service.sync_meal_slots.assert_not_awaited()
+        service.meal_plan_repo.bump_version.assert_not_awaited()
+
+
+class TestExternalRecipeService:
+    """Tests for ExternalRecipeService."""
+
+    async def test_import_recipes_fetches_missing_once(self):
+        """Test bulk import reuses existing recipes and creates the rest in one call."""
+        from src.services.external_recipe import ExternalRecipeService
+
+        service = ExternalRecipeService(MagicMock(), MagicMock())
+        existing = MagicMock(external_source="korean_seed", external_id="kr-1")
+        service.recipe_repo = MagicMock()
+        service.recipe_repo.get_by_external_sources = AsyncMock(return_value=[existing])
+        created = MagicMock()
+        service.recipe_repo.create_many_with_details = AsyncMock(return_value=[created])
+        service._fetch_external_recipe = AsyncMock(
+            return_value={"title": "김치찌개", "ingredients": [], "instructions": []}
+        )
+
+        recipes = await service.import_recipes(
+            "user-123",
+            [("korean_seed", "kr-1"), ("korean_seed", "kr-2"), ("korean_seed", "kr-2")],
+        )
+
+        assert recipes == {("korean_seed", "kr-1"): existing, ("korean_seed", "kr-2"): created}
+        service._fetch_external_recipe.assert_awaited_once_with("korean_seed", "kr-2")
+        (entries,) = service.recipe_repo.create_many_with_details.call_args[0]
+        recipe_dict, ingredients, instructions = entries[0]
+        assert recipe_dict["external_id"] == "kr-2"
+        assert len(ingredients) == 1 and len(instructions) == 1
+
+    async def test_import_recipes_skip_missing(self):
+        """Test skip_missing leaves unknown and failed fetches out instead of raising."""
+        from src.services.external_recipe import ExternalRecipeService
+
+        service = ExternalRecipeService(MagicMock(), MagicMock())
+        service.recipe_repo = MagicMock()
+        service.recipe_repo.get_by_external_sources = AsyncMock(return_value=[])
+        created = MagicMock()
+        service.recipe_repo.create_many_with_details = AsyncMock(return_value=[created])
+        service._fetch_external_recipe = AsyncMock(
+            side_effect=[
+                None,
+                {"title": "김치찌개", "ingredients": [], "instructions": []},
+                RuntimeError("timeout"),
+            ]
+        )
+
+        recipes = await service.import_recipes(
+            "user-123",
+            [("korean_seed", "kr-404"), ("korean_seed", "kr-2"), ("mafra", "m-1")],
+            skip_missing=True,
+        )
+
+        assert recipes == {("korean_seed", "kr-2"): created}
+        (entries,) = service.recipe_repo.create_many_with_details.call_args[0]
+        assert [entry[0]["external_id"] for entry in entries] == ["kr-2"]
+
+    async def test_import_recipes_skip_missing_cancelled_fetch(self):
+        """Test a cancelled fetch propagates instead of being skipped as not found."""
+        import asyncio
+
+        from src.services.external_recipe import ExternalRecipeService
+
+        service = ExternalRecipeService(MagicMock(), MagicMock())
+        service.recipe_repo = MagicMock()
+        service.recipe_repo.get_by_external_sources = AsyncMock(return_value=[])
+        service.recipe_repo.create_many_with_details = AsyncMock(return_value=[])
+        service._fetch_external_recipe = AsyncMock(side_effect=asyncio.CancelledError())
+
+        with pytest.raises(asyncio.CancelledError):
+            await service.import_recipes("user-123", [("korean_seed", "kr-1")], skip_missing=True)
+
+        service.recipe_repo.create_many_with_details.assert_not_awaited()
+
+
+class TestMealPlanGenerator:
+    """Tests for the weekly meal plan solver."""
+
+    @staticmethod
+    def _candidates(count, meal_type, calories, minutes=20):
+        from src.services.meal_plan_generator import Candidate
+
+        return [
+            Candidate(
+                source="korean_seed",
+                ref=f"{meal_type}-{i}",
+                title=f"{meal_type} {i}",
+                meal_types=frozenset({meal_type}),
+                total_minutes=minutes,
+                servings=2,
+                nutrition=(float(calories[i % len(calories)]), None, None, None),
+            )
+            for i in range(count)
+        ]
+
+    def test_solver_respects_hard_constraints(self):
+        """Test meal types, cook time and the no-repeat window are never violated."""
+        import random
+
+        from src.services.meal_plan_generator import CandidateIndex, PlanSolver
+
+        candidates = (
+            self._candidates(10, "breakfast", [300])
+            + self._candidates(10, "dinner", [700])
+            + self._candidates(5, "dinner", [700], minutes=90)
+        )
+        slots = [(day, meal_type) for day in range(7) for meal_type in ("breakfast", "dinner")]
+        solver = PlanSolver(
+            CandidateIndex.build(candidates),
+            slots,
+            targets={},
+            max_minutes=30,
+            no_repeat_days=3,
+            rng=random.Random(0),
+        )
+
+        chosen = solver.solve()
+
+        assert all(c is not None for c in chosen)
+        for (day, meal_type), candidate in zip(slots, chosen):
+            assert meal_type in candidate.meal_types
+            assert candidate.total_minutes <= 30
+            repeats = [
+                other_day
+                for (other_day, _), other in zip(slots, chosen)
+                if other is candidate and other_day != day
+            ]
+            assert all(abs(other_day - day) >= 3 for other_day in repeats)
+
+    def test_solver_approaches_calorie_target(self):
+        """Test local search brings daily calories close to the target."""
+        import random
+
+        from src.services.meal_plan_generator import CandidateIndex, PlanSolver
+
+        # Every lunch has a dinner that completes it to exactly 1500 kcal
+        candidates = self._candidates(40, "lunch", [300, 500, 700, 900]) + self._candidates(
+            40, "dinner", [600, 800, 1000, 1200]
+        )
+        slots = [(day, meal_type) for day in range(7) for meal_type in ("lunch", "dinner")]
+        solver = PlanSolver(
+            CandidateIndex.build(candidates),
+            slots,
+            targets={"calories": 1500},
+            rng=random.Random(0),
+            time_budget=1.0,
+        )
+
+        chosen = solver.solve()
+
+        for day in range(7):
+            total = sum(c.nutrition[0] for (d, _), c in zip(slots, chosen) if d == day)
+            assert total == 1500
+
+    async def test_generate_week_solves_off_the_event_loop(self, monkeypatch):
+        """Test the solver runs in a worker thread instead of blocking the event loop."""
+        import threading
+        from datetime import date
+
+        from src.schemas.meal_plan import GenerateMealPlanRequest
+        from src.services import meal_plan_generator
+        from src.services.meal_plan_generator import (
+            CandidateIndex,
+            MealPlanGeneratorService,
+            PlanSolver,
+        )
+
+        solve = PlanSolver.solve
+        threads = []
+
+        def record_thread(solver):
+            threads.append(threading.get_ident())
+            return solve(solver)
+
+        monkeypatch.setattr(PlanSolver, "solve", record_thread)
+        external = MagicMock()
+        external.import_recipes = AsyncMock(
+            side_effect=lambda user_id, refs: {ref: MagicMock(id=ref[1]) for ref in refs}
+        )
+        monkeypatch.setattr(meal_plan_generator, "ExternalRecipeService", lambda *args: external)
+
+        service = MealPlanGeneratorService(MagicMock())
+        service._get_external_index = AsyncMock(
+            return_value=CandidateIndex.build(self._candidates(5, "dinner", [700]))
+        )
+        service.meal_plan_repo = MagicMock()
+        service.meal_plan_repo.get_by_user_and_week = AsyncMock(return_value=MagicMock(id="plan-1"))
+        service.meal_plan_repo.get_occupied_slots = AsyncMock(return_value=set())
+        service.meal_plan_repo.add_slots = AsyncMock(return_value=[])
+        service.meal_plan_repo.get_by_id_with_slots = AsyncMock()
+        service.recipe_repo = MagicMock()
+        service.recipe_repo.get_plan_candidates = AsyncMock(return_value=[])
+        data = GenerateMealPlanRequest(week_start_date=date(2026, 10, 19), meal_types=["dinner"])
+
+        await service.generate_week("user-123", data, MagicMock())
+
+        assert threads and threads[0] != threading.get_ident()
+        _, slots = service.meal_plan_repo.add_slots.call_args.args
+        assert len(slots) == 7
+
+
+class TestETag:
+    """Tests for version-based ETags."""
+
+    def test_etag_matches(self):
+        """Test If-None-Match uses weak comparison and accepts lists and *."""
+        from src.core.etag import etag_matches, make_etag
+
+        etag = make_etag("plan-1", 3)
+
+        assert etag_matches(etag, etag)
+        assert etag_matches('"plan-1.3"', etag)
+        assert etag_matches(f'"other", {etag}', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches(make_etag("plan-1", 2), etag)
+        assert not etag_matches(None, etag)
+
+    async def test_shopping_item_mutations_bump_version(self):
+        """Test item changes bump the list version that the ETag is built from."""
+        from src.schemas.shopping_list import ShoppingItemCreate
+
+        service = ShoppingListService(MagicMock())
+        service.shopping_list_repo = MagicMock()
+        service.shopping_list_repo.get_owner_id = AsyncMock(return_value="user-123")
+        service.shopping_list_repo.add_item = AsyncMock()
+        service.shopping_list_repo.bump_version = AsyncMock()
+
+        await service.add_item(
+            "list-1",
+            "user-123",
+            ShoppingItemCreate(ingredient_name="우유", amount=1, unit="L"),
+        )
+
+        service.shopping_list_repo.bump_version.assert_awaited_once_with("list-1")
+
+
+class TestUnitCanonicalization:
+    """Tests for ingredient unit canonicalization."""
+
+    @pytest.mark.parametrize(
+        ("amount", "unit", "expected"),
+        [
+            (0.5, "kg", (500.0, "g")),
+            (200, "g", (200.0, "g")),
+            (2, "큰술", (30.0, "ml")),
+            (1, "작은술", (5.0, "ml")),
+            (1, "컵", (200.0, "ml")),
+            (1, "Cup", (240.0, "ml")),
+            (1, "Tbsp.", (15.0, "ml")),
+            (1, "T", (15.0, "ml")),
+            (1, "t", (5.0, "ml")),
+            (3, "pcs", (3.0, "개")),
+            (1, " 대 ", (1.0, "대")),
+        ],
+    )
+    def test_canonicalize(self, amount, unit, expected):
+        """Test metric, US and Korean units convert to g / ml / 개."""
+        from src.core.units import canonicalize
+
+        assert canonicalize(amount, unit) == expected
+
+    def test_to_display_unit(self):
+        """Test large canonical amounts are scaled for display."""
+        from src.core.units import to_display_unit
+
+        assert to_display_unit(1500, "g") == (1.5, "kg")
+        assert to_display_unit(2000, "ml") == (2.0, "L")
+        assert to_display_unit(45, "ml") == (45, "ml")
+
+
+class TestIngredientCategory:
+    """Tests for compiled ingredient categorization."""
+
+    @pytest.mark.parametrize(
+        ("name", "expected"),
+        [
+            ("양파", "produce"),
+            ("돼지고기 앞다리살", "meat"),
+            ("고추장", "pantry"),
+            ("청양고추", "produce"),
+            ("멸치액젓", "pantry"),
+            ("모짜렐라 치즈", "dairy"),
+            ("Chicken Thighs", "meat"),
+            ("Eggplant", "produce"),
+            ("Eggs", "dairy"),
+            ("Graham crackers", "pantry"),
+            ("소금", "pantry"),
+        ],
+    )
+    def test_categorize_ingredient(self, name, expected):
+        """Test category priority and Korean/English keyword matching."""
+        from src.core.ingredient_category import categorize_ingredient
+
+        assert categorize_ingredient(name) == expected
+
+    def test_register_category_keywords(self, monkeypatch):
+        """Test registered keywords are compiled in and the memo is reset."""
+        from src.core import ingredient_category
+
+        monkeypatch.setattr(
+            ingredient_category,
+            "CATEGORY_KEYWORDS",
+            {k: list(v) for k, v in ingredient_category.CATEGORY_KEYWORDS.items()},
+        )
+        assert ingredient_category.categorize_ingredient("두부") == "pantry"
+
+        ingredient_category.register_category_keywords("produce", ["두부"])
+        try:
+            assert ingredient_category.categorize_ingredient("두부") == "produce"
+        finally:
+            monkeypatch.undo()
+            ingredient_category._build_matchers()
+
+
+class TestTextSearch:
+    """Tests for Hangul bigram search tokenization."""
+
+    @pytest.mark.parametrize(
+        ("text", "expected"),
+        [
+            ("김치찌개", ["김치", "치찌", "찌개"]),
+            ("김치찌개를 끓인다", ["김치", "치찌", "찌개", "개를", "끓인", "인다"]),
+            ("된장국", ["된장", "장국"]),
+            ("국 밥", ["국", "밥"]),
+            ("Chicken 닭gogi", ["Chicken", "닭gogi"]),
+            ("비빔밥(매운맛)", ["비빔", "빔밥", "(", "매운", "운맛", ")"]),
+            ("", []),
+        ],
+    )
+    def test_hangul_bigrams(self, text, expected):
+        """Test Hangul runs become overlapping bigrams and other text is kept."""
+        from src.core.text_search import hangul_bigrams
+
+        assert hangul_bigrams(text).split() == expected
+
+    @pytest.mark.parametrize(
+        ("query", "expected"),
+        [
+            ("김치찌개", '"김치 치찌 찌개"'),
+            ("국", '"국"'),
+            ("된장 -돼지", '"된장" -"돼지"'),
+            ('"김치 찌개"', '"김치 찌개"'),
+            ('"된장찌개', '"된장 장찌 찌개"'),
+            ("chicken OR 닭", '"chicken" or "닭"'),
+            ('say"hi"', '"say hi"'),
+            ("  ", ""),
+        ],
+    )
+    def test_to_websearch_query(self, query, expected):
+        """Test terms become bigram phrases while websearch operators survive."""
+        from src.core.text_search import to_websearch_query
+
+        assert to_websearch_query(query) == expected
+
+
+class TestNutritionFilter:
+    """Tests for nutrition range filters."""
+
+    def test_ranges_only_bounded_columns(self):
+        """Test unset columns are left out of the ranges."""
+        from src.schemas.recipe import NutritionFilter
+
+        nutrition = NutritionFilter(max_calories=500, min_protein=30)
+
+        assert nutrition.ranges() == {"calories": (None, 500), "protein_grams": (30, None)}
+        assert NutritionFilter().ranges() == {}
+
+    @pytest.mark.parametrize(
+        ("recipe", "expected"),
+        [
+            ({"calories": 420, "protein_grams": 32.5}, True),
+            ({"calories": 500, "protein_grams": 30}, True),
+            ({"calories": 620, "protein_grams": 40}, False),
+            ({"calories": 420, "protein_grams": 12}, False),
+            ({"calories": 420, "protein_grams": None}, False),
+            ({"calories": 420}, False),
+        ],
+    )
+    def test_matches_nutrition(self, recipe, expected):
+        """Test bounds are inclusive and a missing value never matches."""
+        from src.core.nutrition import matches_nutrition
+
+        ranges = {"calories": (None, 500), "protein_grams": (30, None)}
+
+        assert matches_nutrition(recipe, ranges) is expected
+
+    def test_nutrition_conditions_use_bare_columns(self):
+        """Test the SQL bounds compare the columns directly so indexes apply."""
+        from sqlalchemy.dialects import postgresql
+
+        from src.core.nutrition import nutrition_conditions
+        from src.models.cached_recipe import CachedRecipe
+
+        conditions = nutrition_conditions(
+            CachedRecipe, {"calories": (None, 500), "protein_grams": (30, 60)}
+        )
+        compiled = [
+            str(c.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+            for c in conditions
+        ]
+
+        assert compiled == [
+            "cached_recipes.calories <= 500",
+            "cached_recipes.protein_grams >= 30",
+            "cached_recipes.protein_grams <= 60",
+        ]
+        assert nutrition_conditions(CachedRecipe, None) == []
+
+    async def test_discover_with_nutrition_skips_live_apis(self, monkeypatch):
+        """Test nutrition-bounded discover never calls APIs whose previews lack nutrition."""
+        from src.services import external_recipe
+        from src.services.external_recipe import ExternalRecipeService
+
+        spoonacular = MagicMock(is_configured=True)
+        spoonacular.get_random_recipes = AsyncMock()
+        themealdb = MagicMock()
+        themealdb.get_random_recipes = AsyncMock()
+        monkeypatch.setattr(external_recipe, "spoonacular_adapter", spoonacular)
+        monkeypatch.setattr(external_recipe, "themealdb_adapter", themealdb)
+        monkeypatch.setattr(
+            external_recipe, "get_seed_recipe_service", lambda: MagicMock(is_configured=False)
+        )
+
+        service = ExternalRecipeService(MagicMock(), MagicMock())
+        service._get_cached = AsyncMock(return_value=None)
+        service._cache_result = AsyncMock()
+        service.cached_repo = MagicMock()
+        service.cached_repo.get_discover = AsyncMock(return_value=[])
+        service.translation = MagicMock(is_configured=False)
+
+        results = await service.discover_recipes(
+            "user-123", nutrition={"calories": (None, 500)}, number=9
+        )
+
+        assert results["total"] == 0
+        spoonacular.get_random_recipes.assert_not_awaited()
+        themealdb.get_random_recipes.assert_not_awaited()
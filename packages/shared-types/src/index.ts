@@ -45,6 +45,9 @@ export interface Recipe {
   created_at: string
   updated_at: string
   source_type?: 'user' | 'cached'
+  // Only present in list responses requested with include=interactions,stats
+  interactions?: RecipeUserInteraction | null
+  stats?: RecipeStats | null
 }
 
 export type RecipeDifficulty = 'easy' | 'medium' | 'hard'
@@ -274,7 +277,19 @@ export interface URLExtractionResponse {
 }
 
 // Search Types
-export interface RecipeSearchParams {
+// Inclusive per-serving bounds; recipes without the value never match
+export interface NutritionRangeParams {
+  min_calories?: number
+  max_calories?: number
+  min_protein?: number
+  max_protein?: number
+  min_carbs?: number
+  max_carbs?: number
+  min_fat?: number
+  max_fat?: number
+}
+
+export interface RecipeSearchParams extends NutritionRangeParams {
   query?: string
   categories?: RecipeCategory[]
   tags?: string[]
@@ -319,6 +334,8 @@ export interface ExternalRecipePreview {
   category?: string
   area?: string
   meal_types?: string[]
+  interactions?: RecipeUserInteraction | null
+  stats?: RecipeStats | null
 }
 
 export interface ExternalRecipeDetail {
@@ -409,6 +426,10 @@ export interface RecipeInteraction {
   stats: RecipeStats
 }
 
+export type RecipeUserInteraction = Omit<RecipeInteraction, 'stats'>
+
+export type RecipeListInclude = 'interactions' | 'stats'
+
 export interface CreateRecipeRatingRequest {
   rating: number
   review?: string